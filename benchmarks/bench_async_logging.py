@@ -0,0 +1,77 @@
+# benchmarks/bench_async_logging.py
+"""
+Benchmark: logging overhead per step, synchronous handlers vs ASYNC_LOGGING=true
+with each overflow policy.
+
+Every "step" logs --lines-per-step records through utils.logger.Logger (file
+handler in a temp LOG_DIR, console handler to /dev/null). Reports the time the
+calling thread spends per step, the time until the listener has written
+everything, and the queue counters.
+
+Usage:
+    python benchmarks/bench_async_logging.py [--steps 5000] [--lines-per-step 8] [--capacity 10000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils.logger import OVERFLOW_POLICIES, Logger
+
+
+def make_logger(name, async_logging, policy, capacity, log_dir):
+    os.environ.update({
+        "LOG_DIR": log_dir,
+        "ASYNC_LOGGING": "true" if async_logging else "false",
+        "ASYNC_LOG_OVERFLOW": policy or "drop_oldest",
+        "ASYNC_LOG_CAPACITY": str(capacity),
+    })
+    return Logger.get_logger(name)
+
+
+def run_steps(logger, steps, lines_per_step):
+    for step in range(steps):
+        logger.info("Step %d started: When the user clicks the '{login > login_button}' button", step)
+        for line in range(lines_per_step - 2):
+            logger.debug("Step %d action %d on selector %s", step, line, "#login-button")
+        logger.info("Step %d passed in %.3fs", step, 0.123)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark logging overhead per step")
+    parser.add_argument("--steps", type=int, default=5000)
+    parser.add_argument("--lines-per-step", type=int, default=8)
+    parser.add_argument("--capacity", type=int, default=10000)
+    args = parser.parse_args()
+
+    # Console handlers are bound to sys.stderr when a Logger is created
+    sys.stderr = open(os.devnull, "w")
+    os.environ["LOG_LEVEL"] = "DEBUG"
+
+    configs = [("sync", False, None)] + [(f"async/{policy}", True, policy) for policy in OVERFLOW_POLICIES]
+    print(f"{args.steps} steps x {args.lines_per_step} records, queue capacity {args.capacity}")
+    with tempfile.TemporaryDirectory() as log_dir:
+        for label, async_logging, policy in configs:
+            logger = make_logger(f"bench_{label.replace('/', '_')}", async_logging, policy, args.capacity, log_dir)
+
+            start = time.perf_counter()
+            run_steps(logger, args.steps, args.lines_per_step)
+            caller = time.perf_counter() - start
+            handler = getattr(logger, "async_handler", None)
+            if handler is not None:
+                handler.stop()
+            drained = time.perf_counter() - start
+
+            stats = handler.stats() if handler is not None else {}
+            counters = (f"queued {stats['queued']}, dropped {stats['dropped']}, flushed {stats['flushed']} "
+                        f"in {stats['batches']} batches") if stats else ""
+            print(f"{label:<18} {caller / args.steps * 1e6:8.1f} us/step on caller, "
+                  f"{drained:6.2f}s until written  {counters}", file=sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_browser_pool.py
+"""
+Benchmark: launching a browser per test vs leasing from BrowserPool.
+
+Serves a small static site from a temp directory and runs the same
+"test" (new context, open page, navigate, read title) both ways.
+
+Usage:
+    python benchmarks/bench_browser_pool.py [--tests 30] [--engine chromium] [--pool-size 1]
+"""
+import argparse
+import asyncio
+import functools
+import http.server
+import os
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from playwright.async_api import async_playwright
+
+from utils.browser_pool import BrowserPool
+
+PAGE_HTML = """<!doctype html>
+<html><head><title>PyPlay benchmark</title></head>
+<body><form id="login-form"><input id="username"><button type="submit">Login</button></form></body></html>
+"""
+
+
+def start_static_site(pages=None):
+    """Serve {filename: html} pages on a free localhost port; returns (server, base_url)"""
+    site_dir = tempfile.mkdtemp(prefix="pyplay-site-")
+    for name, html in (pages or {"index.html": PAGE_HTML}).items():
+        with open(os.path.join(site_dir, name), "w") as f:
+            f.write(html)
+
+    class QuietHandler(http.server.SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    handler = functools.partial(QuietHandler, directory=site_dir)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+async def run_test(browser, base_url):
+    context = await browser.new_context(base_url=base_url)
+    page = await context.new_page()
+    await page.goto("/index.html", wait_until="load")
+    assert await page.title() == "PyPlay benchmark"
+    await context.close()
+
+
+async def launch_per_test(tests, engine, base_url):
+    for _ in range(tests):
+        async with async_playwright() as playwright:
+            browser = await getattr(playwright, engine).launch(headless=True)
+            await run_test(browser, base_url)
+            await browser.close()
+
+
+async def pooled(tests, engine, base_url, pool_size):
+    async with async_playwright() as playwright:
+        pool = BrowserPool(playwright, size=pool_size, recycle_after=50, launch_options={"headless": True})
+        await pool.warm(engine)
+        for _ in range(tests):
+            lease = await pool.acquire(engine)
+            try:
+                await run_test(lease.browser, base_url)
+            finally:
+                await pool.release(lease)
+        await pool.close()
+        return pool.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the session browser pool")
+    parser.add_argument("--tests", type=int, default=30)
+    parser.add_argument("--engine", choices=["chromium", "firefox", "webkit"], default="chromium")
+    parser.add_argument("--pool-size", type=int, default=1)
+    args = parser.parse_args()
+
+    server, base_url = start_static_site()
+    try:
+        start = time.perf_counter()
+        asyncio.run(launch_per_test(args.tests, args.engine, base_url))
+        before = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stats = asyncio.run(pooled(args.tests, args.engine, base_url, args.pool_size))
+        after = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    print(f"{args.tests} tests on {args.engine}")
+    print(f"launch per test : {before:7.2f}s  {args.tests / before * 60:8.1f} tests/min")
+    print(f"browser pool    : {after:7.2f}s  {args.tests / after * 60:8.1f} tests/min  (x{before / after:.1f}, {stats})")
+
+
+if __name__ == "__main__":
+    main()
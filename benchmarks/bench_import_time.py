@@ -0,0 +1,101 @@
+# benchmarks/bench_import_time.py
+"""
+Benchmark: pytest startup import cost per platform.
+
+Runs `pytest --collect-only` for a platform under `python -X importtime` and
+sums the import time (self time of every module) per top-level package.
+Platform fixtures are registered lazily from pytest_configure, so an API-only
+run must not pull in the browser / device stacks; the benchmark exits non-zero
+if it does (or if the total exceeds --max-ms).
+
+Usage:
+    python benchmarks/bench_import_time.py [--platform api] [--top 15] [--max-ms 0]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Stacks that belong to other platforms, never imported for an API-only run
+HEAVY_PACKAGES = {
+    "api": ("playwright", "appium", "selenium"),
+    "web": ("appium", "selenium"),
+    "mobile": ("playwright",),
+}
+
+# "import time:      self [us] |  cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_collect(platform):
+    command = [
+        sys.executable, "-X", "importtime", "-m", "pytest", "--collect-only", "-q",
+        "-p", "no:cacheprovider", "--platform", platform,
+    ]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    return time.perf_counter() - start, result
+
+
+def import_times(stderr):
+    """{top-level package: import time in us}"""
+    totals = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        # Self times add up without double counting nested imports, and
+        # attribute conftest-triggered imports to the package that was loaded
+        self_us, _, _, module = match.groups()
+        package = module.split(".")[0]
+        totals[package] = totals.get(package, 0) + int(self_us)
+    return totals
+
+
+def imported_packages(stderr):
+    packages = set()
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            packages.add(match.group(4).split(".")[0])
+    return packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pytest startup imports per platform")
+    parser.add_argument("--platform", default="api", choices=sorted(HEAVY_PACKAGES))
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, default=0,
+                        help="Fail if the total import time exceeds this budget (0 = no budget)")
+    args = parser.parse_args()
+
+    wall, result = run_collect(args.platform)
+    totals = import_times(result.stderr)
+    if not totals:
+        print(result.stdout[-2000:] + result.stderr[-2000:])
+        print("no -X importtime output captured")
+        return 2
+
+    total_ms = sum(totals.values()) / 1e3
+    print(f"pytest --collect-only --platform {args.platform}: {wall:.2f}s wall, "
+          f"{total_ms:.1f} ms imports, exit code {result.returncode}")
+    for package, us in sorted(totals.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {package:<28} {us / 1e3:9.1f} ms")
+
+    failures = []
+    leaked = sorted(imported_packages(result.stderr) & set(HEAVY_PACKAGES[args.platform]))
+    if leaked:
+        failures.append(f"{args.platform} startup imported {', '.join(leaked)}")
+    if args.max_ms and total_ms > args.max_ms:
+        failures.append(f"imports took {total_ms:.1f} ms (budget {args.max_ms:.1f} ms)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
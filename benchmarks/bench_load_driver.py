@@ -0,0 +1,130 @@
+# benchmarks/bench_load_driver.py
+"""
+Benchmark: the rate-limit step's request pattern against a local stub server,
+sequential with sleeps (previous send_multiple_requests) vs LoadDriver bursts
+and open-model runs.
+
+The stub answers after --latency-ms and returns 429 once more than --limit
+requests arrived in the current --window seconds, like a token endpoint with
+a rate limit.
+
+Usage:
+    python benchmarks/bench_load_driver.py [--requests 100] [--period 10] [--latency-ms 50] [--limit 60]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils.load_driver import LoadDriver
+
+
+class StubServer:
+    """Threaded HTTP server with a fixed latency and a fixed-window rate limit"""
+
+    def __init__(self, latency: float, limit: int, window: float):
+        stub = self
+        self.latency = latency
+        self.limit = limit
+        self.window = window
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.in_flight = self.max_in_flight = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status = stub.admit()
+                time.sleep(stub.latency)
+                with stub.lock:
+                    stub.in_flight -= 1
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", str(int(stub.window)))
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def admit(self) -> int:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            now = time.monotonic()
+            if now - self.window_start >= self.window:
+                self.window_start, self.window_count = now, 0
+            self.window_count += 1
+            return 429 if self.window_count > self.limit else 200
+
+    def reset(self) -> None:
+        with self.lock:
+            self.window_start, self.window_count, self.max_in_flight = time.monotonic(), 0, 0
+
+    def close(self) -> None:
+        self.server.shutdown()
+
+
+def sequential(send, count, period):
+    """send_multiple_requests as it was: one request, then sleep period/count"""
+    delay = period / count if count > 1 else 0
+    responses = []
+    for _ in range(count):
+        responses.append(send())
+        if delay > 0:
+            time.sleep(delay)
+    return responses
+
+
+def report(label, elapsed, statuses, extra=""):
+    limited = sum(status == 429 for status in statuses)
+    print(f"{label:<34} {elapsed:6.2f}s  {len(statuses)} requests, {limited} rate-limited  {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API load driver against a stub server")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--period", type=float, default=10.0, help="Seconds the requests must be sent within")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--limit", type=int, default=60, help="Requests allowed per window")
+    parser.add_argument("--window", type=float, default=60.0)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    stub = StubServer(args.latency_ms / 1000, args.limit, args.window)
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency)
+    session.mount("http://", adapter)
+    send = lambda: session.get(f"{stub.url}/auth/token")
+    try:
+        start = time.perf_counter()
+        responses = sequential(send, args.requests, args.period)
+        report("sequential + sleep", time.perf_counter() - start, [r.status_code for r in responses],
+               f"max in flight {stub.max_in_flight}")
+
+        for label, rate in (("LoadDriver burst", None), ("LoadDriver open model", args.requests / args.period)):
+            stub.reset()
+            result = LoadDriver(send, concurrency=args.concurrency).run(args.requests, rate=rate)
+            summary = result.summary()
+            report(f"{label} (x{args.concurrency})", result.elapsed, [r.status_code for r in result.results],
+                   f"max in flight {stub.max_in_flight}, p50 {summary['p50'] * 1000:.0f} ms, "
+                   f"p99 {summary['p99'] * 1000:.0f} ms, {summary['throughput']:.0f} req/s")
+    finally:
+        stub.close()
+
+
+if __name__ == "__main__":
+    main()
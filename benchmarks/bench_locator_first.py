@@ -0,0 +1,116 @@
+# benchmarks/bench_locator_first.py
+"""
+Benchmark: BasePage helpers with wait_for_selector() before every action
+(legacy) vs locator-first mode (cached Locators, one actionability wait).
+
+Drives the same form on a local static page both ways and reports wall time
+and Playwright round-trips (awaited page/locator calls) per action.
+
+Usage:
+    python benchmarks/bench_locator_first.py [--iterations 200] [--engine chromium]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "benchmarks"))
+
+from playwright.async_api import async_playwright
+
+from bench_browser_pool import start_static_site
+from targets.web.pages.base_page import BasePage
+
+FORM_HTML = """<!doctype html>
+<html><head><title>PyPlay locator benchmark</title></head>
+<body>
+<form id="login-form" onsubmit="return false">
+  <input id="username"> <input id="password" type="password">
+  <select id="role"><option value="user">User</option><option value="admin">Admin</option></select>
+  <button id="submit" type="submit">Login</button>
+  <p id="status">ready</p>
+</form>
+</body></html>
+"""
+
+# Helper calls per iteration
+ACTIONS = 5
+
+
+class RoundTripCounter:
+    """Wraps a Playwright object and counts awaited calls made through it"""
+
+    def __init__(self, target, counter):
+        self._target = target
+        self._counter = counter
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        counter = self._counter
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                counter[0] += 1
+                return result
+            # page.locator() is local; count the calls made on the Locator it returns
+            return RoundTripCounter(result, counter)
+        return call
+
+
+async def run(page, base_url, iterations, locator_first):
+    counter = [0]
+    base_page = BasePage(RoundTripCounter(page, counter), base_url)
+    base_page.locator_first = locator_first
+    await page.goto(f"{base_url}/form.html", wait_until="load")
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        await base_page.fill("#username", f"user{i}")
+        await base_page.fill("#password", "secret")
+        await base_page.select_option("#role", value="admin")
+        await base_page.hover("#submit")
+        await base_page.get_text("#status")
+    elapsed = time.perf_counter() - start
+    return elapsed, counter[0]
+
+
+async def main_async(iterations, engine, base_url):
+    async with async_playwright() as playwright:
+        browser = await getattr(playwright, engine).launch(headless=True)
+        page = await browser.new_page()
+        results = {}
+        for name, locator_first in (("wait_for_selector", False), ("locator-first", True)):
+            results[name] = await run(page, base_url, iterations, locator_first)
+        await browser.close()
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark locator-first BasePage helpers")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--engine", choices=["chromium", "firefox", "webkit"], default="chromium")
+    args = parser.parse_args()
+
+    server, base_url = start_static_site({"form.html": FORM_HTML})
+    try:
+        results = asyncio.run(main_async(args.iterations, args.engine, base_url))
+    finally:
+        server.shutdown()
+
+    actions = args.iterations * ACTIONS
+    print(f"{actions} helper calls on {args.engine}")
+    for name, (elapsed, round_trips) in results.items():
+        print(f"{name:18}: {elapsed / actions * 1e3:7.3f} ms/action  {round_trips / actions:4.2f} round-trips/action")
+    (before, before_trips), (after, after_trips) = results.values()
+    print(f"saved {(before_trips - after_trips) / actions:.2f} round-trips and "
+          f"{(before - after) / actions * 1e3:.3f} ms per action")
+
+
+if __name__ == "__main__":
+    main()
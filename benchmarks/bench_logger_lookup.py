@@ -0,0 +1,65 @@
+# benchmarks/bench_logger_lookup.py
+"""
+Micro-benchmark: Logger.get_logger() caller resolution with inspect.stack()
+(previous implementation) vs sys._getframe + per-code-object cache, called
+from a shallow stack and from a pytest-like deep one.
+
+Usage:
+    python benchmarks/bench_logger_lookup.py [--iterations 20000] [--depth 60]
+"""
+import argparse
+import inspect
+import os
+import sys
+import timeit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils.logger import Logger, get_logger
+
+
+def get_logger_inspect_stack(name=None):
+    """Logger.get_logger as it was: inspect.stack() to find the caller"""
+    if name is None:
+        frame = inspect.stack()[1]
+        module = inspect.getmodule(frame[0])
+        name = module.__name__ if module else "root"
+    return Logger._instances.get(name) or Logger.get_logger(name)
+
+
+def at_depth(depth, func):
+    """Call func with `depth` extra frames on the stack"""
+    if depth <= 0:
+        return func()
+    return at_depth(depth - 1, func)
+
+
+def bench(label, func, depth, iterations):
+    seconds = timeit.timeit(lambda: at_depth(depth, func), number=iterations)
+    baseline = timeit.timeit(lambda: at_depth(depth, lambda: None), number=iterations)
+    per_call = (seconds - baseline) / iterations * 1e6
+    print(f"{label:<32} depth {depth:>3}: {per_call:9.2f} us/call")
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark logger acquisition")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--depth", type=int, default=60, help="Stack depth of the deep case (pytest is ~60)")
+    args = parser.parse_args()
+
+    # Handlers write to stderr/logs; only acquisition is timed
+    sys.stderr = open(os.devnull, "w")
+    assert get_logger().name == get_logger_inspect_stack().name == __name__
+
+    for depth in (0, args.depth):
+        iterations = max(args.iterations // (10 if depth else 1), 1)
+        old = bench("inspect.stack()", get_logger_inspect_stack, depth, max(iterations // 20, 1))
+        new = bench("sys._getframe + code cache", get_logger, depth, iterations)
+        bench("explicit name", lambda: get_logger(__name__), depth, iterations)
+        print(f"{'':<32} speedup x{old / new:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_performance_monitor.py
+"""
+Benchmark: PerformanceMonitor memory and per-record cost as the number of
+recorded tests grows, streaming sink vs the previous list-of-dicts monitor
+that kept every record until save_metrics().
+
+Each "test" records one timer and two metrics with small metadata dicts.
+Timings are taken first; peak memory is measured in a second run under
+tracemalloc (which would skew the timings).
+
+Usage:
+    python benchmarks/bench_performance_monitor.py [--tests 1000 10000 50000]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils.performance_monitor import PerformanceMonitor
+
+
+class ListMonitor:
+    """PerformanceMonitor as it was: every record kept as a dict in a list"""
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.metrics = []
+
+    def start_timer(self, name):
+        return {"name": name, "start_time": time.time(), "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+    def end_timer(self, timer, success=True, metadata=None):
+        metric = {"name": timer["name"], "duration": time.time() - timer["start_time"],
+                  "success": success, "timestamp": timer["timestamp"]}
+        metric.update(metadata or {})
+        self.metrics.append(metric)
+
+    def record_metric(self, name, value, metadata=None):
+        metric = {"name": name, "value": value, "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")}
+        metric.update(metadata or {})
+        self.metrics.append(metric)
+
+    def save_metrics(self):
+        fieldnames = sorted({key for metric in self.metrics for key in metric})
+        with open(self.output_file, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(self.metrics)
+
+
+def run(monitor, tests):
+    for test in range(tests):
+        timer = monitor.start_timer("scenario")
+        monitor.record_metric("readiness_wait", 0.25, {"strategy": "network_idle", "url": f"/products/{test}"})
+        monitor.record_metric("network_filter", 18432, {"blocked": 12, "test": f"test_{test}"})
+        monitor.end_timer(timer, True, {"nodeid": f"features/search.feature::test_{test}"})
+
+
+def measure(label, factory, tests):
+    monitor = factory()
+    start = time.perf_counter()
+    run(monitor, tests)
+    recorded = time.perf_counter() - start
+    monitor.save_metrics()
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    monitor = factory()
+    run(monitor, tests)
+    _, peak_recording = tracemalloc.get_traced_memory()
+    monitor.save_metrics()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<10} {tests:>7} tests: {recorded / (tests * 3) * 1e6:5.2f} us/record, "
+          f"{total:5.2f}s incl. save, peak {peak_recording / 1e6:6.2f} MB while recording, "
+          f"{peak / 1e6:6.2f} MB incl. save")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PerformanceMonitor memory")
+    parser.add_argument("--tests", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        os.environ["PERFORMANCE_DIR"] = output_dir
+        for tests in args.tests:
+            measure("list", lambda: ListMonitor(os.path.join(output_dir, "list.csv")), tests)
+            measure("streaming", PerformanceMonitor, tests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_selector_resolver.py
+"""
+Micro-benchmark: original regex-based resolve_selector vs SelectorIndex.
+
+Usage:
+    python benchmarks/bench_selector_resolver.py [--platform web] [--iterations 200000]
+"""
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+import yaml
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils.selector_index import SELECTOR_KEY_REGEX, SelectorIndex
+
+
+def load_selectors(platform):
+    """Load locators/<platform>/*.yaml the same way conftest does"""
+    selectors = {}
+    for file_path in glob.glob(os.path.join(PROJECT_ROOT, "locators", platform, "*.yaml")):
+        with open(file_path, 'r') as f:
+            data = yaml.safe_load(f)
+            if data:
+                selectors[os.path.splitext(os.path.basename(file_path))[0]] = data
+    return selectors
+
+
+def legacy_resolver(selectors):
+    """The resolver as it was implemented before SelectorIndex"""
+    def _resolver(selector_key_string):
+        match = SELECTOR_KEY_REGEX.match(selector_key_string)
+        if not match:
+            raise ValueError(f"Invalid selector format: '{selector_key_string}'. Expected '{{file > key}}'")
+        file_key, element_key = match.groups()
+        locator_data = selectors[file_key][element_key]
+        if isinstance(locator_data, str):
+            return ("css selector", locator_data)
+        elif isinstance(locator_data, dict) and 'value' in locator_data:
+            locator_type = locator_data.get('type', 'css selector').lower()
+            return (locator_type, locator_data['value'])
+        raise TypeError(f"Unsupported locator format for '{file_key} > {element_key}'")
+    return _resolver
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark selector resolution")
+    parser.add_argument("--platform", default="web")
+    parser.add_argument("--iterations", type=int, default=200000)
+    args = parser.parse_args()
+
+    selectors = load_selectors(args.platform)
+    index = SelectorIndex(selectors).preload()
+    legacy = legacy_resolver(selectors)
+
+    keys = list(index.locators.keys())
+    if not keys:
+        print(f"No selectors found for platform '{args.platform}'")
+        return
+    # Same keys written with irregular spacing exercise the LRU front
+    dynamic_keys = [key.replace(" > ", ">") for key in keys]
+
+    for key in keys + dynamic_keys:
+        assert legacy(key) == index.resolve(key), key
+
+    def run(resolver, key_list):
+        n = len(key_list)
+        return lambda: [resolver(key_list[i % n]) for i in range(args.iterations)]
+
+    results = [
+        ("legacy resolver", timeit.timeit(run(legacy, keys), number=1)),
+        ("index (canonical keys)", timeit.timeit(run(index.resolve, keys), number=1)),
+        ("index (dynamic keys, LRU)", timeit.timeit(run(index.resolve, dynamic_keys), number=1)),
+    ]
+
+    baseline = results[0][1]
+    print(f"{len(keys)} selectors, {args.iterations} lookups per run")
+    for name, elapsed in results:
+        per_call_ns = elapsed / args.iterations * 1e9
+        print(f"{name:<28} {elapsed:8.4f}s  {per_call_ns:8.1f} ns/lookup  x{baseline / elapsed:5.2f}")
+
+
+if __name__ == "__main__":
+    main()
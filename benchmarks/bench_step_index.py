@@ -0,0 +1,117 @@
+# benchmarks/bench_step_index.py
+"""
+Benchmark: pytest-bdd's linear step lookup vs StepIndex.
+
+Loads every step definition module under steps/ and every feature file under
+features/, then matches each rendered step line (background + outline
+examples included) against the step library:
+
+  linear  - every definition's parser.is_matching(), like pytest-bdd does
+  cold    - StepIndex with an empty memo (first run of each step text)
+  warm    - StepIndex after every step text has been seen once
+
+Usage:
+    python benchmarks/bench_step_index.py [--rounds 50]
+"""
+import argparse
+import glob
+import importlib.util
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from pytest_bdd.feature import get_features
+
+from utils.step_index import StepIndex
+from utils.step_index import step_context as function_step_context
+
+
+def step_context(obj):
+    context = function_step_context(obj)
+    if context is None and hasattr(obj, "_get_wrapped_function"):
+        # pytest >= 8.4 wraps fixture functions
+        context = function_step_context(obj._get_wrapped_function())
+    return context
+
+
+def load_step_contexts():
+    contexts = []
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "steps", "**", "*.py"), recursive=True)):
+        name = "bench_steps_" + os.path.relpath(path, PROJECT_ROOT).replace(os.sep, "_")[:-3]
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except Exception as e:
+            print(f"skipping {os.path.relpath(path, PROJECT_ROOT)}: {e}")
+            continue
+        contexts.extend(c for c in map(step_context, vars(module).values()) if c is not None)
+    return contexts
+
+
+def load_steps():
+    steps = []
+    for feature in get_features([os.path.join(PROJECT_ROOT, "features")]):
+        for template in feature.scenarios.values():
+            examples = [ctx for ex in template.examples for ctx in ex.as_contexts()] or [{}]
+            for context in examples:
+                steps.extend((step.type, step.name) for step in template.render(context).steps)
+    return steps
+
+
+def linear(contexts, steps):
+    found = 0
+    for step_type, name in steps:
+        for context in contexts:
+            if context.type is not None and context.type != step_type:
+                continue
+            if context.parser.is_matching(name):
+                found += 1
+    return found
+
+
+def indexed(index, steps):
+    found = 0
+    for step_type, name in steps:
+        for context in index.matching(name):
+            if context.type is not None and context.type != step_type:
+                continue
+            found += 1
+    return found
+
+
+def timed(func, *args, rounds=1):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = func(*args)
+    return (time.perf_counter() - start) / rounds, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark step definition matching")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    contexts = load_step_contexts()
+    steps = load_steps()
+    print(f"{len(contexts)} step definitions, {len(steps)} step lines "
+          f"({len(set(name for _, name in steps))} distinct)")
+
+    build, index = timed(lambda: StepIndex((c.parser, c) for c in contexts))
+    linear_time, linear_found = timed(linear, contexts, steps, rounds=args.rounds)
+    cold_time, cold_found = timed(indexed, index, steps)
+    warm_time, warm_found = timed(indexed, index, steps, rounds=args.rounds)
+    assert linear_found == cold_found == warm_found, (linear_found, cold_found, warm_found)
+
+    per_step = 1e6 / len(steps)
+    print(f"index build : {build * 1e3:8.2f} ms  ({index.stats['buckets']} buckets)")
+    print(f"linear      : {linear_time * per_step:8.2f} us/step")
+    print(f"index, cold : {cold_time * per_step:8.2f} us/step  (x{linear_time / cold_time:.1f})")
+    print(f"index, warm : {warm_time * per_step:8.2f} us/step  (x{linear_time / warm_time:.1f})")
+
+
+if __name__ == "__main__":
+    main()
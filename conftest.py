@@ -2,9 +2,6 @@
 import pytest
 import os
 import sys
-import yaml
-import glob
-import re
 from pathlib import Path
 
 # Add project root to sys.path to enable imports
@@ -13,21 +10,60 @@ sys.path.insert(0, project_root)
 
 # Define the base directory for locators relative to the project root
 LOCATORS_BASE_DIR = Path(__file__).parent / "locators"
-
-# Regex to parse {file > key} syntax - precompile for efficiency
-SELECTOR_KEY_REGEX = re.compile(r"\{(.*?)\s*>\s*(.*?)\}")
-
-# Import fixtures from central location
-from fixtures.browser_fixtures import browser, context, page, page_objects, config
+FEATURES_BASE_DIR = Path(__file__).parent / "features"
+
+# Fixture modules loaded only for the selected --platform
+PLATFORM_PLUGINS = {
+    "web": ["fixtures.browser_fixtures"],
+    "mobile": ["fixtures.app_driver_fixture"],
+    "api": ["fixtures.api_client_fixture"],
+}
+
+# Import fixtures from central location; platform fixtures (and the heavy
+# stacks they import) are registered as plugins in pytest_configure
+from fixtures.config_fixtures import config, load_config
+from utils.dependency_map import DependencyMap
+from utils.feature_cache import (
+    install_feature_cache, restore_step_bindings, save_feature_cache, save_step_bindings, warm_feature_cache
+)
+from utils.logger import Logger
+from utils.lpt_scheduler import LPTSchedulerPlugin
+from utils.performance_monitor import get_performance_monitor
+from utils.platform_filter import PLATFORMS, PlatformFilter
+from utils.rerun import RerunPlugin
+from utils.selector_index import SELECTOR_KEY_REGEX, SelectorIndex
+from utils.selector_registry import SelectorRegistry
+from utils.selector_watcher import SelectorWatcher
+from utils.sharding import ShardPlugin
+from utils.step_index import install_step_index, installed_step_index
+from utils.step_timing import StepTimingPlugin
 
 # Platform selection through command line options
 def pytest_addoption(parser):
     parser.addoption("--platform", default="web", 
-                     choices=["web", "mobile", "api"],
+                     choices=list(PLATFORMS),
                      help="Specify the platform to run tests against")
     parser.addoption("--env", default="dev", 
                     choices=["dev", "qa", "prod"],
                     help="Specify the environment to run tests against")
+    parser.addoption("--watch-selectors", action="store_true", default=False,
+                    help="Hot-reload locator files when they change (for long-running debug sessions)")
+    parser.addoption("--changed-since", metavar="GIT_REF", default=None,
+                    help="Only run tests whose features, steps, pages or selector files changed since GIT_REF")
+    parser.addoption("--max-retries", type=int, default=None,
+                    help="Retry failed tests in-process up to N times (default: feature_flags.max_retries "
+                         "when feature_flags.retry_failed is on)")
+    parser.addoption("--shard", metavar="I/N", default=None,
+                    help="Only run shard I of N, split by --shard-weights durations")
+    parser.addoption("--shard-weights", metavar="PATH", default=None,
+                    help="durations.json to split shards by (use the same file on every shard; "
+                         "without it every test weighs the same)")
+    parser.addoption("--shard-manifest", metavar="PATH", default=None,
+                    help="Write the shard's tests and durations here for `run_tests.py merge`")
+    parser.addoption("--step-durations", metavar="N", type=int, default=0,
+                    help="Show the N step definitions and fixtures that took the most time in total")
+    parser.addoption("--lpt-schedule", action="store_true", default=False,
+                    help="With -n, hand out scenarios longest-first using recorded durations")
 
 # Conditionally load platform-specific fixtures and hooks
 @pytest.fixture(scope="session")
@@ -40,42 +76,103 @@ def environment(request):
 
 # We only need to configure the BDD paths once at the session level
 def pytest_configure(config):
-    config.option.keyword = f"{config.getoption('platform')}/"
-
-# Hook to skip tests not meant for the selected platform
-def pytest_collection_modifyitems(config, items):
-    platform = config.getoption("--platform")
-    
-    for item in items:
-        # Skip tests not meant for the selected platform
-        if f"/{platform}/" not in item.nodeid and f"{platform}_" not in item.nodeid:
-            skip_marker = pytest.mark.skip(reason=f"Test not for {platform} platform")
-            item.add_marker(skip_marker)
-
-def load_platform_selectors(platform):
-    """Loads all YAML selectors for a given platform."""
-    platform_locators_dir = LOCATORS_BASE_DIR / platform
-    all_selectors = {}
-    if not platform_locators_dir.is_dir():
-        # Optional: Log a warning if the directory doesn't exist
-        # print(f"Warning: Locator directory not found for platform '{platform}': {platform_locators_dir}")
-        return all_selectors # Return empty dict if platform dir doesn't exist
-
-    yaml_files = glob.glob(os.path.join(platform_locators_dir, '*.yaml'))
-
-    for file_path in yaml_files:
-        file_name_key = os.path.splitext(os.path.basename(file_path))[0]
+    # Only the selected platform's stack (Playwright, Appium, ...) gets imported
+    for plugin in PLATFORM_PLUGINS[config.getoption('platform')]:
+        config.pluginmanager.import_plugin(plugin)
+
+    # Tests for other platforms are neither imported nor reported
+    config.pluginmanager.register(
+        PlatformFilter(config, config.getoption('platform')), "pyplay-platform-filter"
+    )
+
+    # Scenario -> feature/step/page/selector files map, updated every run;
+    # --changed-since runs only the scenarios a change affects
+    config.pluginmanager.register(
+        DependencyMap(
+            config, load_platform_selectors(config.getoption('platform')),
+            changed_since=config.getoption('changed_since')
+        ),
+        "pyplay-dependency-map"
+    )
+
+    # --shard i/N: this CI node only runs its part of the suite
+    if config.getoption('shard'):
         try:
-            with open(file_path, 'r') as f:
-                data = yaml.safe_load(f)
-                if data: # Ensure file is not empty
-                    all_selectors[file_name_key] = data
-        except yaml.YAMLError as e:
-            print(f"Error loading YAML file {file_path}: {e}")
-        except Exception as e:
-            print(f"Error reading file {file_path}: {e}")
+            shard = ShardPlugin(config, config.getoption('shard'), config.getoption('shard_weights'),
+                                config.getoption('shard_manifest'))
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+        config.pluginmanager.register(shard, "pyplay-shard")
+
+    # Failed tests are retried in-process per feature_flags; chronically
+    # flaky ones are quarantined into a batch at the end of the run. Without
+    # retries pytest's own runtest protocol is left alone
+    feature_flags = load_config(config.getoption('env'), config.getoption('platform')).get('feature_flags', {})
+    max_retries = config.getoption('max_retries')
+    if max_retries is None:
+        max_retries = feature_flags.get('max_retries', 0) if feature_flags.get('retry_failed', False) else 0
+    quarantined = set()
+    if max_retries > 0:
+        rerun = RerunPlugin(config, max_retries, skip_quarantined=feature_flags.get('skip_flaky_tests', False))
+        config.pluginmanager.register(rerun, "pyplay-rerun")
+        quarantined = rerun.quarantined
+
+    # Test durations are recorded on every run; --lpt-schedule uses them to
+    # pack xdist workers longest-processing-time first
+    config.pluginmanager.register(
+        LPTSchedulerPlugin(config, enabled=config.getoption('lpt_schedule'), low_priority=quarantined),
+        "pyplay-lpt-scheduler"
+    )
+
+    # Metrics stream to one file per process; creating the monitor here fixes
+    # the run id before xdist workers are spawned, so they inherit it
+    get_performance_monitor()
+
+    # Every scenario, step and fixture is timed into the performance store
+    config.pluginmanager.register(
+        StepTimingPlugin(config, top=config.getoption('step_durations')), "pyplay-step-timing"
+    )
+
+    # Parsed .feature files come from a snapshot keyed by file hash
+    install_feature_cache()
+
+    # On the xdist controller, build the selector and feature snapshots once
+    # so workers only memory-map them instead of each parsing the files
+    if not hasattr(config, "workerinput") and getattr(config.option, "numprocesses", None):
+        load_platform_selectors(config.getoption("platform")).warm()
+        warm_feature_cache([FEATURES_BASE_DIR])
+
+def pytest_collection_finish(session):
+    # All step definition modules are imported by now; dispatch step lines
+    # through a prefix index instead of trying every pattern in turn, seeded
+    # with the step text -> definition bindings resolved by the previous run.
+    # The dependency map already installed it in collection_modifyitems.
+    restore_step_bindings(install_step_index(session._fixturemanager))
+
+# trylast: runs after session-scoped fixtures were torn down (and timed)
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session, exitstatus):
+    # Persist selector/feature files parsed during this run into the shared
+    # snapshots, along with the step bindings resolved
+    SelectorRegistry.persist_all()
+    save_feature_cache()
+    save_step_bindings(installed_step_index())
+    # Flush metrics recorded by fixtures during the run (network filter, ...),
+    # with the async logging queue counters (ASYNC_LOGGING=true); the
+    # controller runs last and merges the workers' files
+    monitor = get_performance_monitor()
+    for counter, value in Logger.async_stats().items():
+        monitor.record_metric(f"logging_{counter}", value)
+    monitor.save_metrics()
 
-    return all_selectors
+def load_platform_selectors(platform):
+    """
+    Returns the lazy selector registry for a platform (locators/<platform>/*.yaml,
+    empty files skipped). Files are only parsed when one of their
+    '{file > key}' entries is first used.
+    """
+    return SelectorRegistry.for_directory(LOCATORS_BASE_DIR / platform, cache_name=f"locators-{platform}",
+                                          extensions=(".yaml",))
 
 @pytest.fixture(scope="session")
 def selectors(request):
@@ -94,44 +191,32 @@ def selectors(request):
     loaded_selectors = load_platform_selectors(platform)
     if not loaded_selectors:
          print(f"Warning: No selectors loaded for platform '{platform}'. Check directory: {LOCATORS_BASE_DIR / platform}")
-    return loaded_selectors
+
+    watcher = None
+    if request.config.getoption("--watch-selectors"):
+        watcher = SelectorWatcher([loaded_selectors]).start()
+
+    yield loaded_selectors
+
+    if watcher is not None:
+        watcher.stop()
 
 @pytest.fixture(scope="session")
-def resolve_selector(selectors):
+def selector_index(selectors):
     """
-    Provides a helper function to resolve a '{file > key}' string
-    into a locator tuple (type, value) using the loaded selectors.
+    Session-scoped, read-only index mapping every '{file > key}' string
+    to a prebuilt locator tuple, built once from the loaded selectors.
     """
-    def _resolver(selector_key_string):
-        match = SELECTOR_KEY_REGEX.match(selector_key_string)
-        if not match:
-            # Maybe it's not a {file > key} string, could be direct text/value
-            # Decide how to handle this case - raise error or return None/original?
-            # For now, assume it MUST be in the {file > key} format for element lookups
-             raise ValueError(f"Invalid selector format: '{selector_key_string}'. Expected '{{file > key}}'")
+    return SelectorIndex(selectors)
 
-        file_key, element_key = match.groups()
+@pytest.fixture(scope="session")
+def resolve_selector(selector_index):
+    """
+    Provides a helper function to resolve a '{file > key}' string
+    into a locator tuple (type, value) using the loaded selectors.
 
-        try:
-            locator_data = selectors[file_key][element_key]
-
-            if isinstance(locator_data, str):
-                # Assume default type is 'css selector' if only string is provided
-                return ("css selector", locator_data)
-            elif isinstance(locator_data, dict) and 'value' in locator_data:
-                # Use specified type or default to 'css selector'
-                locator_type = locator_data.get('type', 'css selector').lower()
-                return (locator_type, locator_data['value'])
-            else:
-                raise TypeError(f"Unsupported locator format for '{file_key} > {element_key}' in {file_key}.yaml")
-
-        except KeyError:
-            raise KeyError(f"Selector key '{element_key}' not found in '{file_key}.yaml' or file '{file_key}' not loaded/found in platform '{selectors.get('_platform', 'unknown')}'.") # Improve error
-        except TypeError:
-             raise TypeError(f"File key '{file_key}' (from {file_key}.yaml) does not seem to contain valid selector data or was not loaded correctly.")
-
-    # Add the platform info to the selectors dict for better error messages potentially
-    # This is a bit hacky, maybe find a cleaner way if needed
-    # selectors['_platform'] = platform_being_used
-
-    return _resolver
\ No newline at end of file
+    Canonical keys are a single dict lookup returning a shared tuple;
+    anything else (extra whitespace, unknown keys) goes through an LRU-cached
+    regex parse that raises the same ValueError/KeyError/TypeError as before.
+    """
+    return selector_index.resolve
@@ -64,4 +64,11 @@ Feature: Authentication API Endpoints
     When "{request_count}" simultaneous "{http_method}" requests are sent to "{endpoint_path}" with valid credentials
     Then all successful responses should be returned within "{time_limit}"
     And no response should take longer than "{max_time_limit}"
-    And at least "{success_percentage}" of the requests should succeed with status code "{status_code}"
\ No newline at end of file
+    And at least "{success_percentage}" of the requests should succeed with status code "{status_code}"
+
+  @performance
+  Scenario: Token endpoint under sustained load
+    When "{http_method}" requests are sent to "{endpoint_path}" at "{rate}" per second for "{time_period}" with at most "{concurrency}" in flight
+    Then the "p95" latency should be below "{time_limit}"
+    And the throughput should be at least "{min_rate}" requests per second
+    And no more than "{error_percentage}" of the requests should fail
@@ -1,165 +1,231 @@
 # fixtures/web_fixtures.py
 
 import pytest
-import configparser
 from playwright.async_api import async_playwright
 from targets.web.pages.base_page import BasePage
 from targets.web.pages.login_page import LoginPage
+from targets.web.helpers.web_vitals import DEFAULT_RESOURCE_ENTRIES, INIT_SCRIPT, WebVitalsCollector
+from utils.auth_state_cache import AuthStateCache, DEFAULT_TTL_SECONDS, get_auth_role
+from utils.browser_pool import BrowserPool, engine_name
+from utils.context_pool import ContextPool
+from utils.network_filter import NetworkFilter
+from utils.performance_monitor import get_performance_monitor
 import yaml
 import os
 import logging
 
-def load_config(env='dev', platform='web'):
-    """Load configuration for the specified environment and platform."""
-    config_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config')
-    
-    # Load common config
-    with open(os.path.join(config_dir, 'common_config.yaml'), 'r') as file:
-        common_config = yaml.safe_load(file) or {}
-    
-    # Load platform-specific config
-    with open(os.path.join(config_dir, 'platforms', f'{platform}_config.yaml'), 'r') as file:
-        platform_config = yaml.safe_load(file) or {}
-    
-    # Load environment-specific config
-    with open(os.path.join(config_dir, 'environments', f'{env}.yaml'), 'r') as file:
-        env_config = yaml.safe_load(file) or {}
-    
-    # Merge configs with environment-specific taking precedence
-    # First merge common and web configs
-    config = {**common_config, **platform_config}
-    
-    # Then override with environment-specific web config
-    if 'web' in env_config:
-        # For web-specific settings in env file
-        if 'web' in config:
-            config['web'] = {**config['web'], **env_config['web']}
-        else:
-            config['web'] = env_config['web']
-    
-    # Add other environment settings
-    for key, value in env_config.items():
-        if key != 'web':  # Skip web as we've already handled it
-            config[key] = value
-
-    return config
 
 @pytest.fixture(scope="session")
-def config(request):
-    """Fixture to load and provide configuration."""
-
-    # Check if --env is passed via the command line
-    env = request.config.getoption("--env", default=None)
+async def browser_pool(config):
+    """Session-scoped (per xdist worker) pool of warm browsers."""
+    web_config = config.get('web', {})
+    browser_settings = web_config.get('browser', {})
+    pool_settings = browser_settings.get('pool', {})
 
-    # If --env is not passed, fallback to reading pytest.ini
-    if env is None:
-        # Read the pytest.ini file
-        config_parser = configparser.ConfigParser()
-        config_parser.read('pytest.ini')
+    async with async_playwright() as playwright:
+        pool = BrowserPool(
+            playwright,
+            size=pool_settings.get('size', 1),
+            recycle_after=pool_settings.get('recycle_after', 50),
+            launch_options={"headless": browser_settings.get('headless', True)}
+        )
 
-        # Fetch the environment setting from the [pytest] section
-        env = config_parser.get('pytest', 'env', fallback='dev')  # Default to 'dev' if not found
-    
-    # platform is web by default as it is browser fixtures
-    config = load_config(env=env, platform='web')
+        # Launch the default engine before the first test needs it
+        await pool.warm(engine_name(browser_settings.get('default', 'chrome')))
 
-    # Set up logging based on config
-    logging_level = getattr(logging, config.get('logging_level', 'INFO'))
-    logging.basicConfig(level=logging_level)
+        yield pool
+        await pool.close()
 
-    return config
 
 @pytest.fixture
-async def browser():
-    """Fixture to create and manage browser instance."""
-    async with async_playwright() as playwright:
-        web_config = config.get('web', {})
-        browser_settings = web_config.get('browser', {})
-        
-        # Determine browser type
-        browser_type_name = browser_settings.get('default', 'chrome').lower()
-        if browser_type_name == 'chrome':
-            browser_type = playwright.chromium
-        elif browser_type_name == 'firefox':
-            browser_type = playwright.firefox
-        elif browser_type_name == 'webkit':
-            browser_type = playwright.webkit
-        else:
-            browser_type = playwright.chromium  # Default fallback
-        
-        # Launch browser with appropriate options
-        headless = browser_settings.get('headless', True)
-        
-        browser_instance = await browser_type.launch(headless=headless)
+async def browser(browser_pool, config):
+    """Fixture to lease a warm browser instance from the session pool."""
+    web_config = config.get('web', {})
+    browser_settings = web_config.get('browser', {})
 
-        yield browser_instance
-        await browser_instance.close()
+    # Determine browser type
+    engine = engine_name(browser_settings.get('default', 'chrome'))
 
+    pooled = await browser_pool.acquire(engine)
 
-@pytest.fixture
-async def context(browser, config):
-    """Fixture to create and manage browser context."""
+    yield pooled.browser
+    await browser_pool.release(pooled)
+
+
+async def login_storage_state(browser, base_url, credentials):
+    """Log in through the UI in a throwaway context and return its storage_state."""
+    login_context = await browser.new_context(base_url=base_url)
+    try:
+        login_page = LoginPage(await login_context.new_page(), base_url)
+        await login_page.navigate()
+        await login_page.login(credentials['username'], credentials['password'])
+        return await login_context.storage_state()
+    finally:
+        await login_context.close()
+
+
+@pytest.fixture(scope="session")
+def auth_state_cache(config):
+    """Session-wide cache of logged-in storage states per (env, role, base_url)."""
+    auth_settings = config.get('web', {}).get('auth_state', {})
+    return AuthStateCache(
+        directory=auth_settings.get('directory'),
+        ttl=auth_settings.get('ttl', DEFAULT_TTL_SECONDS)
+    )
+
+
+async def load_cookies(browser_context, cookies_config):
+    """Add cookies saved by a previous run to a context, if configured."""
+    if not cookies_config.get('load_on_start', False):
+        return
+    cookies_path = cookies_config.get('path', './data/cookies')
+    try:
+        # Load cookies if file exists
+        if os.path.exists(cookies_path):
+            with open(cookies_path, 'r') as f:
+                cookies = yaml.safe_load(f)
+                if cookies:
+                    await browser_context.add_cookies(cookies)
+    except Exception as e:
+        logging.warning(f"Failed to load cookies: {e}")
+
+
+async def save_cookies(browser_context, cookies_config):
+    """Persist a context's cookies for the next run, if configured."""
+    if not cookies_config.get('save_on_exit', False):
+        return
+    cookies_path = cookies_config.get('path', './data/cookies')
+    try:
+        cookies_dir = os.path.dirname(cookies_path)
+        if not os.path.exists(cookies_dir):
+            os.makedirs(cookies_dir)
+        
+        cookies = await browser_context.cookies()
+        with open(cookies_path, 'w') as f:
+            yaml.dump(cookies, f)
+    except Exception as e:
+        logging.warning(f"Failed to save cookies: {e}")
+
+
+@pytest.fixture(scope="session")
+async def context_pool(browser_pool, config):
+    """Session-scoped pool that prepares the next test's context and page in the background."""
     web_config = config.get('web', {})
+    browser_settings = web_config.get('browser', {})
     
     # Get base URL from environment-specific config
     base_url = web_config.get('base_url', 'http://localhost:3000')
+    default_timeout = web_config.get('default_timeout', 30) * 1000  # Convert to ms
+    web_vitals = web_config.get('web_vitals', {}).get('enabled', True)
     
-    # Create context with configuration
-    browser_context = await browser.new_context(
-        viewport={"width": 1920, "height": 1080},
-        base_url=base_url
-    )
+    async def setup(browser_context, page_instance):
+        # Set default timeout (prioritize env-specific setting if available)
+        browser_context.set_default_timeout(default_timeout)
+        page_instance.set_default_timeout(default_timeout)
+        # Observe LCP/CLS/INP from the start of every document
+        if web_vitals:
+            await browser_context.add_init_script(INIT_SCRIPT)
     
-    # Handle cookies if configured
-    cookies_config = web_config.get('cookies', {})
-    if cookies_config.get('load_on_start', False):
-        cookies_path = cookies_config.get('path', './data/cookies')
-        try:
-            # Load cookies if file exists
-            if os.path.exists(cookies_path):
-                with open(cookies_path, 'r') as f:
-                    cookies = yaml.safe_load(f)
-                    if cookies:
-                        await browser_context.add_cookies(cookies)
-        except Exception as e:
-            logging.warning(f"Failed to load cookies: {e}")
-    
-    yield browser_context
+    pool = ContextPool(
+        browser_pool,
+        engine_name(browser_settings.get('default', 'chrome')),
+        context_options={"viewport": {"width": 1920, "height": 1080}, "base_url": base_url},
+        setup=setup,
+        prefetch=browser_settings.get('pool', {}).get('prefetch_contexts', True)
+    )
     
-    # Save cookies on exit if configured
-    if cookies_config.get('save_on_exit', False):
-        cookies_path = cookies_config.get('path', './data/cookies')
-        try:
-            cookies_dir = os.path.dirname(cookies_path)
-            if not os.path.exists(cookies_dir):
-                os.makedirs(cookies_dir)
-            
-            cookies = await browser_context.cookies()
-            with open(cookies_path, 'w') as f:
-                yaml.dump(cookies, f)
-        except Exception as e:
-            logging.warning(f"Failed to save cookies: {e}")
-    
-    await browser_context.close()
+    yield pool
+    await pool.close()
+
+
+@pytest.fixture(scope="session")
+def network_filter(config):
+    """Session-wide request blocking/stubbing profile from web.network_filter."""
+    network_filter = NetworkFilter(config.get('web', {}).get('network_filter', {}))
+    yield network_filter
+    if network_filter.enabled:
+        logging.info(f"Network filter: {network_filter.totals.as_dict()}")
+
 
 @pytest.fixture
-async def page(context, config):
-    """Fixture to create and manage page."""
+async def pooled_context(request, context_pool, config, auth_state_cache, network_filter):
+    """Fixture to check out a prepared context and page for one test."""
     web_config = config.get('web', {})
+    base_url = web_config.get('base_url', 'http://localhost:3000')
     
-    # Create new page
-    page_instance = await context.new_page()
+    # Reuse a cached login for tests tagged with a user role instead of
+    # driving the login form again
+    storage_state = None
+    role = get_auth_role(request.node)
+    if role and web_config.get('auth_state', {}).get('enabled', True):
+        credentials = web_config.get('users', {}).get(role)
+        if credentials is None:
+            raise KeyError(f"No credentials configured for role '{role}' under web.users")
+        
+        async def login():
+            lease = await context_pool.browser_pool.acquire(context_pool.engine)
+            try:
+                return await login_storage_state(lease.browser, base_url, credentials)
+            finally:
+                await context_pool.browser_pool.release(lease)
+        
+        env = request.config.getoption("--env", default="dev")
+        storage_state = await auth_state_cache.get_or_create(env, role, base_url, login=login)
     
-    # Configure timeouts from config
-    timeouts = web_config.get('timeouts', {})
-    default_timeout = web_config.get('default_timeout', 30) * 1000  # Convert to ms
+    pooled = await context_pool.checkout(storage_state)
+    
+    # Cookies are read when the test starts, not when the context was
+    # prefetched, so a previous test's save_on_exit is picked up
+    await load_cookies(pooled.context, web_config.get('cookies', {}))
     
-    # Set default timeout (prioritize env-specific setting if available)
-    page_instance.set_default_timeout(default_timeout)
+    # Block analytics, fonts, images... that no step asserts on
+    network_stats = await network_filter.apply(pooled.context, request.node)
     
-    # Configure other page settings as needed
+    yield pooled
     
-    yield page_instance
+    if network_stats is not None:
+        network_filter.record(network_stats)
+        for name, value in network_stats.as_dict().items():
+            request.node.user_properties.append((f"network_{name}", value))
+        get_performance_monitor().record_metric(
+            "network_filter", network_stats.bytes_saved,
+            {"test": request.node.nodeid, **network_stats.as_dict()}
+        )
+    
+    # Save cookies on exit if configured
+    await save_cookies(pooled.context, web_config.get('cookies', {}))
+    
+    await context_pool.checkin(pooled)
+
+
+@pytest.fixture
+async def context(pooled_context):
+    """Fixture to provide the test's browser context."""
+    return pooled_context.context
+
+
+@pytest.fixture
+async def page(request, pooled_context, config):
+    """Fixture to provide the test's page (already created with the context)."""
+    web_config = config.get('web', {})
+    
+    # Navigation/Resource Timing, Web Vitals and JS heap of every document
+    # the test loads go to the performance metrics
+    collector = None
+    vitals_config = web_config.get('web_vitals', {})
+    if vitals_config.get('enabled', True):
+        scenario = getattr(getattr(request.node, "function", None), "__scenario__", None)
+        collector = await WebVitalsCollector(
+            pooled_context.page,
+            tags={"test": request.node.nodeid, "scenario": getattr(scenario, "name", request.node.name)},
+            resource_entries=vitals_config.get('resource_entries', DEFAULT_RESOURCE_ENTRIES),
+            js_heap=vitals_config.get('js_heap', True)
+        ).start()
+    
+    yield pooled_context.page
+    
+    if collector is not None:
+        await collector.stop()
     
     # Take screenshot on failure if configured
     screenshots_config = web_config.get('screenshots', {})
@@ -167,8 +233,6 @@ async def page(context, config):
         # This will be in the finalizer, but we don't have test result here
         # You would need to implement this with a pytest hook in conftest.py
         pass
-    
-    await page_instance.close()
 
 @pytest.fixture
 async def page_objects(page, config):
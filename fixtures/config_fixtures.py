@@ -0,0 +1,67 @@
+# fixtures/config_fixtures.py
+
+import pytest
+import configparser
+import yaml
+import os
+import logging
+
+def load_config(env='dev', platform='web'):
+    """Load configuration for the specified environment and platform."""
+    config_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config')
+    
+    # Load common config
+    with open(os.path.join(config_dir, 'common_config.yaml'), 'r') as file:
+        common_config = yaml.safe_load(file) or {}
+    
+    # Load platform-specific config
+    with open(os.path.join(config_dir, 'platforms', f'{platform}_config.yaml'), 'r') as file:
+        platform_config = yaml.safe_load(file) or {}
+    
+    # Load environment-specific config
+    with open(os.path.join(config_dir, 'environments', f'{env}.yaml'), 'r') as file:
+        env_config = yaml.safe_load(file) or {}
+    
+    # Merge configs with environment-specific taking precedence
+    # First merge common and web configs
+    config = {**common_config, **platform_config}
+    
+    # Then override with environment-specific web config
+    if 'web' in env_config:
+        # For web-specific settings in env file
+        if 'web' in config:
+            config['web'] = {**config['web'], **env_config['web']}
+        else:
+            config['web'] = env_config['web']
+    
+    # Add other environment settings
+    for key, value in env_config.items():
+        if key != 'web':  # Skip web as we've already handled it
+            config[key] = value
+
+    return config
+
+@pytest.fixture(scope="session")
+def config(request):
+    """Fixture to load and provide configuration."""
+
+    # Check if --env is passed via the command line
+    env = request.config.getoption("--env", default=None)
+
+    # If --env is not passed, fallback to reading pytest.ini
+    if env is None:
+        # Read the pytest.ini file
+        config_parser = configparser.ConfigParser()
+        config_parser.read('pytest.ini')
+
+        # Fetch the environment setting from the [pytest] section
+        env = config_parser.get('pytest', 'env', fallback='dev')  # Default to 'dev' if not found
+    
+    # platform is web by default as it is browser fixtures
+    config = load_config(env=env, platform='web')
+
+    # Set up logging based on config
+    logging_level = getattr(logging, config.get('logging_level', 'INFO'))
+    logging.basicConfig(level=logging_level)
+
+    return config
@@ -5,6 +5,11 @@ import os
 import sys
 
 def main():
+    # `run_tests.py merge [shard dirs...]` combines the outputs of sharded runs
+    if len(sys.argv) > 1 and sys.argv[1] == "merge":
+        from utils.report_merger import main as merge_main
+        sys.exit(merge_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(description="Run automation tests")
     parser.add_argument("--browser", choices=["chromium", "firefox", "webkit"], default="chromium")
     parser.add_argument("--env", choices=["dev", "staging", "prod"], default="staging")
@@ -13,12 +18,40 @@ def main():
     parser.add_argument("--visual", action="store_true", help="Run visual tests")
     parser.add_argument("--parallel", type=int, help="Number of parallel workers")
     parser.add_argument("--tags", help="Tags to filter tests")
+    parser.add_argument("--changed-since", metavar="GIT_REF",
+                        help="Only run scenarios affected by changes since a git ref")
+    parser.add_argument("--shard", metavar="I/N", help="Only run shard I of N (e.g. 2/4), one per CI node")
+    parser.add_argument("--shard-weights", metavar="PATH",
+                        help="durations.json to split shards by (written by `run_tests.py merge`)")
     parser.add_argument("--report", choices=["html", "allure"], default="html")
+    parser.add_argument("--perf-gate", choices=["fail", "warn"],
+                        help="Compare scenario and step durations with earlier runs; fail or only warn on regressions")
+    parser.add_argument("--perf-baseline", metavar="PATH", help="SQLite baseline file for --perf-gate")
+    parser.add_argument("--perf-accept", action="store_true",
+                        help="Record this run's regressed durations as the new baseline")
     
     args = parser.parse_args()
     
     # Build pytest command
     cmd = ["pytest"]
+    env = dict(os.environ)
+    
+    # Each shard writes everything under its own directory for `run_tests.py merge`
+    reports_dir = "reports"
+    if args.shard:
+        from utils.report_merger import JUNIT_FILE, MANIFEST_FILE, shard_dir
+        from utils.sharding import parse_shard
+        try:
+            reports_dir = shard_dir(*parse_shard(args.shard))
+        except ValueError as e:
+            parser.error(str(e))
+        cmd.extend(["--shard", args.shard,
+                    "--shard-manifest", os.path.join(reports_dir, MANIFEST_FILE),
+                    "--junitxml", os.path.join(reports_dir, JUNIT_FILE)])
+        if args.shard_weights:
+            cmd.extend(["--shard-weights", args.shard_weights])
+        env["LOG_DIR"] = os.path.join(reports_dir, "logs")
+        env["PERFORMANCE_DIR"] = os.path.join(reports_dir, "performance")
     
     # Add browser option
     cmd.extend(["--browser", args.browser])
@@ -38,30 +71,42 @@ def main():
     if args.visual:
         cmd.append("--visual")
     
-    # Add parallel execution if specified
+    # Add parallel execution if specified, longest scenarios first
     if args.parallel:
-        cmd.extend(["-n", str(args.parallel)])
+        cmd.extend(["-n", str(args.parallel), "--lpt-schedule"])
     
     # Add tags if specified
     if args.tags:
         cmd.extend(["-m", args.tags])
     
+    # Only run scenarios affected by changed files
+    if args.changed_since:
+        cmd.extend(["--changed-since", args.changed_since])
+    
     # Add report option
     if args.report == "allure":
-        cmd.extend(["--alluredir", "reports/allure_reports"])
+        cmd.extend(["--alluredir", os.path.join(reports_dir, "allure_reports")])
     else:
-        cmd.extend(["--html", "reports/html_reports/report.html", "--self-contained-html"])
+        cmd.extend(["--html", os.path.join(reports_dir, "html_reports", "report.html"), "--self-contained-html"])
     
     # Run the command
     try:
-        subprocess.run(cmd, check=True)
+        subprocess.run(cmd, check=True, env=env)
     except subprocess.CalledProcessError as e:
         print(f"Tests failed with exit code {e.returncode}")
         sys.exit(e.returncode)
     
-    # Generate Allure report if selected
-    if args.report == "allure":
+    # Generate Allure report if selected (sharded results are generated by merge)
+    if args.report == "allure" and not args.shard:
         subprocess.run(["allure", "generate", "reports/allure_reports", "--clean", "-o", "reports/allure_html"])
+    
+    # Compare durations with the rolling baseline of earlier runs
+    if args.perf_gate:
+        from utils.perf_baseline import gate
+        metrics_file = os.path.join(env.get("PERFORMANCE_DIR", os.path.join("reports", "performance")),
+                                    "performance_metrics.csv")
+        if gate(metrics_file, args.perf_gate, args.perf_baseline, args.perf_accept):
+            sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
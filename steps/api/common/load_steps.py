@@ -0,0 +1,53 @@
+# steps/api/common/load_steps.py
+
+from pytest_bdd import when, then, parsers
+from targets.api.helpers.request_builder import RequestBuilder
+from utils.load_driver import DEFAULT_CONCURRENCY, LoadDriver, parse_duration
+from utils.performance_monitor import get_performance_monitor
+
+@when(parsers.parse('"{http_method}" requests are sent to "{endpoint_path}" at "{rate}" per second for "{time_period}"'))
+def send_load(api_client, http_method, endpoint_path, rate, time_period, context, config, request):
+    """Open-model load: start requests at a fixed rate, whether or not earlier ones have returned."""
+    load_settings = config.get('load_testing', {})
+    run_load(api_client, http_method, endpoint_path, float(rate), parse_duration(time_period),
+             load_settings.get('max_concurrency', DEFAULT_CONCURRENCY), load_settings.get('arrival', 'uniform'),
+             context, request)
+
+@when(parsers.parse('"{http_method}" requests are sent to "{endpoint_path}" at "{rate}" per second for "{time_period}" with at most "{concurrency}" in flight'))
+def send_load_with_concurrency(api_client, http_method, endpoint_path, rate, time_period, concurrency, context, config, request):
+    """Open-model load with an explicit bound on concurrent requests."""
+    run_load(api_client, http_method, endpoint_path, float(rate), parse_duration(time_period), int(concurrency),
+             config.get('load_testing', {}).get('arrival', 'uniform'), context, request)
+
+def run_load(api_client, http_method, endpoint_path, rate, seconds, concurrency, arrival, context, request):
+    request_builder = RequestBuilder(api_client)
+    driver = LoadDriver(lambda: request_builder.send_request(http_method, endpoint_path),
+                        concurrency=concurrency, arrival=arrival)
+    result = driver.run(max(1, round(rate * seconds)), rate=rate)
+    result.record(get_performance_monitor(), {
+        "test": request.node.nodeid, "endpoint": endpoint_path, "method": http_method,
+    })
+    context["load_result"] = result
+    context["responses"] = result.responses
+
+@then(parsers.parse('the "{percentile}" latency should be below "{time_limit}"'))
+def verify_latency_percentile(context, percentile, time_limit):
+    """Verify a latency percentile of the last load run, e.g. "p95" below "300 ms"."""
+    result = context["load_result"]
+    latency = result.latency_percentile(float(percentile.lstrip("pP")))
+    limit = parse_duration(time_limit)
+    assert latency <= limit, f"{percentile} latency {latency * 1000:.0f} ms exceeds {time_limit}: {result.summary()}"
+
+@then(parsers.parse('the throughput should be at least "{rate}" requests per second'))
+def verify_throughput(context, rate):
+    """Verify the completed requests per second of the last load run."""
+    result = context["load_result"]
+    assert result.throughput >= float(rate), f"Throughput {result.throughput:.1f}/s below {rate}/s: {result.summary()}"
+
+@then(parsers.parse('no more than "{error_percentage}" of the requests should fail'))
+def verify_error_rate(context, error_percentage):
+    """Verify the share of requests that raised or returned a 5xx status."""
+    result = context["load_result"]
+    failed = sum(r.error is not None or (r.status_code or 0) >= 500 for r in result.results)
+    allowed = float(error_percentage.rstrip("%")) / 100 * len(result.results)
+    assert failed <= allowed, f"{failed} of {len(result.results)} requests failed: {result.status_counts()}"
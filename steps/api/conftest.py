@@ -0,0 +1,9 @@
+# steps/api/conftest.py
+
+import pytest
+from fixtures.config_fixtures import load_config
+
+@pytest.fixture(scope="session")
+def config(request):
+    """API steps read config/platforms/api_config.yaml (load_testing, rate_limiting, ...) instead of the web config."""
+    return load_config(env=request.config.getoption("--env", default="dev"), platform='api')
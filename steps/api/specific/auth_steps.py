@@ -3,10 +3,11 @@
 from pytest_bdd import given, when, then, parsers
 import requests
 import json
-import time
 from targets.api.services.auth_service import AuthService
 from targets.api.helpers.request_builder import RequestBuilder
 from targets.api.helpers.schema_validator import SchemaValidator
+from utils.load_driver import DEFAULT_CONCURRENCY, LoadDriver, parse_duration
+from utils.performance_monitor import get_performance_monitor
 
 @given(parsers.parse('the "{endpoint_name}" endpoints are available'))
 def verify_endpoints_available(api_client, endpoint_name):
@@ -57,30 +58,24 @@ def send_request_with_token(api_client, http_method, endpoint_path, token_name,
     context["response"] = response
 
 @when(parsers.parse('"{request_count}" "{http_method}" requests are sent to "{endpoint_path}" within "{time_period}"'))
-def send_multiple_requests(api_client, request_count, http_method, endpoint_path, time_period, context):
+def send_multiple_requests(api_client, request_count, http_method, endpoint_path, time_period, context, config):
     """Send multiple requests to the specified endpoint within the specified time period."""
     request_builder = RequestBuilder(api_client)
-    responses = []
     count = int(request_count)
+    period = parse_duration(time_period)
     
-    # Parse time period (e.g., "1 minute" to seconds)
-    value, unit = time_period.split()
-    total_seconds = 0
-    if unit.lower().startswith('min'):
-        total_seconds = int(value) * 60
-    elif unit.lower().startswith('sec'):
-        total_seconds = int(value)
+    # Spread evenly over the period as before, with a late response no longer
+    # pushing back the requests after it
+    load_settings = config.get('load_testing', {})
+    driver = LoadDriver(lambda: request_builder.send_request(http_method, endpoint_path),
+                        concurrency=max(1, min(count, load_settings.get('max_concurrency', DEFAULT_CONCURRENCY))))
+    result = driver.run(count, rate=count / period if period > 0 else None)
+    result.record(get_performance_monitor(), {"endpoint": endpoint_path, "method": http_method})
     
-    # Calculate delay between requests to spread them evenly
-    delay = total_seconds / count if count > 1 else 0
+    result.raise_first_error()
     
-    for _ in range(count):
-        response = request_builder.send_request(http_method, endpoint_path)
-        responses.append(response)
-        if delay > 0:
-            time.sleep(delay)
-    
-    context["responses"] = responses
+    context["responses"] = result.responses
+    context["load_result"] = result
 
 @then(parsers.parse('the response status code should be "{status_code}"'))
 def verify_status_code(context, status_code):
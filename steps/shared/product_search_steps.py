@@ -3,9 +3,6 @@
 from pytest_bdd import given, when, then, parsers
 import time
 import statistics
-from targets.web.pages.search_page import WebSearchPage
-from targets.mobile.screens.search_screen import MobileSearchScreen
-from targets.api.services.product_service import ProductService
 
 @given(parsers.parse('the system has the following "{entity_type}":'))
 def setup_system_data(context, entity_type, table):
@@ -33,6 +30,8 @@ def setup_system_data(context, entity_type, table):
     platform = context.get('platform', 'api')  # Default to API if not specified
     
     if platform == 'api':
+        # Platform stacks are imported on use so shared steps stay cheap to load
+        from targets.api.services.product_service import ProductService
         product_service = ProductService(context.get('api_client'))
         product_service.setup_test_data(entity_type, entities)
     else:
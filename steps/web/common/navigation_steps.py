@@ -7,6 +7,7 @@ from playwright.async_api import async_playwright
 import pytest
 from pytest_bdd import given, when, then, parsers
 from playwright.sync_api import Page
+from targets.web.helpers.readiness import goto_ready, wait_until_ready
 
 
 logger = structlog.get_logger(__name__)
@@ -24,9 +25,9 @@ class PlaywrightHelper:
         logger.info("Maximizing window (setting large viewport size)")
         await self.page.set_viewport_size({"width": 1920, "height": 1080})
 
-    async def navigate_to_url(self, url):
+    async def navigate_to_url(self, url, readiness=None):
         logger.info(f"Navigating to URL: {url}")
-        await self.page.goto(url)
+        await goto_ready(self.page, url, readiness)
 
     async def refresh_page(self):
         logger.info("Refreshing page")
@@ -54,12 +55,23 @@ async def maximize_browser(page):
     helper = PlaywrightHelper(page)
     await helper.maximize_window()
 
-@given(parsers.re("I am on the (url|page|site) '(?P<page_url>.*)'"))
-@when(parsers.re("I am on the (url|page|site) '(?P<page_url>.*)'"))
+@given(parsers.re("I am on the (url|page|site) '(?P<page_url>[^']*)'"))
+@when(parsers.re("I am on the (url|page|site) '(?P<page_url>[^']*)'"))
 async def open_webpage(page, base_url: str, page_url: str):
     helper = PlaywrightHelper(page)
     await helper.navigate_to_url(f"{base_url}{page_url}")
 
+@given(parsers.re("I am on the (url|page|site) '(?P<page_url>[^']*)' and wait for '(?P<readiness>.*)'"))
+@when(parsers.re("I am on the (url|page|site) '(?P<page_url>[^']*)' and wait for '(?P<readiness>.*)'"))
+async def open_webpage_with_readiness(page, base_url: str, page_url: str, readiness: str):
+    helper = PlaywrightHelper(page)
+    await helper.navigate_to_url(f"{base_url}{page_url}", readiness)
+
+@given(parsers.re("I wait for the page to be ready using '(?P<readiness>.*)'"))
+@when(parsers.re("I wait for the page to be ready using '(?P<readiness>.*)'"))
+async def wait_for_page_ready(page, readiness: str):
+    await wait_until_ready(page, readiness)
+
 @given(parsers.re("I navigate to external page '(?P<url>.*)'"))
 @when(parsers.re("I navigate to external page '(?P<url>.*)'"))
 async def navigate_to_external(page, url: str):
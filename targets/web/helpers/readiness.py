@@ -0,0 +1,183 @@
+# targets/web/helpers/readiness.py
+"""
+Pluggable "page is ready" strategies for navigation.
+
+Each strategy tells page.goto() how far to wait (`wait_until`) and then
+waits for its own condition in wait(). Strategies can be given as objects or
+as strings, so page objects and Gherkin steps select them the same way:
+
+    "load" | "domcontentloaded" | "networkidle"  -> LoadState
+    "selector:<css>"                             -> DomContentLoadedSelector
+    "js:<expression>"                            -> JsPredicate
+    "page_identifier:<page>"                     -> PageIdentifier (locators/web/<page>.yaml)
+"""
+import logging
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Optional, Union
+
+from utils.cache import PROJECT_ROOT
+from utils.performance_monitor import get_performance_monitor
+from utils.selector_index import compile_locator, playwright_selector
+from utils.selector_registry import SelectorRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READINESS = "load"
+PAGE_IDENTIFIER_KEY = "page_identifier"
+WEB_LOCATORS_DIR = PROJECT_ROOT / "locators" / "web"
+
+# Per-strategy wait totals for this process: kind ("load", "selector", ...) -> [waits, seconds]
+READINESS_STATS = {}
+
+
+class ReadinessStrategy(ABC):
+    """Base class: wait_until for page.goto(), then wait() for the strategy's own condition"""
+    name = "readiness"
+    wait_until = "commit"
+
+    @abstractmethod
+    async def wait(self, page, timeout: float) -> None:
+        """Return once the page is ready; raise on timeout"""
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name})"
+
+
+class LoadState(ReadinessStrategy):
+    """Wait for a Playwright load state ('load', 'domcontentloaded' or 'networkidle')"""
+
+    def __init__(self, state: str = "load"):
+        self.name = state
+        self.wait_until = state
+
+    async def wait(self, page, timeout: float) -> None:
+        await page.wait_for_load_state(self.wait_until, timeout=timeout)
+
+
+class DomContentLoadedSelector(ReadinessStrategy):
+    """Wait for DOMContentLoaded, then for a selector to reach `state`"""
+    wait_until = "domcontentloaded"
+
+    def __init__(self, selector: str, state: str = "visible"):
+        self.selector = selector
+        self.state = state
+        self.name = f"selector:{selector}"
+
+    async def wait(self, page, timeout: float) -> None:
+        await page.wait_for_load_state(self.wait_until, timeout=timeout)
+        await page.wait_for_selector(self.selector, state=self.state, timeout=timeout)
+
+
+class JsPredicate(ReadinessStrategy):
+    """Wait for DOMContentLoaded, then until a JS expression/function is truthy"""
+    wait_until = "domcontentloaded"
+
+    def __init__(self, expression: str, arg=None, polling: Union[str, float] = "raf"):
+        self.expression = expression
+        self.arg = arg
+        self.polling = polling
+        self.name = f"js:{expression}"
+
+    async def wait(self, page, timeout: float) -> None:
+        await page.wait_for_load_state(self.wait_until, timeout=timeout)
+        await page.wait_for_function(self.expression, arg=self.arg, polling=self.polling, timeout=timeout)
+
+
+class PageIdentifier(DomContentLoadedSelector):
+    """
+    Wait for the `page_identifier` element of a locator file
+    (e.g. locators/web/login.yaml) to be visible.
+    """
+
+    def __init__(self, page_name: str, selectors=None, key: str = PAGE_IDENTIFIER_KEY, state: str = "visible"):
+        self.page_name = page_name
+        self.key = key
+        self._selectors = selectors
+        self._selector = None
+        self.state = state
+        self.name = f"page_identifier:{page_name}"
+
+    @property
+    def selector(self) -> str:
+        # Resolved on first use so defining a page object never parses locator files
+        if self._selector is None:
+            selectors = self._selectors
+            if selectors is None:
+                selectors = SelectorRegistry.for_directory(WEB_LOCATORS_DIR, cache_name="locators-web",
+                                                          extensions=(".yaml",))
+            page_data = selectors.get(self.page_name) or {}
+            if self.key not in page_data:
+                raise KeyError(f"No '{self.key}' in locators for page '{self.page_name}'")
+            locator = compile_locator(self.page_name, self.key, page_data[self.key])
+            self._selector = playwright_selector(locator)
+        return self._selector
+
+
+def resolve_readiness(spec: Union[str, ReadinessStrategy, None]) -> ReadinessStrategy:
+    """Turn a strategy name/spec (see module docstring) into a ReadinessStrategy"""
+    if isinstance(spec, ReadinessStrategy):
+        return spec
+    return _parse_readiness((spec or DEFAULT_READINESS).strip())
+
+
+@lru_cache(maxsize=256)
+def _parse_readiness(spec: str) -> ReadinessStrategy:
+    # Cached so page_identifier selectors are looked up once per spec
+    kind, _, value = spec.partition(":")
+    if kind in ("load", "domcontentloaded", "networkidle") and not value:
+        return LoadState(kind)
+    if kind == "selector" and value:
+        return DomContentLoadedSelector(value)
+    if kind == "js" and value:
+        return JsPredicate(value)
+    if kind == PAGE_IDENTIFIER_KEY and value:
+        return PageIdentifier(value)
+    raise ValueError(
+        f"Unknown readiness strategy '{spec}'. Use load, domcontentloaded, networkidle, "
+        f"selector:<css>, js:<expression> or page_identifier:<page>"
+    )
+
+
+def record_wait(strategy: ReadinessStrategy, seconds: float, url: Optional[str] = None) -> None:
+    """Add one wait to the per-strategy totals and the performance metrics"""
+    totals = READINESS_STATS.setdefault(strategy.name.partition(":")[0], [0, 0.0])
+    totals[0] += 1
+    totals[1] += seconds
+    get_performance_monitor().record_metric(
+        "readiness_wait", seconds, {"strategy": strategy.name, "url": url}
+    )
+
+
+async def wait_until_ready(page, readiness: Union[str, ReadinessStrategy, None] = None,
+                           timeout: float = 30000) -> ReadinessStrategy:
+    """Wait for the page to be ready according to a strategy and record how long it took"""
+    strategy = resolve_readiness(readiness)
+    start = time.perf_counter()
+    try:
+        await strategy.wait(page, timeout)
+    finally:
+        elapsed = time.perf_counter() - start
+        record_wait(strategy, elapsed, page.url)
+        logger.debug(f"Readiness {strategy.name} took {elapsed * 1000:.1f} ms")
+    return strategy
+
+
+async def goto_ready(page, url: str, readiness: Union[str, ReadinessStrategy, None] = None,
+                     timeout: float = 30000):
+    """
+    page.goto() that only waits as far as the strategy needs, then waits for
+    readiness. The recorded time covers both, since load-state strategies do
+    all their waiting inside goto().
+    """
+    strategy = resolve_readiness(readiness)
+    start = time.perf_counter()
+    try:
+        response = await page.goto(url, wait_until=strategy.wait_until, timeout=timeout)
+        await strategy.wait(page, timeout)
+    finally:
+        elapsed = time.perf_counter() - start
+        record_wait(strategy, elapsed, url)
+        logger.debug(f"Navigation to {url} ready ({strategy.name}) after {elapsed * 1000:.1f} ms")
+    return response
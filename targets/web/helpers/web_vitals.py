@@ -0,0 +1,211 @@
+# targets/web/helpers/web_vitals.py
+"""
+Browser-side performance data for every document a test loads.
+
+INIT_SCRIPT is added to each browser context before its first navigation;
+it observes Largest Contentful Paint, Cumulative Layout Shift (largest
+session window) and interaction latency (INP: the 98th percentile of
+interaction durations) from the start of every document.
+
+WebVitalsCollector takes a snapshot when a document fires `load`
+(Navigation Timing, a Resource Timing summary, the vitals so far and, on
+chromium, the JS heap over CDP) and records it when the next document
+loads or the test ends. The last document is read again at the end of the
+test so its vitals include everything the steps did on it. No extra page
+loads are made.
+
+Recorded metrics (seconds unless noted), tagged with test, scenario and url:
+    web_navigation   page load time; ttfb, dom_content_loaded, transfer_size ...
+    web_resources    number of resources; transfer_size, slowest ...
+    web_resource     one per slowest resource (web.web_vitals.resource_entries)
+    web_vital        metric = lcp | cls (unitless) | inp
+    web_js_heap      used JS heap in bytes (chromium)
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+
+from utils.performance_monitor import get_performance_monitor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOURCE_ENTRIES = 5
+
+INIT_SCRIPT = """
+(() => {
+  if (window.__pyplayVitals) return;
+  const vitals = window.__pyplayVitals = {lcp: null, cls: 0, interactions: {}};
+  let sessionValue = 0, sessionStart = 0, lastShift = 0;
+  const observe = (type, callback, options) => {
+    try {
+      new PerformanceObserver(list => list.getEntries().forEach(callback))
+        .observe(Object.assign({type, buffered: true}, options));
+    } catch (e) {
+      // Entry type not supported by this engine
+    }
+  };
+  observe('largest-contentful-paint', entry => { vitals.lcp = entry.startTime; });
+  observe('layout-shift', entry => {
+    if (entry.hadRecentInput) return;
+    if (entry.startTime - lastShift > 1000 || entry.startTime - sessionStart > 5000) {
+      sessionStart = entry.startTime;
+      sessionValue = 0;
+    }
+    sessionValue += entry.value;
+    lastShift = entry.startTime;
+    vitals.cls = Math.max(vitals.cls, sessionValue);
+  });
+  observe('event', entry => {
+    if (!entry.interactionId) return;
+    vitals.interactions[entry.interactionId] = Math.max(vitals.interactions[entry.interactionId] || 0, entry.duration);
+  }, {durationThreshold: 16});
+})();
+"""
+
+SNAPSHOT_SCRIPT = """
+(resourceEntries) => {
+  const nav = performance.getEntriesByType('navigation')[0];
+  const resources = performance.getEntriesByType('resource');
+  const vitals = window.__pyplayVitals || {};
+  const interactions = Object.values(vitals.interactions || {}).sort((a, b) => b - a);
+  const slowest = resources.slice().sort((a, b) => b.duration - a.duration).slice(0, resourceEntries);
+  return {
+    url: location.href,
+    time_origin: performance.timeOrigin,
+    navigation: nav ? {
+      type: nav.type,
+      duration: nav.duration,
+      ttfb: nav.responseStart,
+      dom_content_loaded: nav.domContentLoadedEventEnd,
+      load: nav.loadEventEnd,
+      transfer_size: nav.transferSize,
+    } : null,
+    resources: {
+      count: resources.length,
+      transfer_size: resources.reduce((total, entry) => total + (entry.transferSize || 0), 0),
+      slowest: slowest.map(entry => ({
+        name: entry.name, initiator_type: entry.initiatorType,
+        duration: entry.duration, transfer_size: entry.transferSize || 0,
+      })),
+    },
+    lcp: vitals.lcp ?? null,
+    cls: vitals.cls ?? null,
+    inp: interactions.length ? interactions[Math.min(interactions.length - 1, Math.floor(interactions.length / 50))] : null,
+    interactions: interactions.length,
+  };
+}
+"""
+
+
+def _seconds(ms: Optional[float]) -> Optional[float]:
+    return None if ms is None else round(ms / 1000, 6)
+
+
+class WebVitalsCollector:
+    """Records performance data for each document loaded in a page (see module docstring)"""
+
+    def __init__(self, page, tags: Dict[str, Any] = None, resource_entries: int = DEFAULT_RESOURCE_ENTRIES,
+                 js_heap: bool = True):
+        self.page = page
+        self.tags = tags or {}
+        self.resource_entries = resource_entries
+        self.js_heap = js_heap
+        self.monitor = get_performance_monitor()
+        self.recorded = 0
+        self._cdp = None
+        self._pending: Optional[Dict[str, Any]] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start(self) -> "WebVitalsCollector":
+        if self.js_heap and self._is_chromium():
+            try:
+                self._cdp = await self.page.context.new_cdp_session(self.page)
+                await self._cdp.send("Performance.enable")
+            except Exception as e:
+                logger.debug(f"JS heap metrics unavailable: {e}")
+                self._cdp = None
+        self.page.on("load", self._on_load)
+        return self
+
+    def _is_chromium(self) -> bool:
+        browser = self.page.context.browser
+        return browser is not None and browser.browser_type.name == "chromium"
+
+    def _on_load(self, page) -> None:
+        task = asyncio.ensure_future(self._document_loaded())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _document_loaded(self) -> None:
+        snapshot = await self._snapshot()
+        if snapshot is None:
+            return
+        if self._pending is not None:
+            self._record(self._pending)
+        self._pending = snapshot
+
+    async def _snapshot(self) -> Optional[Dict[str, Any]]:
+        try:
+            snapshot = await self.page.evaluate(SNAPSHOT_SCRIPT, self.resource_entries)
+            if snapshot["url"].startswith("about:"):
+                return None
+            if self._cdp is not None:
+                metrics = (await self._cdp.send("Performance.getMetrics"))["metrics"]
+                heap = {metric["name"]: metric["value"] for metric in metrics}
+                snapshot["js_heap_used"] = heap.get("JSHeapUsedSize")
+                snapshot["js_heap_total"] = heap.get("JSHeapTotalSize")
+            return snapshot
+        except Exception as e:
+            # The page navigated away or closed while it was being read
+            logger.debug(f"Performance snapshot failed: {e}")
+            return None
+
+    def _record(self, snapshot: Dict[str, Any]) -> None:
+        tags = {**self.tags, "url": snapshot["url"]}
+        navigation = snapshot.get("navigation")
+        if navigation:
+            self.monitor.record_metric("web_navigation", _seconds(navigation["load"] or navigation["duration"]), {
+                **tags,
+                "navigation_type": navigation["type"],
+                "ttfb": _seconds(navigation["ttfb"]),
+                "dom_content_loaded": _seconds(navigation["dom_content_loaded"]),
+                "transfer_size": navigation["transfer_size"],
+            })
+        resources = snapshot["resources"]
+        self.monitor.record_metric("web_resources", resources["count"], {
+            **tags, "transfer_size": resources["transfer_size"],
+        })
+        for entry in resources["slowest"]:
+            self.monitor.record_metric("web_resource", _seconds(entry["duration"]), {
+                **tags, "resource": entry["name"], "initiator_type": entry["initiator_type"],
+                "transfer_size": entry["transfer_size"],
+            })
+        for metric, value in (("lcp", _seconds(snapshot["lcp"])), ("cls", snapshot["cls"]),
+                              ("inp", _seconds(snapshot["inp"]))):
+            if value is not None:
+                self.monitor.record_metric("web_vital", value, {**tags, "metric": metric,
+                                                                "interactions": snapshot["interactions"]})
+        if snapshot.get("js_heap_used") is not None:
+            self.monitor.record_metric("web_js_heap", snapshot["js_heap_used"], {
+                **tags, "js_heap_total": snapshot["js_heap_total"],
+            })
+        self.recorded += 1
+
+    async def stop(self) -> None:
+        """Record the documents not recorded yet, re-reading the current one"""
+        self.page.remove_listener("load", self._on_load)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._pending is not None:
+            final = await self._snapshot() if not self.page.is_closed() else None
+            # Only the same document can replace the snapshot taken at load
+            if final is not None and final["time_origin"] == self._pending["time_origin"]:
+                self._pending = final
+            self._record(self._pending)
+            self._pending = None
+        if self._cdp is not None:
+            try:
+                await self._cdp.detach()
+            except Exception:
+                pass
+            self._cdp = None
@@ -3,19 +3,44 @@ from playwright.async_api import Page, expect
 import logging
 import asyncio
 from typing import Optional, Union
+from targets.web.helpers.readiness import ReadinessStrategy, goto_ready, wait_until_ready
 
 class BasePage:
+    # How navigate_to/wait_for_navigation decide the page is ready; a strategy
+    # or a spec string such as "load", "selector:#main" or "page_identifier:login"
+    # (see targets/web/helpers/readiness.py). Override per page object.
+    readiness: Union[str, ReadinessStrategy] = "load"
+
+    # Build each Locator once per page object and rely on Playwright's own
+    # actionability wait; set False to wait_for_selector() before every action
+    locator_first = True
+
     def __init__(self, page: Page, base_url: str):
         self.page = page
         self.base_url = base_url
         self.logger = logging.getLogger(__name__)
+        self._locators = {}
+
+    def locator(self, selector):
+        """Return the cached Locator for a selector"""
+        element = self._locators.get(selector)
+        if element is None:
+            element = self._locators[selector] = self.page.locator(selector)
+        return element
+
+    async def _actionable(self, selector, timeout):
+        # Locator-first mode skips the explicit visibility wait: the action
+        # itself waits (once) for the element to be visible, enabled and stable
+        if self.locator_first:
+            return self.locator(selector)
+        return await self.get_element(selector, timeout)
         
-    async def navigate_to(self, path=""):
-        """Navigate to a specific path from base URL"""
+    async def navigate_to(self, path="", readiness: Optional[Union[str, ReadinessStrategy]] = None, timeout=30000):
+        """Navigate to a specific path from base URL and wait until the page is ready"""
         try:
             full_url = f"{self.base_url}{path}"
             self.logger.info(f"Navigating to: {full_url}")
-            response = await self.page.goto(full_url, wait_until="networkidle")
+            response = await goto_ready(self.page, full_url, readiness or self.readiness, timeout)
             
             if response and not response.ok:
                 self.logger.error(f"Navigation failed with status: {response.status}")
@@ -31,7 +56,7 @@ class BasePage:
         try:
             self.logger.debug(f"Waiting for selector: {selector}")
             await self.page.wait_for_selector(selector, state="visible", timeout=timeout)
-            return self.page.locator(selector)
+            return self.locator(selector)
         except Exception as e:
             self.logger.error(f"Element not found: {selector}. Error: {str(e)}")
             raise
@@ -39,9 +64,9 @@ class BasePage:
     async def click(self, selector, timeout=30000):
         """Click an element after ensuring it's visible"""
         try:
-            element = await self.get_element(selector, timeout)
+            element = await self._actionable(selector, timeout)
             self.logger.debug(f"Clicking on element: {selector}")
-            await element.click()
+            await element.click(timeout=timeout)
             return self
         except Exception as e:
             self.logger.error(f"Failed to click element: {selector}. Error: {str(e)}")
@@ -50,9 +75,9 @@ class BasePage:
     async def fill(self, selector, text, timeout=30000):
         """Fill a form field"""
         try:
-            element = await self.get_element(selector, timeout)
+            element = await self._actionable(selector, timeout)
             self.logger.debug(f"Filling text in element: {selector}")
-            await element.fill(text)
+            await element.fill(text, timeout=timeout)
             return self
         except Exception as e:
             self.logger.error(f"Failed to fill element: {selector}. Error: {str(e)}")
@@ -95,11 +120,11 @@ class BasePage:
             self.logger.error(f"Visual verification failed: {str(e)}")
             raise
     
-    async def wait_for_navigation(self, timeout=30000):
+    async def wait_for_navigation(self, timeout=30000, readiness: Optional[Union[str, ReadinessStrategy]] = None):
         """Wait for navigation to complete"""
         try:
             self.logger.debug("Waiting for navigation to complete")
-            await self.page.wait_for_load_state("networkidle", timeout=timeout)
+            await wait_until_ready(self.page, readiness or self.readiness, timeout)
             return self
         except Exception as e:
             self.logger.error(f"Navigation timeout: {str(e)}")
@@ -108,8 +133,12 @@ class BasePage:
     async def get_text(self, selector, timeout=30000):
         """Get text content of an element"""
         try:
-            element = await self.get_element(selector, timeout)
-            text = await element.text_content()
+            element = await self._actionable(selector, timeout)
+            if self.locator_first:
+                # text_content() only waits for the element to be attached;
+                # keep the visibility wait reads had with get_element()
+                await element.wait_for(state="visible", timeout=timeout)
+            text = await element.text_content(timeout=timeout)
             return text
         except Exception as e:
             self.logger.error(f"Failed to get text from {selector}: {str(e)}")
@@ -118,13 +147,13 @@ class BasePage:
     async def select_option(self, selector, value=None, label=None, index=None, timeout=30000):
         """Select an option from a dropdown"""
         try:
-            element = await self.get_element(selector, timeout)
+            element = await self._actionable(selector, timeout)
             if value:
-                await element.select_option(value=value)
+                await element.select_option(value=value, timeout=timeout)
             elif label:
-                await element.select_option(label=label)
+                await element.select_option(label=label, timeout=timeout)
             elif index is not None:
-                await element.select_option(index=index)
+                await element.select_option(index=index, timeout=timeout)
             return self
         except Exception as e:
             self.logger.error(f"Failed to select option on {selector}: {str(e)}")
@@ -133,8 +162,8 @@ class BasePage:
     async def hover(self, selector, timeout=30000):
         """Hover over an element"""
         try:
-            element = await self.get_element(selector, timeout)
-            await element.hover()
+            element = await self._actionable(selector, timeout)
+            await element.hover(timeout=timeout)
             return self
         except Exception as e:
             self.logger.error(f"Failed to hover over {selector}: {str(e)}")
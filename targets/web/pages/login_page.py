@@ -3,6 +3,9 @@ from pages.base_page import BasePage
 from selectors.login_selectors import LoginSelectors
 
 class LoginPage(BasePage):
+    # Ready once the login form from locators/web/login.yaml is visible
+    readiness = "page_identifier:login"
+
     def __init__(self, page, base_url):
         super().__init__(page, base_url)
         self.path = "/login"
@@ -22,8 +25,8 @@ class LoginPage(BasePage):
             await self.fill(self.selectors.USERNAME_INPUT, username)
             await self.fill(self.selectors.PASSWORD_INPUT, password)
             await self.click(self.selectors.LOGIN_BUTTON)
-            # Wait for navigation after login
-            await self.wait_for_navigation()
+            # Wait for navigation after login (away from the login form)
+            await self.wait_for_navigation(readiness="load")
             return self
         except Exception as e:
             self.logger.error(f"Login failed: {str(e)}")
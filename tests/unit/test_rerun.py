@@ -0,0 +1,86 @@
+# tests/unit/test_rerun.py
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import utils.cache
+
+pytest_plugins = ["pytester"]
+
+CONFTEST = '''
+from utils.rerun import RerunPlugin
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(RerunPlugin(config, max_retries=2), "pyplay-rerun")
+'''
+
+TESTS = '''
+import pytest
+
+attempts = {}
+
+
+def attempt(name):
+    attempts[name] = attempts.get(name, 0) + 1
+    return attempts[name]
+
+
+@pytest.fixture
+def flaky_setup():
+    if attempt("setup") == 1:
+        raise RuntimeError("setup failed")
+
+
+@pytest.fixture
+def flaky_teardown():
+    yield
+    if attempt("teardown") == 1:
+        raise RuntimeError("teardown failed")
+
+
+def test_passes():
+    pass
+
+
+def test_flaky_call():
+    assert attempt("call") > 1
+
+
+def test_flaky_setup(flaky_setup):
+    pass
+
+
+def test_flaky_teardown(flaky_teardown):
+    pass
+
+
+def test_always_fails():
+    assert False
+'''
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils.cache, "CACHE_DIR", tmp_path / "cache")
+
+
+def test_junit_has_one_testcase_per_test(pytester):
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(test_flaky=TESTS)
+    junit = pytester.path / "junit.xml"
+
+    result = pytester.runpytest("-p", "no:cacheprovider", f"--junitxml={junit}")
+
+    result.assert_outcomes(passed=4, failed=1)
+    result.stdout.fnmatch_lines([
+        "failed after 2 rerun(s): test_flaky.py::test_always_fails",
+        "passed after 1 rerun(s): test_flaky.py::test_flaky_call",
+        "passed after 1 rerun(s): test_flaky.py::test_flaky_setup",
+        "passed after 1 rerun(s): test_flaky.py::test_flaky_teardown",
+    ])
+    testcases = ET.parse(junit).getroot().iter("testcase")
+    names = sorted(testcase.get("name") for testcase in testcases)
+    assert names == sorted([
+        "test_passes", "test_flaky_call", "test_flaky_setup", "test_flaky_teardown", "test_always_fails",
+    ])
@@ -0,0 +1,88 @@
+# tests/unit/test_step_index.py
+import textwrap
+
+import pytest
+
+from utils.step_index import StepIndex
+
+pytest_plugins = ["pytester"]
+
+STEP_DEFINITIONS = '''
+from pytest_bdd import given, parsers, scenarios, then, when
+
+scenarios("apples.feature")
+
+
+@given(parsers.parse("I have {count:d} apples"), target_fixture="basket")
+def basket(count):
+    return {"apples": count}
+
+
+@when(parsers.re(r"I eat (?P<count>\\d+) apples?"))
+def eat(basket, count):
+    basket["apples"] -= int(count)
+
+
+@then("I have apples left")
+def apples_left(basket):
+    assert basket["apples"] > 0
+'''
+
+CONFTEST = '''
+from utils.step_index import install_step_index, installed_step_index
+
+
+def pytest_collection_finish(session):
+    install_step_index(session._fixturemanager)
+
+
+def pytest_sessionfinish(session):
+    session.config.step_index_stats = dict(installed_step_index().stats)
+'''
+
+
+def run_feature(pytester, feature):
+    pytester.makefile(".feature", apples=textwrap.dedent(feature))
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(test_apples=STEP_DEFINITIONS)
+    return pytester.inline_run("-p", "no:cacheprovider")
+
+
+def test_feature_runs_through_installed_index(pytester):
+    reprec = run_feature(pytester, """\
+        Feature: Apples
+            Scenario: Eating
+                Given I have 3 apples
+                When I eat 1 apple
+                Then I have apples left
+        """)
+    reprec.assertoutcome(passed=1)
+    stats = reprec.getcalls("pytest_sessionfinish")[0].session.config.step_index_stats
+    assert stats["definitions"] >= 3
+    assert stats["lookups"] >= 3
+
+
+def test_parse_steps_match_case_insensitively(pytester):
+    # parsers.parse ignores case, so "i have" must still bind to "I have"
+    reprec = run_feature(pytester, """\
+        Feature: Apples
+            Scenario: Lowercase
+                Given i HAVE 3 apples
+                When I eat 2 apples
+                Then I have apples left
+        """)
+    reprec.assertoutcome(passed=1)
+
+
+def test_case_sensitive_parsers_keep_exact_prefix():
+    from pytest_bdd import parsers
+
+    exact = parsers.re(r"I have (?P<count>\d+) pears")
+    folded = parsers.parse("I have {count:d} apples")
+    sensitive = parsers.parse("I have {count:d} plums", case_sensitive=True)
+    index = StepIndex([exact, folded, sensitive])
+
+    assert index.matching("i have 3 APPLES") == (folded,)
+    assert index.matching("i have 3 pears") == ()
+    assert index.matching("i have 3 plums") == ()
+    assert index.matching("I have 3 plums") == (sensitive,)
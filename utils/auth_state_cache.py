@@ -0,0 +1,99 @@
+# utils/auth_state_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+from utils.cache import CACHE_DIR, atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 30 * 60
+
+# Marker (or Gherkin tag prefix) selecting a cached logged-in user role
+AUTH_ROLE_MARKER = "login_as"
+
+
+def get_auth_role(node):
+    """
+    Return the user role a test wants to be logged in as, from either
+    @pytest.mark.login_as("role") or a Gherkin tag like @login_as_standard_user.
+    """
+    marker = node.get_closest_marker(AUTH_ROLE_MARKER)
+    if marker and marker.args:
+        return marker.args[0]
+    prefix = f"{AUTH_ROLE_MARKER}_"
+    for marker in node.iter_markers():
+        if marker.name.startswith(prefix):
+            return marker.name[len(prefix):]
+    return None
+
+
+class AuthStateCache:
+    """
+    Cache of Playwright storage_state files (cookies + localStorage) per
+    (env, user role, base_url).
+
+    A role logs in through the UI once; later contexts are created with
+    new_context(storage_state=path) until the file is older than the TTL.
+    Files are plain storage_state JSON, written atomically so parallel xdist
+    workers never read a half-written state.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = DEFAULT_TTL_SECONDS):
+        self.directory = Path(directory) if directory else CACHE_DIR / "auth_state"
+        self.ttl = ttl
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {"hits": 0, "logins": 0}
+
+    @staticmethod
+    def key(env: str, role: str, base_url: str) -> str:
+        raw = json.dumps([env, role, base_url])
+        return f"{role}-{hashlib.sha1(raw.encode()).hexdigest()[:12]}"
+
+    def path_for(self, env: str, role: str, base_url: str) -> Path:
+        return self.directory / f"{self.key(env, role, base_url)}.json"
+
+    def get(self, env: str, role: str, base_url: str) -> Optional[str]:
+        """Return the cached storage_state path if it exists and has not expired"""
+        path = self.path_for(env, role, base_url)
+        try:
+            age = time.time() - path.stat().st_mtime
+        except OSError:
+            return None
+        if self.ttl and age > self.ttl:
+            return None
+        return str(path)
+
+    def invalidate(self, env: str, role: str, base_url: str) -> None:
+        """Drop a cached state, e.g. after the application rejected it"""
+        try:
+            self.path_for(env, role, base_url).unlink()
+        except OSError:
+            pass
+
+    async def get_or_create(self, env: str, role: str, base_url: str,
+                            login: Callable[[], Awaitable[dict]]) -> str:
+        """
+        Return a storage_state path for the role, calling `login` to produce
+        a fresh storage_state dict when nothing valid is cached.
+        """
+        key = self.key(env, role, base_url)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self.get(env, role, base_url)
+            if cached:
+                self.stats["hits"] += 1
+                return cached
+
+            logger.info(f"Logging in as '{role}' to cache storage state for {base_url}")
+            state = await login()
+            path = self.path_for(env, role, base_url)
+            atomic_write_bytes(path, json.dumps(state).encode())
+            os.chmod(path, 0o600)
+            self.stats["logins"] += 1
+            return str(path)
@@ -0,0 +1,130 @@
+# utils/browser_pool.py
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Map config names (config/platforms/web_config.yaml -> web.browser.default) to Playwright engines
+BROWSER_ENGINES = {
+    'chrome': 'chromium',
+    'chromium': 'chromium',
+    'firefox': 'firefox',
+    'webkit': 'webkit',
+}
+
+
+def engine_name(browser_name: Optional[str]) -> str:
+    """Normalize a configured browser name to a Playwright engine name"""
+    return BROWSER_ENGINES.get((browser_name or 'chromium').lower(), 'chromium')
+
+
+class PooledBrowser:
+    """A launched browser plus the bookkeeping the pool needs"""
+
+    def __init__(self, browser, engine: str):
+        self.browser = browser
+        self.engine = engine
+        self.uses = 0
+        self.leases = 0
+        self.retired = False
+
+    def is_healthy(self) -> bool:
+        return self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    Keeps up to `size` warm browsers per engine for the whole session (or
+    xdist worker). Tests lease a browser, open their own context on it, and
+    return it; a browser is closed and relaunched after `recycle_after`
+    leases, or as soon as it is found disconnected.
+    """
+
+    def __init__(self, playwright, size: int = 1, recycle_after: int = 50, launch_options: Dict[str, Any] = None):
+        self.playwright = playwright
+        self.size = max(1, int(size))
+        self.recycle_after = max(0, int(recycle_after))
+        self.launch_options = launch_options or {}
+        self._browsers: Dict[str, List[PooledBrowser]] = {}
+        self._next: Dict[str, int] = {}
+        self._retired: List[PooledBrowser] = []
+        self._lock = asyncio.Lock()
+        self.stats = {"launched": 0, "recycled": 0, "unhealthy": 0, "leases": 0}
+
+    async def _launch(self, engine: str) -> PooledBrowser:
+        browser_type = getattr(self.playwright, engine)
+        browser = await browser_type.launch(**self.launch_options)
+        self.stats["launched"] += 1
+        logger.debug(f"Launched pooled {engine} browser ({self.stats['launched']} launched so far)")
+        return PooledBrowser(browser, engine)
+
+    async def warm(self, engine: str, count: Optional[int] = None) -> None:
+        """Launch browsers for an engine up front so the first tests don't pay for it"""
+        async with self._lock:
+            slots = self._browsers.setdefault(engine, [])
+            target = min(self.size, count or self.size)
+            while len(slots) < target:
+                slots.append(await self._launch(engine))
+
+    async def acquire(self, engine: str = 'chromium') -> PooledBrowser:
+        """Lease a healthy browser for one test"""
+        async with self._lock:
+            slots = self._browsers.setdefault(engine, [])
+
+            # Drop browsers that crashed or were closed behind our back
+            for pooled in [p for p in slots if not p.is_healthy()]:
+                logger.warning(f"Discarding disconnected {engine} browser from pool")
+                self.stats["unhealthy"] += 1
+                slots.remove(pooled)
+
+            if len(slots) < self.size:
+                pooled = await self._launch(engine)
+                slots.append(pooled)
+            else:
+                # Round-robin over the warm browsers
+                index = self._next.get(engine, 0) % len(slots)
+                self._next[engine] = index + 1
+                pooled = slots[index]
+
+            pooled.leases += 1
+            self.stats["leases"] += 1
+            return pooled
+
+    async def release(self, pooled: PooledBrowser) -> None:
+        """Return a leased browser; recycle it once it has served enough tests"""
+        async with self._lock:
+            pooled.leases -= 1
+            pooled.uses += 1
+            slots = self._browsers.get(pooled.engine, [])
+            due = bool(self.recycle_after) and pooled.uses >= self.recycle_after
+            if pooled in slots and (due or not pooled.is_healthy()):
+                # Stop handing it out; a fresh browser is launched on the next
+                # acquire while outstanding leases (e.g. prefetched contexts) finish
+                slots.remove(pooled)
+                pooled.retired = True
+                self._retired.append(pooled)
+                if due:
+                    self.stats["recycled"] += 1
+            if pooled.retired and pooled.leases == 0:
+                self._retired.remove(pooled)
+                await self._close(pooled)
+
+    async def _close(self, pooled: PooledBrowser) -> None:
+        try:
+            if pooled.browser.is_connected():
+                await pooled.browser.close()
+        except Exception as e:
+            logger.warning(f"Failed to close pooled {pooled.engine} browser: {e}")
+
+    async def close(self) -> None:
+        """Close every pooled browser"""
+        async with self._lock:
+            for slots in self._browsers.values():
+                for pooled in slots:
+                    await self._close(pooled)
+            for pooled in self._retired:
+                await self._close(pooled)
+            self._browsers.clear()
+            self._retired.clear()
+        logger.debug(f"Browser pool closed: {self.stats}")
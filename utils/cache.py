@@ -0,0 +1,193 @@
+# utils/cache.py
+import atexit
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Framework caches live next to pytest's own cache so `pytest --cache-clear`
+# users know where to look and .gitignore already covers them
+CACHE_DIR = Path(os.environ.get('PYPLAY_CACHE_DIR', PROJECT_ROOT / ".pytest_cache" / "pyplay"))
+
+
+def cache_path(*parts) -> Path:
+    """Return a path inside the framework cache directory, creating parents"""
+    path = CACHE_DIR.joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def file_digest(path) -> str:
+    """Return a content hash for a file"""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def atomic_write_bytes(path, data: bytes) -> None:
+    """Write bytes to path via a temp file + rename so readers never see partial data"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Snapshot layout: MAGIC | u64 index length | pickled index | blob area.
+# MAGIC is 8 bytes identifying the cache class and format version. The index
+# maps absolute file path -> (mtime_ns, size, digest, offset, length) where
+# offset/length locate that file's pickled content relative to the start of
+# the blob area.
+_HEADER = struct.Struct("<8sQ")
+
+
+class FileSnapshotCache(ABC):
+    """
+    Persistent cache of parsed files under .pytest_cache.
+
+    The cache is a single snapshot file that is memory-mapped read-only, so
+    every process (including each xdist worker) shares the same entries and
+    only unpickles the ones it actually asks for. Entries are validated
+    against the file's mtime/size; when those change the content hash
+    decides whether the file really needs to be parsed again.
+
+    Subclasses implement parse(file_path) and set their own `magic`, so a
+    snapshot is never read back by a different kind of cache.
+    """
+    magic: bytes = b"PYPLSNP1"
+
+    def __init__(self, snapshot_name: str, enabled: bool = True):
+        self.enabled = enabled
+        self.path = cache_path(snapshot_name)
+        self._index = None
+        self._view = None
+        self._mapped = None
+        self._pending: Dict[str, Tuple[int, int, str, bytes]] = {}
+        atexit.register(self.close)
+
+    def _open(self):
+        """Map the snapshot file and read its index"""
+        if self._index is not None:
+            return
+        self._index, self._view, self._mapped = self._map(self.path, self.magic)
+
+    def close(self) -> None:
+        """Unmap the snapshot; it is mapped again on the next load()"""
+        self._release(self._view, self._mapped)
+        self._index = None
+        self._view = None
+        self._mapped = None
+
+    @staticmethod
+    def _release(view: Optional[memoryview], mapped: Optional[mmap.mmap]) -> None:
+        if view is not None:
+            view.release()
+        if mapped is not None:
+            mapped.close()
+
+    @staticmethod
+    def _map(path, magic: bytes) -> Tuple[Dict[str, tuple], Optional[memoryview], Optional[mmap.mmap]]:
+        """Return (index, view of the blob area, mapping) for a snapshot file"""
+        try:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Missing or empty snapshot
+            return {}, None, None
+        try:
+            with memoryview(mapped) as view:
+                file_magic, index_length = _HEADER.unpack_from(view, 0)
+                if file_magic != magic:
+                    raise ValueError("not a snapshot")
+                blob_start = _HEADER.size + index_length
+                with view[_HEADER.size:blob_start] as index_view:
+                    index = pickle.loads(index_view)
+                return index, view[blob_start:], mapped
+        except (struct.error, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            mapped.close()
+            return {}, None, None
+
+    def _blob(self, entry) -> bytes:
+        offset, length = entry[3], entry[4]
+        return self._view[offset:offset + length]
+
+    @abstractmethod
+    def parse(self, file_path: str) -> Any:
+        """Parse a source file into the object to cache"""
+
+    def load(self, file_path: str) -> Any:
+        """Return parsed content of file_path, parsing only if it changed"""
+        if not self.enabled:
+            return self.parse(file_path)
+
+        file_path = os.path.abspath(file_path)
+        self._open()
+        stat = os.stat(file_path)
+
+        pending = self._pending.get(file_path)
+        if pending is not None and pending[0] == stat.st_mtime_ns and pending[1] == stat.st_size:
+            return pickle.loads(pending[3])
+
+        entry = self._index.get(file_path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return pickle.loads(self._blob(entry))
+
+        digest = file_digest(file_path)
+        if entry is not None and entry[2] == digest:
+            blob = bytes(self._blob(entry))
+            data = pickle.loads(blob)
+        else:
+            data = self.parse(file_path)
+            blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        self._pending[file_path] = (stat.st_mtime_ns, stat.st_size, digest, blob)
+        return data
+
+    def save(self, keep: Iterable[str] = None) -> None:
+        """Merge newly parsed files into the on-disk snapshot"""
+        if not self.enabled or not self._pending:
+            return
+
+        # Merge against the latest snapshot on disk; another worker may have
+        # written entries since this process mapped it
+        index, view, mapped = self._map(self.path, self.magic)
+        entries = {}
+        for path, entry in index.items():
+            entries[path] = (entry[0], entry[1], entry[2], bytes(view[entry[3]:entry[3] + entry[4]]))
+        self._release(view, mapped)
+        entries.update(self._pending)
+        if keep is not None:
+            keep = {os.path.abspath(p) for p in keep}
+            entries = {path: entry for path, entry in entries.items() if path in keep}
+
+        new_index = {}
+        blobs = []
+        offset = 0
+        for path, (mtime_ns, size, digest, blob) in entries.items():
+            new_index[path] = (mtime_ns, size, digest, offset, len(blob))
+            blobs.append(blob)
+            offset += len(blob)
+
+        index_bytes = pickle.dumps(new_index, protocol=pickle.HIGHEST_PROTOCOL)
+        data = b"".join([_HEADER.pack(self.magic, len(index_bytes)), index_bytes] + blobs)
+
+        try:
+            atomic_write_bytes(self.path, data)
+            self._pending.clear()
+            self.close()
+        except OSError:
+            # A read-only checkout must not break loading
+            pass
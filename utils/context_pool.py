@@ -0,0 +1,142 @@
+# utils/context_pool.py
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from utils.browser_pool import BrowserPool, PooledBrowser
+
+logger = logging.getLogger(__name__)
+
+
+class PooledContext:
+    """A ready-to-use browser context and page, plus the browser lease behind them"""
+
+    def __init__(self, lease: PooledBrowser, context, page, storage_state: Optional[str]):
+        self.lease = lease
+        self.context = context
+        self.page = page
+        self.storage_state = storage_state
+        self.state_version = storage_state_version(storage_state)
+
+    @property
+    def browser(self):
+        return self.lease.browser
+
+
+def storage_state_version(storage_state: Optional[str]) -> Optional[tuple]:
+    """(mtime_ns, size) of a storage state file; changes when the file is rewritten"""
+    if storage_state is None:
+        return None
+    try:
+        stat = os.stat(storage_state)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ContextPool:
+    """
+    Creates the next test's context and page in the background while the
+    current test runs.
+
+    checkout() hands out a prefetched context for the same storage_state if
+    one is ready (a hit) or creates one inline (a miss), then immediately
+    starts preparing the next one. Every context is created with
+    `context_options` (viewport, base_url, ...) and passed through `setup`
+    (default timeout, init scripts, ...) before it is handed out. State that
+    can change while a context waits (cookies) belongs at checkout.
+
+    Prefetch tasks run on the event loop the pool was created on (the
+    session fixture's loop). A checkout from any other loop is served
+    inline, since a task cannot be awaited across loops.
+    """
+
+    def __init__(self, browser_pool: BrowserPool, engine: str, context_options: Dict[str, Any] = None,
+                 setup: Optional[Callable[[Any, Any], Awaitable[None]]] = None, prefetch: bool = True):
+        self.browser_pool = browser_pool
+        self.engine = engine
+        self.context_options = context_options or {}
+        self.setup = setup
+        self.prefetch = prefetch
+        self._prefetched: Dict[Optional[str], asyncio.Task] = {}
+        try:
+            self._loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            # Created outside a loop: bound to the first checkout's loop
+            self._loop = None
+        self.stats = {"hits": 0, "misses": 0, "prefetched": 0, "discarded": 0}
+
+    async def _create(self, storage_state: Optional[str]) -> PooledContext:
+        lease = await self.browser_pool.acquire(self.engine)
+        try:
+            context = await lease.browser.new_context(storage_state=storage_state, **self.context_options)
+            page = await context.new_page()
+            if self.setup is not None:
+                await self.setup(context, page)
+            return PooledContext(lease, context, page, storage_state)
+        except BaseException:
+            await self.browser_pool.release(lease)
+            raise
+
+    def _on_pool_loop(self) -> bool:
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+        return loop is self._loop
+
+    def _start_prefetch(self, storage_state: Optional[str]) -> None:
+        if self.prefetch and storage_state not in self._prefetched and self._on_pool_loop():
+            self._prefetched[storage_state] = self._loop.create_task(self._create(storage_state))
+            self.stats["prefetched"] += 1
+
+    async def checkout(self, storage_state: Optional[str] = None) -> PooledContext:
+        """Return a prepared context/page for one test"""
+        pooled = None
+        task = self._prefetched.pop(storage_state, None) if self._on_pool_loop() else None
+        if task is not None:
+            try:
+                pooled = await task
+                if not pooled.lease.is_healthy():
+                    await self._discard(pooled)
+                    pooled = None
+                elif pooled.state_version != storage_state_version(storage_state):
+                    # The cached login was refreshed after this context was created
+                    await self._discard(pooled)
+                    pooled = None
+                else:
+                    self.stats["hits"] += 1
+            except Exception as e:
+                logger.warning(f"Prefetched context failed, creating one inline: {e}")
+                pooled = None
+
+        if pooled is None:
+            self.stats["misses"] += 1
+            pooled = await self._create(storage_state)
+
+        # Overlap the next test's setup with this test's execution
+        self._start_prefetch(storage_state)
+        return pooled
+
+    async def checkin(self, pooled: PooledContext) -> None:
+        """Close a used context and return its browser lease"""
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser context: {e}")
+        finally:
+            await self.browser_pool.release(pooled.lease)
+
+    async def _discard(self, pooled: PooledContext) -> None:
+        self.stats["discarded"] += 1
+        await self.checkin(pooled)
+
+    async def close(self) -> None:
+        """Discard contexts that were prefetched but never used"""
+        tasks, self._prefetched = list(self._prefetched.values()), {}
+        for task in tasks:
+            try:
+                await self._discard(await task)
+            except Exception:
+                pass
+        logger.info(f"Context pool: {self.stats}")
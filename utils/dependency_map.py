@@ -0,0 +1,294 @@
+# utils/dependency_map.py
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+import pytest
+
+from utils.cache import atomic_write_bytes, cache_path
+from utils.selector_index import SELECTOR_KEY_REGEX
+from utils.step_index import install_step_index
+
+logger = logging.getLogger(__name__)
+
+DEPENDENCY_MAP_FILE = "dependency-map.json"
+
+# config.workeroutput key workers send their {nodeid: [paths]} under
+WORKEROUTPUT_DEPENDENCIES = "pyplay_dependencies"
+
+# Changes to these (fixtures, configuration, hooks) can affect any test
+GLOBAL_PATHS = ("conftest.py", "pytest.ini", "requirements.txt", "fixtures/", "config/")
+
+# Module files outside the project tree (stdlib, site-packages) are never dependencies
+EXTERNAL_DIRS = ("site-packages", "dist-packages", ".venv", "venv")
+
+# 'page_identifier:<page>' readiness specs in step texts (see targets/web/helpers/readiness.py)
+PAGE_IDENTIFIER_REGEX = re.compile(r"page_identifier:([\w-]+)")
+
+
+def is_global_path(path: str) -> bool:
+    return os.path.basename(path) == "conftest.py" or any(
+        path == prefix or (prefix.endswith("/") and path.startswith(prefix)) for prefix in GLOBAL_PATHS
+    )
+
+
+def changed_files(ref: str, rootdir: Path) -> Set[str]:
+    """Files (relative to rootdir) changed since a git ref, uncommitted and untracked ones included"""
+    def git(*args) -> List[str]:
+        result = subprocess.run(["git", *args], cwd=rootdir, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise pytest.UsageError(f"--changed-since {ref}: git {' '.join(args)} failed: {result.stderr.strip()}")
+        return [line for line in result.stdout.splitlines() if line]
+
+    toplevel = Path(git("rev-parse", "--show-toplevel")[0])
+    # --no-renames: a moved file counts as changed at its old path as well as its new one
+    files = git("diff", "--name-only", "--no-renames", ref) + git("ls-files", "--others", "--exclude-standard")
+    changed = set()
+    for name in files:
+        path = toplevel / name
+        try:
+            changed.add(path.relative_to(rootdir).as_posix())
+        except ValueError:
+            continue
+    return changed
+
+
+class ModuleGraph:
+    """Project modules a module uses (imported modules, and the modules of the
+    classes/functions it references, base classes included), transitively.
+    Also collects the pages named by the `readiness` of page objects defined
+    in those modules (readiness = "page_identifier:login")."""
+
+    def __init__(self, rootdir: Path):
+        self.rootdir = rootdir
+        self._closure: Dict[str, FrozenSet[str]] = {}
+        self._pages: Dict[str, FrozenSet[str]] = {}
+
+    def relpath(self, filename: Optional[str]) -> Optional[str]:
+        if not filename:
+            return None
+        path = Path(os.path.abspath(filename))
+        if any(part in EXTERNAL_DIRS for part in path.parts):
+            return None
+        try:
+            return path.relative_to(self.rootdir).as_posix()
+        except ValueError:
+            return None
+
+    def _references(self, module: ModuleType) -> Iterable[ModuleType]:
+        for value in list(vars(module).values()):
+            if isinstance(value, ModuleType):
+                yield value
+                continue
+            classes = value.__mro__ if isinstance(value, type) else ()
+            for obj in (value, *classes):
+                referenced = sys.modules.get(getattr(obj, "__module__", None) or "")
+                if referenced is not None:
+                    yield referenced
+
+    @staticmethod
+    def _readiness_pages(module: ModuleType) -> Set[str]:
+        pages = set()
+        for value in list(vars(module).values()):
+            if not isinstance(value, type) or value.__module__ != module.__name__:
+                continue
+            readiness = getattr(value, "readiness", None)
+            if isinstance(readiness, str):
+                pages.update(PAGE_IDENTIFIER_REGEX.findall(readiness))
+            elif isinstance(getattr(readiness, "page_name", None), str):
+                pages.add(readiness.page_name)
+        return pages
+
+    def closure(self, module: ModuleType) -> FrozenSet[str]:
+        name = module.__name__
+        if name in self._closure:
+            return self._closure[name]
+
+        files, pages, seen, stack = set(), set(), {name}, [module]
+        while stack:
+            current = stack.pop()
+            path = self.relpath(getattr(current, "__file__", None))
+            if path is None:
+                continue
+            files.add(path)
+            pages |= self._readiness_pages(current)
+            for referenced in self._references(current):
+                if referenced.__name__ not in seen:
+                    seen.add(referenced.__name__)
+                    stack.append(referenced)
+        self._closure[name] = frozenset(files)
+        self._pages[name] = frozenset(pages)
+        return self._closure[name]
+
+    def pages(self, module: ModuleType) -> FrozenSet[str]:
+        """Pages whose page_identifier the module's page objects wait for"""
+        self.closure(module)
+        return self._pages[module.__name__]
+
+    def of_function(self, func) -> FrozenSet[str]:
+        module = sys.modules.get(getattr(func, "__module__", None) or "")
+        return self.closure(module) if module is not None else frozenset()
+
+    def pages_of_function(self, func) -> FrozenSet[str]:
+        module = sys.modules.get(getattr(func, "__module__", None) or "")
+        return self.pages(module) if module is not None else frozenset()
+
+
+class DependencyMap:
+    """
+    Links every test to the files it depends on, and with --changed-since
+    keeps only the tests affected by a change.
+
+    For a scenario these are its feature file, the step definition modules
+    matching its steps (and every project module they use: page objects,
+    helpers, ...) and the selector files behind '{file > key}' references in
+    its step texts and tables, and behind 'page_identifier:<page>' readiness
+    of those page objects or in step texts. Step functions that actually run
+    are added too. Plain test functions depend on their module's closure.
+
+    Filtering runs after every other collection_modifyitems hook, so tests
+    the platform filter deselected are not counted or mapped.
+
+    The map is kept in the framework cache and updated on every run; tests
+    the map knows nothing about are always selected.
+    """
+
+    def __init__(self, config, selectors=None, changed_since: Optional[str] = None):
+        self.config = config
+        self.rootdir = Path(str(config.rootpath))
+        self.selectors = selectors
+        self.changed_since = changed_since
+        self.graph = ModuleGraph(self.rootdir)
+        self.path = cache_path(DEPENDENCY_MAP_FILE)
+        self.dependencies: Dict[str, Set[str]] = {}
+        self.changed: Set[str] = set()
+        self.deselected = 0
+        self._stored: Optional[Dict[str, List[str]]] = None
+
+    @property
+    def is_worker(self) -> bool:
+        return hasattr(self.config, "workerinput")
+
+    def stored(self) -> Dict[str, List[str]]:
+        if self._stored is None:
+            try:
+                with open(self.path, 'r') as f:
+                    self._stored = dict(json.load(f).get("tests", {}))
+            except (OSError, ValueError, AttributeError):
+                self._stored = {}
+        return self._stored
+
+    # Building the map
+
+    def page_files(self, pages: Iterable[str]) -> Set[str]:
+        files = set()
+        if self.selectors is None:
+            return files
+        for page in pages:
+            path = self.graph.relpath(self.selectors.path_for(page.strip()))
+            if path:
+                files.add(path)
+        return files
+
+    def selector_files(self, text: Optional[str]) -> Set[str]:
+        if not text:
+            return set()
+        return self.page_files(
+            [match.group(1) for match in SELECTOR_KEY_REGEX.finditer(text)] + PAGE_IDENTIFIER_REGEX.findall(text)
+        )
+
+    def function_dependencies(self, func) -> Set[str]:
+        return set(self.graph.of_function(func)) | self.page_files(self.graph.pages_of_function(func))
+
+    def scenario_dependencies(self, item, index) -> Set[str]:
+        template = getattr(item.obj, "__scenario__", None)
+        example = getattr(getattr(item, "callspec", None), "params", {}).get("_pytest_bdd_example", {})
+        scenario = template.render(example)
+
+        # The feature file and the module holding the @scenario test
+        module_file = getattr(getattr(item, "module", None), "__file__", None)
+        files = {self.graph.relpath(template.feature.filename), self.graph.relpath(module_file)} - {None}
+        for step in scenario.steps:
+            texts = [step.name, step.docstring]
+            if step.datatable:
+                texts.extend(str(cell) for row in step.datatable.raw() for cell in row)
+            for text in texts:
+                files |= self.selector_files(text)
+            for _, _, context in index.matching(step.name):
+                if context.type is None or context.type == step.type:
+                    files |= self.function_dependencies(context.step_func)
+        return files
+
+    def item_dependencies(self, item, index) -> Set[str]:
+        if getattr(getattr(item, "obj", None), "__scenario__", None) is not None:
+            return self.scenario_dependencies(item, index)
+        module = getattr(item, "module", None)
+        if module is None:
+            return set()
+        return set(self.graph.closure(module)) | self.page_files(self.graph.pages(module))
+
+    # Hooks
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_collection_modifyitems(self, session, config, items):
+        # After the platform filter (and any other plugin) deselected items
+        yield
+        # Every step module is imported by now; conftest's
+        # pytest_collection_finish reuses this index
+        index = install_step_index(session._fixturemanager)
+        for item in items:
+            try:
+                self.dependencies[item.nodeid] = self.item_dependencies(item, index)
+            except Exception as e:
+                logger.debug(f"No dependencies for {item.nodeid}: {e}")
+
+        if not self.changed_since:
+            return
+        self.changed = changed_files(self.changed_since, self.rootdir)
+        if any(is_global_path(path) for path in self.changed):
+            return
+
+        selected, deselected = [], []
+        for item in items:
+            known = self.dependencies.get(item.nodeid, set()) | set(self.stored().get(item.nodeid, ()))
+            (selected if not known or known & self.changed else deselected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        self.deselected = len(deselected)
+
+    def pytest_report_collectionfinish(self, config, start_path, items):
+        if not self.changed_since:
+            return None
+        if any(is_global_path(path) for path in self.changed):
+            return f"changed since {self.changed_since}: shared fixtures/configuration changed, running everything"
+        return (f"changed since {self.changed_since}: {len(self.changed)} file(s), "
+                f"{len(items)} test(s) affected, {self.deselected} deselected")
+
+    def pytest_bdd_before_step(self, request, feature, scenario, step, step_func):
+        self.dependencies.setdefault(request.node.nodeid, set()).update(self.function_dependencies(step_func))
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        for nodeid, files in getattr(node, "workeroutput", {}).get(WORKEROUTPUT_DEPENDENCIES, {}).items():
+            self.dependencies.setdefault(nodeid, set()).update(files)
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker:
+            self.config.workeroutput[WORKEROUTPUT_DEPENDENCIES] = {
+                nodeid: sorted(files) for nodeid, files in self.dependencies.items()
+            }
+            return
+        if not self.dependencies:
+            return
+        tests = {**self.stored(), **{nodeid: sorted(files) for nodeid, files in self.dependencies.items()}}
+        try:
+            atomic_write_bytes(self.path, json.dumps({"tests": tests}, indent=1, sort_keys=True).encode())
+        except OSError as e:
+            logger.warning(f"Could not save the test dependency map: {e}")
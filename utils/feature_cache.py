@@ -0,0 +1,158 @@
+# utils/feature_cache.py
+import hashlib
+import importlib
+import logging
+import os
+import pickle
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Iterable, Optional
+
+from utils.cache import FileSnapshotCache, atomic_write_bytes, cache_path
+from utils.step_index import StepIndex, definition_key
+
+logger = logging.getLogger(__name__)
+
+STEP_BINDINGS_FILE = "step-bindings.pickle"
+
+
+def pytest_bdd_version() -> str:
+    try:
+        return version("pytest-bdd")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class FeatureFileCache(FileSnapshotCache):
+    """
+    Snapshot of parsed pytest-bdd Feature objects (scenarios, outlines with
+    their example tables, backgrounds and step texts), keyed by file hash.
+    The snapshot is tied to the installed pytest-bdd version since it holds
+    its objects. Set FEATURE_CACHE=false to always parse.
+    """
+    magic = b"PYPLFEA1"
+
+    def __init__(self):
+        super().__init__(
+            f"features-{pytest_bdd_version()}.snapshot",
+            enabled=os.environ.get('FEATURE_CACHE', 'true').lower() == 'true'
+        )
+
+    def parse(self, file_path: str) -> Any:
+        from pytest_bdd.parser import FeatureParser
+        return FeatureParser(os.path.dirname(file_path), os.path.basename(file_path)).parse()
+
+    def get_feature(self, base_path: str, filename: str, encoding: str = "utf-8"):
+        """Drop-in replacement for pytest_bdd.feature.get_feature backed by the snapshot"""
+        from pytest_bdd import feature as bdd_feature
+
+        full_name = os.path.abspath(os.path.join(base_path, filename))
+        feature = bdd_feature.features.get(full_name)
+        if not feature:
+            if encoding.lower().replace("-", "") != "utf8":
+                feature = bdd_feature.FeatureParser(base_path, filename, encoding).parse()
+            else:
+                feature = self.load(full_name)
+                # rel_filename depends on the base dir the feature was requested from
+                feature.rel_filename = os.path.join(os.path.basename(base_path), filename)
+            bdd_feature.features[full_name] = feature
+        return feature
+
+
+# Cache installed into pytest-bdd for this process
+_feature_cache: Optional[FeatureFileCache] = None
+
+
+def install_feature_cache() -> FeatureFileCache:
+    """Route pytest-bdd's feature parsing (scenario()/scenarios()) through the snapshot"""
+    global _feature_cache
+    from pytest_bdd import feature as bdd_feature
+    # pytest_bdd re-exports the scenario() function under the submodule's name
+    bdd_scenario = importlib.import_module("pytest_bdd.scenario")
+
+    if _feature_cache is None:
+        _feature_cache = FeatureFileCache()
+        # scenario.py imported get_feature by name; get_features() looks it up
+        # in pytest_bdd.feature, so both need the replacement
+        bdd_feature.get_feature = _feature_cache.get_feature
+        bdd_scenario.get_feature = _feature_cache.get_feature
+    return _feature_cache
+
+
+def warm_feature_cache(paths: Iterable[str]) -> None:
+    """Parse every feature under `paths` once and write the snapshot (xdist controller)"""
+    from pytest_bdd.feature import get_features
+
+    cache = install_feature_cache()
+    get_features([str(path) for path in paths])
+    cache.save()
+
+
+def save_feature_cache() -> None:
+    if _feature_cache is not None:
+        _feature_cache.save()
+
+
+def _library_fingerprint(keys) -> str:
+    # Same set of step patterns -> same step text matches
+    return hashlib.blake2b(repr(sorted(keys, key=repr)).encode(), digest_size=16).hexdigest()
+
+
+def _value_key(value) -> tuple:
+    # Values of the installed index are (fixturename, fixturedef, step context)
+    return definition_key(value[2])
+
+
+def restore_step_bindings(index: StepIndex) -> int:
+    """
+    Seed a step index with step text -> step definition bindings resolved by
+    an earlier run, if the step library has not changed since. Returns the
+    number of step texts restored.
+    """
+    by_key = {}
+    for value in index.values():
+        by_key.setdefault(_value_key(value), []).append(value)
+    if any(len(values) > 1 for values in by_key.values()):
+        return 0
+
+    try:
+        with open(cache_path(STEP_BINDINGS_FILE), 'rb') as f:
+            stored = pickle.load(f)
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError, AttributeError):
+        return 0
+    if stored.get("fingerprint") != _library_fingerprint(by_key):
+        return 0
+
+    memo = {}
+    for step_name, keys in stored.get("bindings", {}).items():
+        if all(key in by_key for key in keys):
+            memo[step_name] = tuple(by_key[key][0] for key in keys)
+    index.prime(memo)
+    logger.debug(f"Restored {len(memo)} step bindings")
+    return len(memo)
+
+
+def save_step_bindings(index: Optional[StepIndex]) -> None:
+    """Persist the step text -> step definition bindings resolved in this run"""
+    if index is None:
+        return
+    keys = [_value_key(value) for value in index.values()]
+    fingerprint = _library_fingerprint(keys)
+    bindings = index.export_memo(_value_key)
+    if not bindings:
+        return
+
+    path = cache_path(STEP_BINDINGS_FILE)
+    try:
+        with open(path, 'rb') as f:
+            stored = pickle.load(f)
+        # Keep what other workers resolved for the same step library
+        if stored.get("fingerprint") == fingerprint:
+            bindings = {**stored.get("bindings", {}), **bindings}
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError, AttributeError):
+        pass
+    try:
+        atomic_write_bytes(path, pickle.dumps(
+            {"fingerprint": fingerprint, "bindings": bindings}, protocol=pickle.HIGHEST_PROTOCOL
+        ))
+    except OSError:
+        pass
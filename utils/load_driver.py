@@ -0,0 +1,216 @@
+# utils/load_driver.py
+"""
+Concurrent load driver for API steps.
+
+Requests are started on a schedule (the open model: arrivals do not wait
+for earlier responses) and run on a bounded thread pool, so at most
+`concurrency` are in flight. When every worker is busy, new arrivals queue;
+their latency is measured from the scheduled start, so a saturated server
+shows up as growing latency instead of a silently lower request rate.
+
+    driver = LoadDriver(lambda: client.get("/health"), concurrency=20)
+    result = driver.run(requests=600, rate=50)       # 50 req/s for 12 s
+    result = driver.run(requests=100)                # as fast as the pool allows
+    result.record(get_performance_monitor(), {"endpoint": "/health"})
+"""
+import logging
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ARRIVALS = ("uniform", "poisson")
+
+# Requests in flight when the config (load_testing.max_concurrency) does not say
+DEFAULT_CONCURRENCY = 20
+
+# Latency histogram upper bounds in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class RequestResult:
+    """Timing and outcome of one request"""
+    __slots__ = ("index", "scheduled", "started", "finished", "response", "error")
+
+    def __init__(self, index: int, scheduled: float):
+        self.index = index
+        self.scheduled = scheduled
+        self.started = scheduled
+        self.finished = scheduled
+        self.response = None
+        self.error: Optional[BaseException] = None
+
+    @property
+    def latency(self) -> float:
+        """Seconds from the scheduled start to the response, including time queued"""
+        return self.finished - self.scheduled
+
+    @property
+    def service_time(self) -> float:
+        """Seconds from the actual start to the response"""
+        return self.finished - self.started
+
+    @property
+    def status_code(self) -> Optional[int]:
+        return getattr(self.response, "status_code", None)
+
+
+class LoadResult:
+    """All request results of a run, in scheduled order, with summary statistics"""
+
+    def __init__(self, results: List[RequestResult], elapsed: float, rate: Optional[float], concurrency: int):
+        self.results = results
+        self.elapsed = elapsed
+        self.rate = rate
+        self.concurrency = concurrency
+
+    @property
+    def responses(self) -> List[Any]:
+        return [result.response for result in self.results]
+
+    @property
+    def errors(self) -> int:
+        return sum(result.error is not None for result in self.results)
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second"""
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    def raise_first_error(self) -> None:
+        """Re-raise the exception of the first request that failed"""
+        for result in self.results:
+            if result.error is not None:
+                raise result.error
+
+    def status_counts(self) -> Dict[Optional[int], int]:
+        counts: Dict[Optional[int], int] = {}
+        for result in self.results:
+            counts[result.status_code] = counts.get(result.status_code, 0) + 1
+        return counts
+
+    def latency_percentile(self, percent: float) -> float:
+        """Nearest-rank percentile of the latencies (100 is the maximum)"""
+        latencies = sorted(result.latency for result in self.results)
+        if not latencies:
+            return 0.0
+        return latencies[max(math.ceil(percent / 100 * len(latencies)) - 1, 0)]
+
+    def histogram(self) -> Dict[float, int]:
+        """Requests per latency bucket (upper bound in seconds)"""
+        counts = dict.fromkeys(LATENCY_BUCKETS, 0)
+        for result in self.results:
+            for bound in LATENCY_BUCKETS:
+                if result.latency <= bound:
+                    counts[bound] += 1
+                    break
+        return counts
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "requests": len(self.results),
+            "errors": self.errors,
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput, 2),
+            "target_rate": self.rate,
+            "concurrency": self.concurrency,
+            **{f"p{percent}": round(self.latency_percentile(percent), 4) for percent in PERCENTILES},
+            "max": round(self.latency_percentile(100), 4),
+            "statuses": {str(status): count for status, count in self.status_counts().items()},
+        }
+
+    def record(self, monitor, tags: Dict[str, Any] = None) -> None:
+        """Write throughput, latency percentiles and the latency histogram to the performance store"""
+        tags = tags or {}
+        summary = self.summary()
+        monitor.record_metric("load_throughput", summary["throughput"], {
+            **tags, "requests": summary["requests"], "errors": summary["errors"], "elapsed": summary["elapsed"],
+            "target_rate": self.rate, "concurrency": self.concurrency,
+        })
+        for percent in PERCENTILES:
+            monitor.record_metric("load_latency", summary[f"p{percent}"], {**tags, "percentile": percent})
+        monitor.record_metric("load_latency", summary["max"], {**tags, "percentile": 100})
+        for bound, count in self.histogram().items():
+            monitor.record_metric("load_latency_bucket", count, {**tags, "le": bound})
+
+
+class LoadDriver:
+    """
+    Runs `send` (a callable making one request and returning its response)
+    on up to `concurrency` threads, started at a fixed rate or as fast as
+    the pool allows.
+    """
+
+    def __init__(self, send: Callable[[], Any], concurrency: int = 10, arrival: str = "uniform",
+                 seed: Optional[int] = None):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if arrival not in ARRIVALS:
+            raise ValueError(f"Unknown arrival process '{arrival}'. Use one of: {', '.join(ARRIVALS)}")
+        self.send = send
+        self.concurrency = concurrency
+        self.arrival = arrival
+        self._random = random.Random(seed)
+
+    def schedule(self, requests: int, rate: Optional[float]) -> List[float]:
+        """Start offsets in seconds; all 0 without a rate"""
+        if not rate:
+            return [0.0] * requests
+        if self.arrival == "poisson":
+            offsets, offset = [], 0.0
+            for _ in range(requests):
+                offsets.append(offset)
+                offset += self._random.expovariate(rate)
+            return offsets
+        return [index / rate for index in range(requests)]
+
+    def _execute(self, result: RequestResult) -> RequestResult:
+        result.started = time.perf_counter()
+        try:
+            result.response = self.send()
+        except Exception as e:
+            result.error = e
+            logger.debug(f"Request {result.index} failed: {e}")
+        result.finished = time.perf_counter()
+        return result
+
+    def run(self, requests: int, rate: Optional[float] = None) -> LoadResult:
+        """Send `requests` requests at `rate` per second (or all at once) and wait for every response"""
+        offsets = self.schedule(requests, rate)
+        results = []
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="load-driver") as pool:
+            start = time.perf_counter()
+            for index, offset in enumerate(offsets):
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                result = RequestResult(index, start + offset)
+                results.append(result)
+                pool.submit(self._execute, result)
+        elapsed = max((result.finished for result in results), default=start) - start
+        load = LoadResult(results, elapsed, rate, self.concurrency)
+        logger.info(f"Load run: {load.summary()}")
+        return load
+
+
+def parse_duration(text: str) -> float:
+    """'1 minute', '30 seconds', '500 ms', '2s' -> seconds"""
+    text = text.strip().lower()
+    number = text.rstrip("abcdefghijklmnopqrstuvwxyz ")
+    unit = text[len(number):].strip()
+    try:
+        value = float(number)
+    except ValueError:
+        raise ValueError(f"Invalid duration '{text}'")
+    if unit in ("ms", "millisecond", "milliseconds"):
+        return value / 1000
+    if unit in ("", "s", "sec", "secs", "second", "seconds"):
+        return value
+    if unit in ("m", "min", "mins", "minute", "minutes"):
+        return value * 60
+    raise ValueError(f"Unknown time unit in '{text}'")
@@ -10,10 +10,13 @@ import threading
 import time
 from datetime import datetime
 from typing import Optional, Dict, Any, Callable
-from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 from pathlib import Path
 from contextlib import contextmanager
+from collections import deque
 import inspect
+import atexit
+import queue
 
 # Try to import dotenv for environment variable loading
 try:
@@ -41,65 +44,187 @@ class CustomFormatter(logging.Formatter):
             return f"{self.COLORS[record.levelname]}{log_message}{self.COLORS['RESET']}"
         return log_message
 
-class AsyncLogHandler(logging.Handler):
-    """Handler that processes logs asynchronously to avoid blocking"""
-    
-    def __init__(self, capacity=1000):
-        super().__init__()
-        self.queue = asyncio.Queue(maxsize=capacity)
-        self.handler_task = None
-        self.stop_event = asyncio.Event()
+# Overflow policies of the async logging queue when it is full
+OVERFLOW_BLOCK = "block"            # wait for room (up to block_timeout), then drop the record
+OVERFLOW_DROP_OLDEST = "drop_oldest"  # evict the oldest queued record
+OVERFLOW_SAMPLE = "sample"          # keep 1 in sample_every records below WARNING; WARNING+ always kept
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_SAMPLE)
+
+
+class RingBufferQueue:
+    """
+    Bounded, thread-safe record queue for QueueHandler/QueueListener that
+    applies an overflow policy instead of raising queue.Full. The listener
+    drains it in batches.
+    """
+
+    def __init__(self, capacity=10000, policy=OVERFLOW_DROP_OLDEST, block_timeout=1.0, sample_every=10):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}', expected one of {OVERFLOW_POLICIES}")
+        self.capacity = capacity
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.sample_every = max(int(sample_every), 1)
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._overflowed = 0
+        self.stats = {"queued": 0, "dropped": 0, "flushed": 0, "batches": 0, "high_water": 0}
+
+    def __len__(self):
+        return len(self._items)
+
+    def _append(self, item):
+        self._items.append(item)
+        if item is not None:
+            self.stats["queued"] += 1
+            if len(self._items) > self.stats["high_water"]:
+                self.stats["high_water"] = len(self._items)
+        self._not_empty.notify()
+
+    def put(self, item, block=True, timeout=None):
+        with self._lock:
+            # The listener's stop sentinel (None) always gets in
+            if item is None or len(self._items) < self.capacity:
+                self._append(item)
+                return
+            if self.policy == OVERFLOW_BLOCK:
+                if self._not_full.wait_for(lambda: len(self._items) < self.capacity, self.block_timeout):
+                    self._append(item)
+                else:
+                    self.stats["dropped"] += 1
+                return
+            if self.policy == OVERFLOW_SAMPLE and item.levelno < logging.WARNING:
+                self._overflowed += 1
+                if self._overflowed % self.sample_every:
+                    self.stats["dropped"] += 1
+                    return
+            # drop_oldest, or a record kept by sampling: make room
+            self._items.popleft()
+            self.stats["dropped"] += 1
+            self._append(item)
+
+    def put_nowait(self, item):
+        self.put(item, block=False)
+
+    def get(self, block=True, timeout=None):
+        return self.get_batch(1, block, timeout)[0]
+
+    def get_batch(self, max_items, block=True, timeout=None):
+        """Wait for at least one item, then take up to max_items"""
+        with self._lock:
+            if not self._items:
+                if not block or not self._not_empty.wait_for(lambda: self._items, timeout):
+                    raise queue.Empty
+            batch = [self._items.popleft() for _ in range(min(max_items, len(self._items)))]
+            self._not_full.notify_all()
+            return batch
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    QueueListener that drains records in batches and flushes each handler
+    once per batch instead of once per record.
+    """
+
+    def __init__(self, queue, *handlers, batch_size=100):
+        super().__init__(queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def _monitor(self):
+        while True:
+            batch = self.queue.get_batch(self.batch_size)
+            records = [record for record in batch if record is not self._sentinel]
+            if records:
+                self.handle_batch(records)
+            if len(records) != len(batch):
+                break
+
+    def handle_batch(self, records):
+        for handler in self.handlers:
+            # StreamHandler.emit() flushes after every record; hold that off
+            # until the whole batch has been written
+            flush = handler.flush
+            handler.flush = _no_flush
+            try:
+                for record in records:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            finally:
+                del handler.flush
+            flush()
+        self.queue.stats["flushed"] += len(records)
+        self.queue.stats["batches"] += 1
+
+
+def _no_flush():
+    pass
+
+
+class AsyncLogHandler(QueueHandler):
+    """
+    Non-blocking handler: records are prepared on the calling thread, put on
+    a bounded RingBufferQueue and written by the added handlers on a
+    dedicated listener thread, in batches. stats() reports queued, dropped
+    and flushed record counts.
+    """
+
+    def __init__(self, capacity=10000, policy=OVERFLOW_DROP_OLDEST, batch_size=100,
+                 block_timeout=1.0, sample_every=10):
+        super().__init__(RingBufferQueue(capacity, policy, block_timeout, sample_every))
+        self.batch_size = batch_size
         self.handlers = []
-    
-    def emit(self, record):
-        # Put the record in the queue if possible, otherwise drop it
-        try:
-            # Handle both async and sync contexts
-            if asyncio.get_event_loop().is_running():
-                asyncio.create_task(self._async_emit(record))
-            else:
-                # Drop log if queue is full in non-async context
-                if not self.queue.full():
-                    self.queue.put_nowait(record)
-        except Exception:
-            self.handleError(record)
-    
-    async def _async_emit(self, record):
-        try:
-            await asyncio.wait_for(self.queue.put(record), timeout=0.1)
-        except asyncio.TimeoutError:
-            # Queue is full, log will be dropped
-            pass
-        except Exception:
-            self.handleError(record)
-    
+        self.listener = None
+
     def add_handler(self, handler):
         """Add a regular handler that will process the queued logs"""
         self.handlers.append(handler)
-    
+
+    def start(self):
+        """Start the listener thread (idempotent)"""
+        if self.listener is None:
+            self.listener = BatchingQueueListener(self.queue, *self.handlers, batch_size=self.batch_size)
+            self.listener.start()
+            atexit.register(self.stop)
+
+    def stop(self):
+        """Write out every queued record and stop the listener thread"""
+        if self.listener is not None:
+            listener, self.listener = self.listener, None
+            listener.stop()
+
+    def stats(self):
+        return dict(self.queue.stats, pending=len(self.queue))
+
     async def start_processing(self):
         """Start the async processing of logs"""
-        self.handler_task = asyncio.create_task(self._process_logs())
-        
-    async def _process_logs(self):
-        """Process logs from the queue"""
-        while not self.stop_event.is_set() or not self.queue.empty():
-            try:
-                record = await asyncio.wait_for(self.queue.get(), timeout=0.5)
-                for handler in self.handlers:
-                    if record.levelno >= handler.level:
-                        handler.emit(record)
-                self.queue.task_done()
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                print(f"Error processing log record: {e}")
-    
+        self.start()
+
     async def stop_processing(self):
         """Stop the async processing of logs"""
-        self.stop_event.set()
-        if self.handler_task:
-            await self.handler_task
+        self.stop()
+
+# Module name per calling code object, so repeated lookups skip f_globals
+_caller_names: Dict[Any, str] = {}
+
+_getframe = getattr(sys, '_getframe', None)
+
+
+def caller_module_name(depth=0):
+    """
+    Return the __name__ of the module whose code called the function that
+    calls this one, `depth` frames further up. Constant time, unlike
+    inspect.stack() which builds FrameInfo (and reads source) for every frame.
+    """
+    frame = _getframe(depth + 2) if _getframe else inspect.stack()[depth + 2].frame
+    code = frame.f_code
+    try:
+        return _caller_names[code]
+    except KeyError:
+        name = _caller_names[code] = frame.f_globals.get('__name__') or "root"
+        return name
+
 
 class Logger:
     _instances = {}  # Cache for logger instances
@@ -109,9 +234,7 @@ class Logger:
         """Get or create a logger instance for the given name"""
         if name is None:
             # Get the calling module's name
-            frame = inspect.stack()[1]
-            module = inspect.getmodule(frame[0])
-            name = module.__name__ if module else "root"
+            name = caller_module_name()
             
         if name in cls._instances:
             return cls._instances[name]
@@ -120,6 +243,17 @@ class Logger:
         cls._instances[name] = instance
         return instance
     
+    @classmethod
+    def async_stats(cls):
+        """Queued/dropped/flushed record counters summed over every async logger"""
+        totals = {}
+        for instance in cls._instances.values():
+            handler = getattr(instance, 'async_handler', None)
+            if handler is not None:
+                for key, value in handler.stats().items():
+                    totals[key] = max(totals.get(key, 0), value) if key == "high_water" else totals.get(key, 0) + value
+        return totals
+
     def __init__(self, name="automation_framework"):
         self.name = name
         self.logger = logging.getLogger(name)
@@ -155,7 +289,7 @@ class Logger:
         json_format = os.environ.get('LOG_JSON_FORMAT', 'false').lower() == 'true'
         
         # Create logs directory if it doesn't exist
-        Path(log_dir).mkdir(exist_ok=True)
+        Path(log_dir).mkdir(parents=True, exist_ok=True)
         
         # Determine appropriate formatters
         if json_format:
@@ -189,19 +323,17 @@ class Logger:
         
         # Set up async handling if enabled
         if os.environ.get('ASYNC_LOGGING', 'false').lower() == 'true':
-            self.async_handler = AsyncLogHandler()
+            self.async_handler = AsyncLogHandler(
+                capacity=int(os.environ.get('ASYNC_LOG_CAPACITY', 10000)),
+                policy=os.environ.get('ASYNC_LOG_OVERFLOW', OVERFLOW_DROP_OLDEST).lower(),
+                batch_size=int(os.environ.get('ASYNC_LOG_BATCH_SIZE', 100)),
+                block_timeout=float(os.environ.get('ASYNC_LOG_BLOCK_TIMEOUT', 1.0)),
+                sample_every=int(os.environ.get('ASYNC_LOG_SAMPLE_EVERY', 10))
+            )
             self.async_handler.add_handler(file_handler)
             self.async_handler.add_handler(console_handler)
             self.logger.addHandler(self.async_handler)
-            
-            # Start async processing if in an async context
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.create_task(self.async_handler.start_processing())
-            except RuntimeError:
-                # Not in async context, will start when needed
-                pass
+            self.async_handler.start()
         else:
             # Synchronous logging
             self.logger.addHandler(file_handler)
@@ -376,4 +508,5 @@ class Logger:
 
 # Create a global function for easy access
 def get_logger(name=None):
-    return Logger.get_logger(name)
\ No newline at end of file
+    # Resolve the caller here; inside Logger.get_logger it would be this module
+    return Logger.get_logger(name if name is not None else caller_module_name())
\ No newline at end of file
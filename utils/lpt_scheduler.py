@@ -0,0 +1,250 @@
+# utils/lpt_scheduler.py
+import heapq
+import json
+import logging
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Collection, Dict, Iterable, List, Optional
+
+import pytest
+
+from utils.auth_state_cache import AUTH_ROLE_MARKER, get_auth_role
+from utils.cache import atomic_write_bytes, cache_path
+
+try:
+    from xdist.scheduler import LoadScopeScheduling
+except ImportError:
+    # pytest-xdist not installed: the scheduler is never created
+    LoadScopeScheduling = object
+
+logger = logging.getLogger(__name__)
+
+DURATIONS_FILE = "durations.json"
+
+# Weight of the latest run in the smoothed duration of a test
+SMOOTHING = 0.5
+
+# Estimate for tests without history when nothing else is known
+DEFAULT_DURATION = 1.0
+
+# Worker queue depth; a worker only runs a test once it knows the next one
+MIN_PENDING = 2
+
+# config.workeroutput key workers send their {nodeid: scheduling group} under
+WORKEROUTPUT_GROUPS = "pyplay_scheduling_groups"
+
+
+def scheduling_group(item) -> Optional[str]:
+    """Tests sharing an expensive fixture (the same logged-in role) share a group"""
+    role = get_auth_role(item)
+    return f"{AUTH_ROLE_MARKER}:{role}" if role else None
+
+
+def predict_makespan(costs: Iterable[float], workers: int) -> float:
+    """Makespan of handing out work units in the given order to the first free worker"""
+    loads = [0.0] * max(workers, 1)
+    for cost in costs:
+        heapq.heapreplace(loads, loads[0] + cost)
+    return max(loads)
+
+
+class DurationHistory:
+    """
+    Per-test durations (setup + call + teardown, exponentially smoothed) and
+    scheduling groups from earlier runs, stored as JSON in the framework cache.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else cache_path(DURATIONS_FILE)
+        self.durations: Dict[str, float] = {}
+        self.groups: Dict[str, str] = {}
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.durations = dict(data.get("durations", {}))
+            self.groups = dict(data.get("groups", {}))
+        except (OSError, ValueError, AttributeError):
+            pass
+        self._default = statistics.median(self.durations.values()) if self.durations else DEFAULT_DURATION
+
+    def estimate(self, nodeid: str) -> float:
+        return self.durations.get(nodeid, self._default)
+
+    def group(self, nodeid: str) -> Optional[str]:
+        return self.groups.get(nodeid)
+
+    def record(self, durations: Dict[str, float], groups: Dict[str, Optional[str]]) -> None:
+        for nodeid, seconds in durations.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = seconds if previous is None else (
+                SMOOTHING * seconds + (1 - SMOOTHING) * previous
+            )
+        for nodeid, group in groups.items():
+            if group:
+                self.groups[nodeid] = group
+            else:
+                self.groups.pop(nodeid, None)
+
+    def save(self) -> None:
+        data = {"durations": self.durations, "groups": self.groups}
+        try:
+            atomic_write_bytes(self.path, json.dumps(data, indent=1, sort_keys=True).encode())
+        except OSError as e:
+            logger.warning(f"Could not save test durations: {e}")
+
+
+class LPTScheduling(LoadScopeScheduling):
+    """
+    xdist scheduler handing out work longest-processing-time first.
+
+    Every test is its own work unit, except tests that shared a scheduling
+    group in earlier runs: those stay on one worker, split into chunks of at
+    most one worker's fair share of the predicted time. Units are queued by
+    predicted duration (longest first) and a worker is given the next unit
+    when it runs low, so long scenarios start early instead of landing last.
+    Units holding a low-priority (quarantined) test are queued after all
+    others.
+    """
+
+    def __init__(self, config, log, plugin: "LPTSchedulerPlugin"):
+        super().__init__(config, log)
+        self.plugin = plugin
+        self.history = plugin.history
+        self._scopes: Dict[str, str] = {}
+        self._ordered = False
+
+    def _split_scope(self, nodeid: str) -> str:
+        return self._scopes.get(nodeid, nodeid)
+
+    def _plan_scopes(self, collection: List[str]) -> Dict[str, str]:
+        workers = max(len(self.nodes), 1)
+        share = sum(self.history.estimate(nodeid) for nodeid in collection) / workers
+
+        by_group = defaultdict(list)
+        for nodeid in collection:
+            group = self.history.group(nodeid)
+            if group:
+                by_group[group].append(nodeid)
+
+        scopes = {}
+        for group, nodeids in by_group.items():
+            chunk, cost = 0, 0.0
+            for nodeid in nodeids:
+                estimate = self.history.estimate(nodeid)
+                if cost and cost + estimate > share:
+                    chunk, cost = chunk + 1, 0.0
+                scopes[nodeid] = f"{group}#{chunk}"
+                cost += estimate
+        return scopes
+
+    def unit_key(self, work_unit: Dict[str, bool]):
+        deferred = any(nodeid in self.plugin.low_priority for nodeid in work_unit)
+        return deferred, -self.unit_cost(work_unit)
+
+    def unit_cost(self, work_unit: Dict[str, bool]) -> float:
+        return sum(self.history.estimate(nodeid) for nodeid, done in work_unit.items() if not done)
+
+    def schedule(self) -> None:
+        if self.collection is None and self.registered_collections:
+            self._scopes = self._plan_scopes(next(iter(self.registered_collections.values())))
+        super().schedule()
+
+    def _assign_work_unit(self, node) -> None:
+        if not self._ordered:
+            # Longest first; the default --loadscope-reorder sorts by test count
+            units = sorted(self.workqueue.items(), key=lambda unit: self.unit_key(unit[1]))
+            self.workqueue.clear()
+            self.workqueue.update(units)
+            self._ordered = True
+            self.plugin.planned(
+                predict_makespan((self.unit_cost(unit) for _, unit in units), len(self.nodes)),
+                workers=len(self.nodes), units=len(units)
+            )
+        super()._assign_work_unit(node)
+
+    def _reschedule(self, node) -> None:
+        if node.shutting_down:
+            return
+        if not self.workqueue:
+            node.shutdown()
+            return
+        # Unlike LoadScopeScheduling (up to 3 queued tests), keep queues short
+        # so the next long unit goes to whichever worker frees up first
+        if self._pending_of(self.assigned_work[node]) >= MIN_PENDING:
+            return
+        self._assign_work_unit(node)
+
+
+class LPTSchedulerPlugin:
+    """
+    Records per-test durations into DurationHistory on every run and, with
+    --lpt-schedule under xdist, installs LPTScheduling and reports the
+    predicted makespan against the wall-clock one (first work unit handed
+    out to the last worker going down).
+    """
+
+    def __init__(self, config, enabled: bool = False, low_priority: Collection[str] = ()):
+        self.config = config
+        self.enabled = enabled
+        self.low_priority = low_priority
+        self.history = DurationHistory()
+        self.durations: Dict[str, float] = defaultdict(float)
+        self.busy: Dict[str, float] = defaultdict(float)
+        self.groups: Dict[str, Optional[str]] = {}
+        self.prediction: Optional[dict] = None
+        # perf_counter() at the first dispatch and the last worker shutdown
+        self.dispatched_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def is_worker(self) -> bool:
+        return hasattr(self.config, "workerinput")
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if not self.enabled:
+            return None
+        return LPTScheduling(config, log, self)
+
+    def planned(self, makespan: float, workers: int, units: int) -> None:
+        self.prediction = {"makespan": makespan, "workers": workers, "units": units}
+        self.dispatched_at = time.perf_counter()
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items):
+        self.groups = {item.nodeid: scheduling_group(item) for item in items}
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        self.finished_at = time.perf_counter()
+        self.groups.update(getattr(node, "workeroutput", {}).get(WORKEROUTPUT_GROUPS, {}))
+
+    def pytest_runtest_logreport(self, report):
+        if self.is_worker:
+            return
+        self.durations[report.nodeid] += report.duration
+        gateway = getattr(getattr(report, "node", None), "gateway", None)
+        self.busy[gateway.id if gateway else "main"] += report.duration
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker:
+            self.config.workeroutput[WORKEROUTPUT_GROUPS] = self.groups
+            return
+        if self.durations:
+            self.history.record(self.durations, self.groups)
+            self.history.save()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.prediction is None:
+            return
+        actual = (self.finished_at or time.perf_counter()) - self.dispatched_at
+        terminalreporter.write_sep("-", "LPT schedule")
+        terminalreporter.write_line(
+            f"{self.prediction['units']} work units on {self.prediction['workers']} workers: "
+            f"predicted makespan {self.prediction['makespan']:.1f}s, actual {actual:.1f}s "
+            f"(busiest worker {max(self.busy.values(), default=0.0):.1f}s)"
+        )
+        for worker, seconds in sorted(self.busy.items()):
+            terminalreporter.write_line(f"  {worker}: {seconds:.1f}s busy")
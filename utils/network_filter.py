@@ -0,0 +1,209 @@
+# utils/network_filter.py
+import fnmatch
+import logging
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tag/marker prefix that re-enables a blocked resource type for a feature or
+# scenario, e.g. @allow_images, @allow_fonts, @allow_third_party
+ALLOW_MARKER_PREFIX = "allow_"
+# Tag/marker that turns routing off completely for a test
+NO_FILTER_MARKER = "no_network_filter"
+
+# Plural tag names -> Playwright resource types
+RESOURCE_TYPE_TAGS = {
+    "images": "image",
+    "fonts": "font",
+    "media": "media",
+    "stylesheets": "stylesheet",
+    "scripts": "script",
+}
+
+# Remembered exact sizes of URLs seen unblocked, used for the bytes-saved estimate
+MAX_KNOWN_SIZES = 4096
+
+
+def compile_patterns(patterns: Iterable[str]) -> Optional[re.Pattern]:
+    """Combine glob URL patterns into one regex (None when there are none)"""
+    patterns = [p for p in patterns or () if p]
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+
+
+class TransferEstimator:
+    """
+    Estimates how many bytes a blocked request would have transferred, from
+    the Content-Length of responses that were let through: the exact size
+    when the same URL was seen before, otherwise the average for its type.
+    Types that are always blocked are never observed, so they fall back to
+    the configured `estimated_sizes`; None when there is nothing to go on.
+    """
+
+    def __init__(self, default_sizes: Dict[str, int] = None):
+        self.default_sizes = dict(default_sizes or {})
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._totals: Dict[str, List[int]] = {}
+
+    def observe(self, url: str, resource_type: str, size: int) -> None:
+        self._sizes[url] = size
+        self._sizes.move_to_end(url)
+        if len(self._sizes) > MAX_KNOWN_SIZES:
+            self._sizes.popitem(last=False)
+        total = self._totals.setdefault(resource_type, [0, 0])
+        total[0] += size
+        total[1] += 1
+
+    def estimate(self, url: str, resource_type: str) -> Optional[int]:
+        if url in self._sizes:
+            return self._sizes[url]
+        total, count = self._totals.get(resource_type, (0, 0))
+        if count:
+            return total // count
+        return self.default_sizes.get(resource_type)
+
+
+class NetworkFilterStats:
+    """Requests blocked/stubbed for one test"""
+
+    def __init__(self):
+        self.blocked = 0
+        self.stubbed = 0
+        self.bytes_saved = 0
+        # Requests whose size could not be estimated (not in bytes_saved)
+        self.unestimated = 0
+        self.by_type: Dict[str, int] = {}
+
+    def add_saving(self, size: Optional[int]) -> None:
+        if size is None:
+            self.unestimated += 1
+        else:
+            self.bytes_saved += size
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests_blocked": self.blocked,
+            "requests_stubbed": self.stubbed,
+            "bytes_saved": self.bytes_saved,
+            "requests_unestimated": self.unestimated,
+            "blocked_by_type": dict(self.by_type),
+        }
+
+
+class NetworkFilter:
+    """
+    Config-driven request routing for browser contexts
+    (config/platforms/web_config.yaml -> web.network_filter).
+
+    Requests are aborted when their resource type is in `block_resource_types`
+    or their URL matches `block_url_patterns`; URLs matching `stub_url_patterns`
+    are answered locally; `allow_url_patterns` always go through.
+    `estimated_sizes` (bytes per resource type) seed the bytes-saved estimate.
+    """
+
+    def __init__(self, settings: Dict[str, Any] = None):
+        settings = settings or {}
+        self.enabled = settings.get('enabled', False)
+        self.block_types = frozenset(settings.get('block_resource_types') or ())
+        self.block_url_patterns = list(settings.get('block_url_patterns') or ())
+        self.allow_urls = compile_patterns(settings.get('allow_url_patterns'))
+        self.stubs = [
+            (compile_patterns([pattern]), response or {})
+            for pattern, response in (settings.get('stub_url_patterns') or {}).items()
+        ]
+        self.estimator = TransferEstimator(settings.get('estimated_sizes'))
+        self.totals = NetworkFilterStats()
+        self._block_urls_cache: Dict[bool, Optional[re.Pattern]] = {}
+
+    def overrides_for(self, node) -> Dict[str, Any]:
+        """Read @allow_<type>, @allow_third_party and @no_network_filter from a test"""
+        allowed_types = set()
+        allow_third_party = False
+        disabled = False
+        for marker in node.iter_markers():
+            name = marker.name
+            if name == NO_FILTER_MARKER:
+                disabled = True
+            elif name == f"{ALLOW_MARKER_PREFIX}third_party":
+                allow_third_party = True
+            elif name.startswith(ALLOW_MARKER_PREFIX):
+                tag = name[len(ALLOW_MARKER_PREFIX):]
+                allowed_types.add(RESOURCE_TYPE_TAGS.get(tag, tag))
+        return {"disabled": disabled, "allowed_types": allowed_types, "allow_third_party": allow_third_party}
+
+    def _block_urls(self, allow_third_party: bool) -> Optional[re.Pattern]:
+        if allow_third_party not in self._block_urls_cache:
+            self._block_urls_cache[allow_third_party] = (
+                None if allow_third_party else compile_patterns(self.block_url_patterns)
+            )
+        return self._block_urls_cache[allow_third_party]
+
+    async def apply(self, browser_context, node=None) -> Optional[NetworkFilterStats]:
+        """Install routing on a context for one test; returns its stats (None when not filtering)"""
+        overrides = self.overrides_for(node) if node is not None else {
+            "disabled": False, "allowed_types": set(), "allow_third_party": False
+        }
+        block_types = self.block_types - overrides["allowed_types"]
+        block_urls = self._block_urls(overrides["allow_third_party"])
+
+        # Always learn transfer sizes so blocked requests can be estimated
+        browser_context.on("response", self._observe)
+
+        if not self.enabled or overrides["disabled"] or not (block_types or block_urls or self.stubs):
+            return None
+
+        stats = NetworkFilterStats()
+        allow_urls = self.allow_urls
+        stubs = self.stubs
+        estimator = self.estimator
+
+        async def handle(route):
+            request = route.request
+            url = request.url
+            if allow_urls is not None and allow_urls.match(url):
+                await route.continue_()
+                return
+
+            for pattern, response in stubs:
+                if pattern.match(url):
+                    stats.stubbed += 1
+                    stats.add_saving(estimator.estimate(url, request.resource_type))
+                    await route.fulfill(
+                        status=response.get('status', 200),
+                        content_type=response.get('content_type', 'text/plain'),
+                        body=response.get('body', '')
+                    )
+                    return
+
+            resource_type = request.resource_type
+            if resource_type in block_types or (block_urls is not None and block_urls.match(url)):
+                stats.blocked += 1
+                stats.by_type[resource_type] = stats.by_type.get(resource_type, 0) + 1
+                stats.add_saving(estimator.estimate(url, resource_type))
+                await route.abort("blockedbyclient")
+                return
+
+            await route.continue_()
+
+        await browser_context.route("**/*", handle)
+        return stats
+
+    def _observe(self, response) -> None:
+        try:
+            length = response.headers.get('content-length')
+            if length:
+                self.estimator.observe(response.url, response.request.resource_type, int(length))
+        except Exception as e:
+            logger.debug(f"Could not record response size for {response.url}: {e}")
+
+    def record(self, stats: NetworkFilterStats) -> None:
+        """Add one test's stats to the session totals"""
+        self.totals.blocked += stats.blocked
+        self.totals.stubbed += stats.stubbed
+        self.totals.bytes_saved += stats.bytes_saved
+        self.totals.unestimated += stats.unestimated
+        for resource_type, count in stats.by_type.items():
+            self.totals.by_type[resource_type] = self.totals.by_type.get(resource_type, 0) + count
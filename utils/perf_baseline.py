@@ -0,0 +1,208 @@
+# utils/perf_baseline.py
+"""
+Performance regression gate.
+
+Scenario and step durations from performance_metrics.csv (recorded by the
+step timing plugin) are compared with a rolling baseline of earlier runs kept
+in a local SQLite file: per scenario (nodeid) and per step definition, the
+last BASELINE_WINDOW run values, from which p50/p95 are computed.
+
+A key has regressed when its duration in this run is above the baseline p95
+and its robust z-score ((value - p50) / (1.4826 * MAD)) is at least
+Z_THRESHOLD, by at least MIN_DELTA_SECONDS. Regressed values are kept out of
+the baseline unless accepted (--accept), so a slowdown keeps being reported
+until someone decides it is the new normal.
+"""
+import argparse
+import csv
+import html
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.cache import cache_path
+
+BASELINE_FILE = "perf-baseline.sqlite"
+DEFAULT_METRICS_FILE = os.path.join("reports", "performance", "performance_metrics.csv")
+SUMMARY_FILE = "perf-gate.html"
+
+# Runs kept per key, and runs needed before a key is gated
+BASELINE_WINDOW = 30
+MIN_SAMPLES = 5
+
+Z_THRESHOLD = 3.0
+MIN_DELTA_SECONDS = 0.05
+
+# Baseline kinds and the performance_metrics.csv column they are keyed by
+KEYS = {"scenario": "nodeid", "step": "definition"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    run TEXT NOT NULL,
+    duration REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_key ON samples (kind, key, id);
+"""
+
+
+def read_run(metrics_file) -> Dict[Tuple[str, str], float]:
+    """
+    {(kind, key): duration} for one run: each scenario's duration, and the
+    median duration of each step definition. Failed steps are left out.
+    """
+    samples = defaultdict(list)
+    with open(metrics_file, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            column = KEYS.get(row.get("name"))
+            if column is None or not row.get(column) or not row.get("duration"):
+                continue
+            if row.get("success") == "False":
+                continue
+            samples[(row["name"], row[column])].append(float(row["duration"]))
+    return {key: statistics.median(durations) for key, durations in samples.items()}
+
+
+def percentile(values: List[float], percent: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+class Baseline:
+    """Rolling per-key duration history in SQLite"""
+
+    def __init__(self, path: Optional[Path] = None, window: int = BASELINE_WINDOW):
+        self.path = Path(path) if path else cache_path(BASELINE_FILE)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.window = window
+        self.db = sqlite3.connect(str(self.path))
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def history(self, kind: str, key: str) -> List[float]:
+        rows = self.db.execute(
+            "SELECT duration FROM samples WHERE kind = ? AND key = ? ORDER BY id DESC LIMIT ?",
+            (kind, key, self.window)
+        )
+        return [duration for (duration,) in rows]
+
+    def record(self, run: str, values: Dict[Tuple[str, str], float]) -> None:
+        """Add one run's values and drop samples that fell out of the window"""
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO samples (kind, key, run, duration, recorded_at) VALUES (?, ?, ?, ?, ?)",
+                [(kind, key, run, duration, now) for (kind, key), duration in values.items()]
+            )
+            self.db.executemany(
+                "DELETE FROM samples WHERE kind = ? AND key = ? AND id NOT IN "
+                "(SELECT id FROM samples WHERE kind = ? AND key = ? ORDER BY id DESC LIMIT ?)",
+                [(kind, key, kind, key, self.window) for (kind, key) in values]
+            )
+
+
+def compare(baseline: Baseline, values: Dict[Tuple[str, str], float]) -> List[dict]:
+    """One result per key: its duration against the baseline percentiles"""
+    results = []
+    for (kind, key), duration in sorted(values.items()):
+        history = baseline.history(kind, key)
+        result = {"kind": kind, "key": key, "duration": duration, "samples": len(history),
+                  "p50": None, "p95": None, "z": None, "regressed": False}
+        if history:
+            p50 = statistics.median(history)
+            mad = statistics.median(abs(value - p50) for value in history)
+            # A perfectly stable history (MAD 0) is scaled by 1% of the median
+            spread = 1.4826 * mad or 0.01 * p50 or 1e-9
+            result.update(p50=p50, p95=percentile(history, 95), z=(duration - p50) / spread)
+            result["regressed"] = (
+                len(history) >= MIN_SAMPLES and duration > result["p95"]
+                and result["z"] >= Z_THRESHOLD and duration - p50 >= MIN_DELTA_SECONDS
+            )
+        results.append(result)
+    return results
+
+
+def write_summary(results: List[dict], output, mode: str) -> None:
+    """Self-contained HTML table of the comparison, regressions first"""
+    def seconds(value):
+        return "" if value is None else f"{value:.3f}s"
+
+    regressions = [result for result in results if result["regressed"]]
+    rows = "".join(
+        f"<tr class='{'regressed' if result['regressed'] else ''}'><td>{result['kind']}</td>"
+        f"<td>{html.escape(result['key'])}</td><td>{seconds(result['duration'])}</td>"
+        f"<td>{seconds(result['p50'])}</td><td>{seconds(result['p95'])}</td>"
+        f"<td>{'' if result['z'] is None else format(result['z'], '.1f')}</td><td>{result['samples']}</td></tr>"
+        for result in sorted(results, key=lambda result: (not result["regressed"], -(result["z"] or 0)))
+    )
+    page = f"""<!doctype html>
+<html><head><meta charset="utf-8"><title>Performance gate</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; }}
+td, th {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+.regressed {{ background: #fdd; }}
+</style></head><body>
+<h1>Performance gate ({mode})</h1>
+<p>{len(regressions)} regression(s) in {len(results)} scenarios and step definitions.
+Regressed: above the baseline p95, robust z-score &ge; {Z_THRESHOLD} and at least {MIN_DELTA_SECONDS}s over p50,
+with {MIN_SAMPLES}+ earlier runs.</p>
+<table><tr><th>Kind</th><th>Scenario / step definition</th><th>This run</th><th>p50</th><th>p95</th>
+<th>z</th><th>Runs</th></tr>{rows}</table>
+</body></html>
+"""
+    with open(output, 'w') as f:
+        f.write(page)
+
+
+def gate(metrics_file, mode: str = "fail", baseline_path=None, accept: bool = False, summary=None) -> int:
+    """Compare a run with the baseline, record it and write the HTML summary"""
+    if not os.path.exists(metrics_file):
+        print(f"Performance gate: no metrics at {metrics_file}")
+        return 0
+    values = read_run(metrics_file)
+    baseline = Baseline(baseline_path)
+    try:
+        results = compare(baseline, values)
+        regressed = {(result["kind"], result["key"]) for result in results if result["regressed"]}
+        baseline.record(time.strftime("%Y%m%d-%H%M%S"), {
+            key: duration for key, duration in values.items() if accept or key not in regressed
+        })
+    finally:
+        baseline.close()
+
+    summary = summary or os.path.join(os.path.dirname(metrics_file), SUMMARY_FILE)
+    write_summary(results, summary, mode)
+    gated = sum(result["samples"] >= MIN_SAMPLES for result in results)
+    print(f"Performance gate: {len(regressed)} regression(s), {gated}/{len(results)} keys with a baseline; "
+          f"summary at {summary}")
+    for result in results:
+        if result["regressed"]:
+            print(f"  {'REGRESSION' if mode == 'fail' else 'warning'}: {result['kind']} {result['key']} "
+                  f"{result['duration']:.3f}s (p50 {result['p50']:.3f}s, p95 {result['p95']:.3f}s, z {result['z']:.1f})")
+    return 1 if regressed and mode == "fail" else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare a run's durations with the performance baseline")
+    parser.add_argument("metrics", nargs="?", default=DEFAULT_METRICS_FILE, help="performance_metrics.csv of the run")
+    parser.add_argument("--mode", choices=["fail", "warn"], default="fail")
+    parser.add_argument("--baseline", help=f"SQLite baseline file (default: framework cache {BASELINE_FILE})")
+    parser.add_argument("--accept", action="store_true", help="Record regressed durations as the new baseline")
+    args = parser.parse_args(argv)
+    return gate(args.metrics, args.mode, args.baseline, args.accept)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
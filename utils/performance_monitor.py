@@ -1,71 +1,253 @@
 # utils/performance_monitor.py
-import time
-from datetime import datetime
+import atexit
 import csv
+import glob
+import json
 import os
-from typing import Dict, List, Any
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+# Records kept in memory before they are appended to the worker's file
+FLUSH_EVERY = 1000
+
+# Record kinds
+_METRIC, _TIMING = 0, 1
+_NO_SUCCESS = -1
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Written to the JSONL files only; the CSV keeps its original columns
+_JSONL_ONLY_FIELDS = ("ts_ns", "worker")
+
+_encode = json.JSONEncoder(default=str).encode
+
+
+def worker_id() -> str:
+    """xdist worker id (gw0, gw1, ...) or 'main'"""
+    return os.environ.get('PYTEST_XDIST_WORKER', 'main')
+
+
+def run_id() -> str:
+    """
+    Identifier shared by the controller and its xdist workers (workers
+    inherit the environment), so a run's per-worker files can be found.
+    """
+    if 'PYPLAY_RUN_ID' not in os.environ:
+        os.environ['PYPLAY_RUN_ID'] = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    return os.environ['PYPLAY_RUN_ID']
+
 
 class PerformanceMonitor:
-    def __init__(self, output_file="performance_metrics.csv"):
-        self.metrics = []
-        self.output_file = os.path.join("reports", "performance", output_file)
+    """
+    Streaming metrics sink.
+
+    Records are timed with perf_counter_ns and buffered column-wise (arrays of
+    kinds, timestamps, values and success flags, plus name and metadata
+    lists); every FLUSH_EVERY records the buffer is appended to this
+    process's JSONL file (metrics-<run>-<worker>.jsonl) and cleared, so
+    memory stays flat however long the run is. save_metrics() flushes and,
+    outside xdist workers, merges every worker file of the run into
+    performance_metrics.jsonl and performance_metrics.csv.
+
+    start_timer(), end_timer() and the CSV columns are unchanged; the JSONL
+    records additionally carry ts_ns (epoch nanoseconds) and worker.
+    """
+
+    def __init__(self, output_file="performance_metrics.csv", flush_every: int = FLUSH_EVERY):
+        output_dir = os.environ.get('PERFORMANCE_DIR', os.path.join("reports", "performance"))
+        self.output_file = os.path.join(output_dir, output_file)
+        self.flush_every = flush_every
+        self.worker_file = os.path.join(output_dir, f"metrics-{run_id()}-{worker_id()}.jsonl")
         self.ensure_directory()
-    
+
+        # Wall-clock time of the first perf_counter_ns reading; timestamps
+        # are derived from the monotonic clock
+        self._epoch_ns = time.time_ns()
+        self._perf_ns = time.perf_counter_ns()
+
+        self._lock = threading.Lock()
+        self._names: List[str] = []
+        self._kinds = array('b')
+        self._timestamps = array('q')
+        self._values = array('d')
+        self._success = array('b')
+        self._metadata: List[Optional[Dict[str, Any]]] = []
+        self.recorded = 0
+        self.flushed = 0
+        atexit.register(self.flush)
+
     def ensure_directory(self):
         """Ensure the directory exists"""
         os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
-    
+
+    def _now_ns(self) -> int:
+        return self._epoch_ns + (time.perf_counter_ns() - self._perf_ns)
+
+    def _append(self, kind: int, name: str, value: float, success: int, metadata: Optional[Dict[str, Any]],
+                ts_ns: int) -> None:
+        with self._lock:
+            self._kinds.append(kind)
+            self._names.append(name)
+            self._timestamps.append(ts_ns)
+            self._values.append(value)
+            self._success.append(success)
+            self._metadata.append(metadata or None)
+            self.recorded += 1
+            if len(self._kinds) >= self.flush_every:
+                self._flush_locked()
+
     def start_timer(self, name: str) -> Dict[str, Any]:
         """Start timing an operation"""
         return {
             "name": name,
             "start_time": time.time(),
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "start_ns": time.perf_counter_ns(),
+            "timestamp": datetime.now().strftime(TIMESTAMP_FORMAT)
         }
-    
-    def end_timer(self, timer: Dict[str, Any], success: bool = True, metadata: Dict[str, Any] = None) -> None:
-        """End timing and record the metric"""
-        end_time = time.time()
-        duration = end_time - timer["start_time"]
-        
+
+    def end_timer(self, timer: Dict[str, Any], success: bool = True, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        End timing and record the metric. Timers made elsewhere only need
+        "name" and "start_ns" (perf_counter_ns) or "start_time" (time.time).
+        """
+        end_ns = time.perf_counter_ns()
+        if "start_ns" in timer:
+            duration_ns = end_ns - timer["start_ns"]
+        else:
+            duration_ns = int((time.time() - timer["start_time"]) * 1e9)
+        duration = duration_ns / 1e9
+        start_ts_ns = self._epoch_ns + (end_ns - self._perf_ns) - duration_ns
+        self._append(_TIMING, timer["name"], duration, int(success), metadata, start_ts_ns)
+
         metric = {
             "name": timer["name"],
             "duration": duration,
             "success": success,
-            "timestamp": timer["timestamp"]
+            "timestamp": timer.get("timestamp") or _format_timestamp(start_ts_ns)
         }
-        
         if metadata:
             metric.update(metadata)
-        
-        self.metrics.append(metric)
         return metric
-    
+
     def record_metric(self, name: str, value: float, metadata: Dict[str, Any] = None) -> None:
         """Record a metric without timing"""
-        metric = {
-            "name": name,
-            "value": value,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        if metadata:
-            metric.update(metadata)
-        
-        self.metrics.append(metric)
-    
-    def save_metrics(self) -> None:
-        """Save metrics to CSV file"""
-        if not self.metrics:
+        self._append(_METRIC, name, float(value), _NO_SUCCESS, metadata, self._now_ns())
+
+    @property
+    def metrics(self) -> List[Dict[str, Any]]:
+        """
+        Records of this process not merged yet, as metric dicts (read back
+        from its JSONL file, so this loads them all into memory). After
+        save_metrics() outside workers they are in performance_metrics.jsonl.
+        """
+        self.flush()
+        if not os.path.exists(self.worker_file):
+            return []
+        return [_csv_row(json.loads(line)) for line in _read_lines([self.worker_file])]
+
+    # Output
+
+    def _rows(self) -> Iterator[Dict[str, Any]]:
+        worker = worker_id()
+        for kind, name, ts_ns, value, success, metadata in zip(
+            self._kinds, self._names, self._timestamps, self._values, self._success, self._metadata
+        ):
+            row = {"name": name, "ts_ns": ts_ns, "worker": worker}
+            if kind == _TIMING:
+                row["duration"] = value
+            else:
+                row["value"] = value
+            if success != _NO_SUCCESS:
+                row["success"] = bool(success)
+            if metadata:
+                row.update(metadata)
+            yield row
+
+    def _flush_locked(self) -> None:
+        if not self._kinds:
             return
-        
-        # Get all possible field names
-        fieldnames = set()
-        for metric in self.metrics:
-            fieldnames.update(metric.keys())
-        
-        # Write to CSV
-        with open(self.output_file, 'w', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=sorted(fieldnames))
-            writer.writeheader()
-            writer.writerows(self.metrics)
\ No newline at end of file
+        lines = [_encode(row) for row in self._rows()]
+        with open(self.worker_file, 'a') as f:
+            f.write("\n".join(lines) + "\n")
+        self.flushed += len(lines)
+        for column in (self._kinds, self._timestamps, self._values, self._success):
+            del column[:]
+        self._names.clear()
+        self._metadata.clear()
+
+    def flush(self) -> None:
+        """Append buffered records to this process's JSONL file"""
+        with self._lock:
+            self._flush_locked()
+
+    def save_metrics(self) -> None:
+        """Flush; outside xdist workers also merge the run's worker files"""
+        self.flush()
+        if worker_id() == 'main':
+            merge_worker_files(os.path.dirname(self.output_file), self.output_file)
+
+
+def _format_timestamp(ts_ns: int) -> str:
+    return datetime.fromtimestamp(ts_ns / 1e9).strftime(TIMESTAMP_FORMAT)
+
+
+def _csv_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    """A JSONL record in the CSV's columns: timestamp instead of ts_ns/worker"""
+    row = {key: value for key, value in record.items() if key not in _JSONL_ONLY_FIELDS}
+    row["timestamp"] = _format_timestamp(record["ts_ns"])
+    return row
+
+
+def _read_lines(paths: List[str]) -> Iterator[str]:
+    for path in paths:
+        with open(path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield line
+
+
+def merge_worker_files(directory: str, csv_file: str, run: Optional[str] = None) -> int:
+    """
+    Merge the per-worker JSONL files of a run into <csv_file>.jsonl and
+    csv_file, streaming so memory does not grow with the number of records.
+    The worker files are removed afterwards. Returns the number of records.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, f"metrics-{run or run_id()}-*.jsonl")))
+    if not paths:
+        return 0
+
+    # First pass: CSV columns; second pass: rows
+    fieldnames = {"timestamp"}
+    count = 0
+    jsonl_file = os.path.splitext(csv_file)[0] + ".jsonl"
+    with open(jsonl_file, 'w') as out:
+        for line in _read_lines(paths):
+            fieldnames.update(json.loads(line))
+            out.write(line)
+            count += 1
+    fieldnames.difference_update(_JSONL_ONLY_FIELDS)
+
+    with open(csv_file, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=sorted(fieldnames))
+        writer.writeheader()
+        for record in map(json.loads, _read_lines([jsonl_file])):
+            writer.writerow(_csv_row(record))
+
+    for path in paths:
+        os.remove(path)
+    return count
+
+
+# Process-wide monitor shared by fixtures, plugins and page objects
+_performance_monitor = None
+
+
+def get_performance_monitor() -> PerformanceMonitor:
+    """Return the shared PerformanceMonitor for this process"""
+    global _performance_monitor
+    if _performance_monitor is None:
+        _performance_monitor = PerformanceMonitor()
+    return _performance_monitor
@@ -0,0 +1,123 @@
+# utils/platform_filter.py
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+PLATFORMS = ("web", "mobile", "api")
+
+# Collectors whose own collect step is timed
+TIMED_COLLECTORS = (pytest.File, getattr(pytest, "Directory", pytest.Package))
+
+# Directories whose <platform> subdirectories only hold that platform's
+# step modules / feature files
+PLATFORM_ROOTS = ("steps", "features")
+
+# config.cache key holding {path relative to rootdir: seconds to collect}
+# for every directory (conftest import, listing) and module (import)
+COLLECT_DURATIONS_KEY = "pyplay/collect_durations"
+
+
+def matches_platform(nodeid: str, platform: str) -> bool:
+    """Whether a collected test belongs to the selected platform"""
+    return f"/{platform}/" in nodeid or f"{platform}_" in nodeid
+
+
+class PlatformFilter:
+    """
+    Keeps tests for other platforms out of the run entirely.
+
+    * steps/<platform> and features/<platform> directories of the other
+      platforms are never imported (pytest_ignore_collect);
+    * collected items that still don't match --platform are deselected
+      (pytest_deselected) instead of skipped, so they are not set up, shipped
+      to xdist workers or written to reports.
+
+    Directory and module collection times are remembered in the pytest cache so the
+    time saved by pruning can be reported.
+    """
+
+    def __init__(self, config, platform: str):
+        self.config = config
+        self.platform = platform
+        self.rootdir = Path(str(config.rootpath))
+        self.pruned: List[Path] = []
+        self.deselected = 0
+        self._durations: Dict[str, float] = {}
+        self._history: Optional[Dict[str, float]] = None
+
+    def _other_platform_dir(self, path: Path) -> bool:
+        try:
+            parts = path.relative_to(self.rootdir).parts
+        except ValueError:
+            return False
+        return (
+            len(parts) >= 2 and parts[0] in PLATFORM_ROOTS
+            and parts[1] in PLATFORMS and parts[1] != self.platform
+        )
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_ignore_collect(self, collection_path: Path, config):
+        if self._other_platform_dir(collection_path):
+            # Directories are pruned as a whole; their contents are never visited
+            self.pruned.append(collection_path)
+            return True
+        return None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_make_collect_report(self, collector):
+        if not isinstance(collector, TIMED_COLLECTORS):
+            yield
+            return
+        start = time.perf_counter()
+        yield
+        self._durations[self._relpath(collector.path)] = time.perf_counter() - start
+
+    def _relpath(self, path) -> str:
+        try:
+            return Path(path).relative_to(self.rootdir).as_posix()
+        except ValueError:
+            return str(path)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        selected, deselected = [], []
+        for item in items:
+            (selected if matches_platform(item.nodeid, self.platform) else deselected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        self.deselected = len(deselected)
+
+    def history(self) -> Dict[str, float]:
+        if self._history is None:
+            cache = getattr(self.config, "cache", None)
+            self._history = dict(cache.get(COLLECT_DURATIONS_KEY, {})) if cache is not None else {}
+        return self._history
+
+    def time_saved(self) -> float:
+        """Collection time the pruned paths took when they were last collected"""
+        prefixes = [self._relpath(path) for path in self.pruned]
+        return sum(
+            seconds for module, seconds in self.history().items()
+            if any(module == prefix or module.startswith(prefix + "/") for prefix in prefixes)
+        )
+
+    def pytest_report_collectionfinish(self, config, start_path, items):
+        if not (self.pruned or self.deselected):
+            return None
+        line = (f"platform filter ({self.platform}): {len(self.pruned)} path(s) not imported, "
+                f"{self.deselected} item(s) deselected")
+        saved = self.time_saved()
+        if saved:
+            line += f", ~{saved:.2f}s collection saved"
+        return line
+
+    def pytest_collection_finish(self, session):
+        cache = getattr(self.config, "cache", None)
+        if cache is not None and self._durations:
+            cache.set(COLLECT_DURATIONS_KEY, {**self.history(), **self._durations})
@@ -0,0 +1,266 @@
+# utils/report_merger.py
+"""
+Combine the outputs of `run_tests.py --shard i/N` runs into one report.
+
+Each shard directory (reports/shards/shard-<i>-of-<N>, copied back from its
+CI node) holds:
+
+  shard.json              manifest written by the shard plugin
+  junit.xml               JUnit XML results
+  allure_reports/         Allure results (with --report allure)
+  performance/*.csv       PerformanceMonitor metrics
+  logs/*.log              framework logs
+
+`merge` checks that the manifests describe disjoint shards of the same
+collection, then writes the merged JUnit XML, Allure results, performance
+CSVs, logs, an HTML summary and a durations.json to use as --shard-weights
+for the next run.
+"""
+import argparse
+import csv
+import glob
+import html
+import json
+import os
+import shutil
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_SHARDS_GLOB = os.path.join("reports", "shards", "shard-*")
+DEFAULT_OUTPUT_DIR = os.path.join("reports", "merged")
+
+MANIFEST_FILE = "shard.json"
+JUNIT_FILE = "junit.xml"
+ALLURE_DIR = "allure_reports"
+PERFORMANCE_DIR = "performance"
+LOG_DIR = "logs"
+
+JUNIT_COUNTERS = ("tests", "failures", "errors", "skipped")
+
+
+def shard_dir(index: int, total: int, base: str = os.path.join("reports", "shards")) -> str:
+    """Output directory of one shard"""
+    return os.path.join(base, f"shard-{index}-of-{total}")
+
+
+def load_manifests(shard_dirs: List[Path]) -> Dict[Path, dict]:
+    manifests = {}
+    for directory in shard_dirs:
+        try:
+            with open(directory / MANIFEST_FILE, 'r') as f:
+                manifests[directory] = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"warning: no usable {MANIFEST_FILE} in {directory}: {e}")
+    return manifests
+
+
+def check_manifests(manifests: Dict[Path, dict]) -> List[str]:
+    """Problems that mean the shards do not cover the suite exactly once"""
+    if not manifests:
+        return ["no shard manifests found"]
+    problems = []
+    totals = {manifest["total"] for manifest in manifests.values()}
+    digests = {manifest["collection_digest"] for manifest in manifests.values()}
+    weights = {manifest["weights_digest"] for manifest in manifests.values()}
+    if len(totals) > 1:
+        problems.append(f"shards were run with different shard counts: {sorted(totals)}")
+    if len(digests) > 1:
+        problems.append("shards collected different tests (different checkouts or options)")
+    if len(weights) > 1:
+        problems.append("shards used different duration weights; pass the same --shard-weights file to every shard")
+
+    total = max(totals)
+    present = sorted(manifest["shard"] for manifest in manifests.values())
+    missing = sorted(set(range(1, total + 1)) - set(present))
+    if missing:
+        problems.append(f"missing shards: {', '.join(map(str, missing))} of {total}")
+
+    owners = defaultdict(list)
+    for manifest in manifests.values():
+        for nodeid in manifest["tests"]:
+            owners[nodeid].append(manifest["shard"])
+    overlapping = {nodeid: shards for nodeid, shards in owners.items() if len(shards) > 1}
+    if overlapping:
+        problems.append(f"{len(overlapping)} tests ran on more than one shard, e.g. "
+                        + ", ".join(f"{nodeid} ({shards})" for nodeid, shards in list(overlapping.items())[:3]))
+    if not missing and len(digests) == 1:
+        collected = next(iter(manifests.values()))["collected"]
+        if len(owners) != collected:
+            problems.append(f"shards ran {len(owners)} distinct tests out of {collected} collected")
+    return problems
+
+
+def merge_junit(shard_dirs: List[Path], output: Path) -> List[dict]:
+    """Merge JUnit XML files into a single testsuite; returns the test cases"""
+    merged = ET.Element("testsuite", name="pytest")
+    totals = defaultdict(float)
+    cases = []
+    for directory in shard_dirs:
+        path = directory / JUNIT_FILE
+        if not path.exists():
+            continue
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+        for suite in suites:
+            for counter in JUNIT_COUNTERS + ("time",):
+                totals[counter] += float(suite.get(counter, 0))
+            for case in suite.findall("testcase"):
+                case.set("shard", directory.name)
+                merged.append(case)
+                outcome = next((child.tag for child in case if child.tag in ("failure", "error", "skipped")), "passed")
+                cases.append({
+                    "name": f"{case.get('classname', '')}::{case.get('name', '')}",
+                    "time": float(case.get("time", 0)),
+                    "outcome": outcome,
+                    "shard": directory.name,
+                })
+    for counter in JUNIT_COUNTERS:
+        merged.set(counter, str(int(totals[counter])))
+    merged.set("time", f"{totals['time']:.3f}")
+
+    suites = ET.Element("testsuites")
+    suites.append(merged)
+    ET.ElementTree(suites).write(output / JUNIT_FILE, encoding="utf-8", xml_declaration=True)
+    return cases
+
+
+def merge_allure(shard_dirs: List[Path], output: Path) -> int:
+    """Copy every shard's Allure results into one results directory"""
+    target = output / ALLURE_DIR
+    copied = 0
+    for directory in shard_dirs:
+        source = directory / ALLURE_DIR
+        if not source.is_dir():
+            continue
+        target.mkdir(parents=True, exist_ok=True)
+        for path in source.iterdir():
+            # Result files are uuid-named; shared files (environment, categories) are identical
+            if path.is_file():
+                shutil.copy2(path, target / path.name)
+                copied += 1
+    return copied
+
+
+def merge_performance(shard_dirs: List[Path], output: Path) -> int:
+    """Concatenate the shards' metric CSVs per file name, tagging rows with their shard"""
+    rows_by_file = defaultdict(list)
+    for directory in shard_dirs:
+        for path in sorted((directory / PERFORMANCE_DIR).glob("*.csv")):
+            with open(path, 'r', newline='') as f:
+                for row in csv.DictReader(f):
+                    row["shard"] = directory.name
+                    rows_by_file[path.name].append(row)
+
+    for name, rows in rows_by_file.items():
+        fieldnames = sorted({key for row in rows for key in row})
+        (output / PERFORMANCE_DIR).mkdir(parents=True, exist_ok=True)
+        with open(output / PERFORMANCE_DIR / name, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+    return sum(len(rows) for rows in rows_by_file.values())
+
+
+def merge_logs(shard_dirs: List[Path], output: Path) -> int:
+    """Concatenate the shards' log files per file name, with a header per shard"""
+    merged = 0
+    for directory in shard_dirs:
+        for path in sorted((directory / LOG_DIR).glob("*.log*")):
+            (output / LOG_DIR).mkdir(parents=True, exist_ok=True)
+            with open(output / LOG_DIR / path.name, 'a') as target, open(path, 'r', errors='replace') as source:
+                target.write(f"===== {directory.name} =====\n")
+                shutil.copyfileobj(source, target)
+            merged += 1
+    return merged
+
+
+def merge_durations(manifests: Dict[Path, dict], output: Path) -> int:
+    """Write the measured durations in DurationHistory format, for --shard-weights"""
+    durations = {}
+    for manifest in manifests.values():
+        durations.update(manifest.get("durations", {}))
+    with open(output / "durations.json", 'w') as f:
+        json.dump({"durations": durations, "groups": {}}, f, indent=1, sort_keys=True)
+    return len(durations)
+
+
+def write_summary(cases: List[dict], manifests: Dict[Path, dict], problems: List[str], output: Path) -> None:
+    """Small self-contained HTML overview of the merged run"""
+    counts = defaultdict(int)
+    for case in cases:
+        counts[case["outcome"]] += 1
+    shard_rows = "".join(
+        f"<tr><td>{html.escape(directory.name)}</td><td>{len(manifest['tests'])}</td>"
+        f"<td>{manifest.get('predicted', 0):.1f}s</td><td>{sum(manifest.get('durations', {}).values()):.1f}s</td></tr>"
+        for directory, manifest in sorted(manifests.items(), key=lambda item: item[1]["shard"])
+    )
+    case_rows = "".join(
+        f"<tr class='{case['outcome']}'><td>{html.escape(case['name'])}</td><td>{case['outcome']}</td>"
+        f"<td>{case['time']:.2f}s</td><td>{html.escape(case['shard'])}</td></tr>"
+        for case in sorted(cases, key=lambda case: (case["outcome"] == "passed", case["name"]))
+    )
+    problem_items = "".join(f"<li>{html.escape(problem)}</li>" for problem in problems)
+    page = f"""<!doctype html>
+<html><head><meta charset="utf-8"><title>Merged test report</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin-bottom: 2em; }}
+td, th {{ border: 1px solid #ccc; padding: 4px 8px; text-align: left; }}
+.failure, .error {{ background: #fdd; }} .skipped {{ background: #ffd; }}
+</style></head><body>
+<h1>Merged test report</h1>
+<p>{len(cases)} tests: {counts['passed']} passed, {counts['failure']} failed, {counts['error']} errors, {counts['skipped']} skipped</p>
+{f'<h2>Problems</h2><ul>{problem_items}</ul>' if problems else ''}
+<h2>Shards</h2>
+<table><tr><th>Shard</th><th>Tests</th><th>Predicted</th><th>Measured</th></tr>{shard_rows}</table>
+<h2>Tests</h2>
+<table><tr><th>Test</th><th>Outcome</th><th>Time</th><th>Shard</th></tr>{case_rows}</table>
+</body></html>
+"""
+    with open(output / "report.html", 'w') as f:
+        f.write(page)
+
+
+def merge(shard_dirs: List[Path], output: Path, generate_allure: bool = True) -> int:
+    if output.exists():
+        shutil.rmtree(output)
+    output.mkdir(parents=True)
+
+    manifests = load_manifests(shard_dirs)
+    problems = check_manifests(manifests)
+    cases = merge_junit(shard_dirs, output)
+    allure_files = merge_allure(shard_dirs, output)
+    metrics = merge_performance(shard_dirs, output)
+    logs = merge_logs(shard_dirs, output)
+    durations = merge_durations(manifests, output)
+    write_summary(cases, manifests, problems, output)
+
+    print(f"Merged {len(shard_dirs)} shards into {output}: {len(cases)} test cases, "
+          f"{allure_files} Allure files, {metrics} metric rows, {logs} log files, {durations} durations")
+    if allure_files and generate_allure and shutil.which("allure"):
+        subprocess.run(["allure", "generate", str(output / ALLURE_DIR), "--clean", "-o", str(output / "allure_html")])
+    for problem in problems:
+        print(f"ERROR: {problem}")
+    return 1 if problems else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="run_tests.py merge", description="Merge sharded test run outputs")
+    parser.add_argument("shards", nargs="*", help=f"Shard output directories (default: {DEFAULT_SHARDS_GLOB})")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="Directory for the merged report")
+    parser.add_argument("--no-allure-generate", action="store_true", help="Only merge Allure results")
+    args = parser.parse_args(argv)
+
+    shard_dirs = sorted(Path(path) for path in (args.shards or glob.glob(DEFAULT_SHARDS_GLOB)) if Path(path).is_dir())
+    if not shard_dirs:
+        print("No shard directories found")
+        return 1
+    return merge(shard_dirs, Path(args.output), generate_allure=not args.no_allure_generate)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
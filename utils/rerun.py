@@ -0,0 +1,208 @@
+# utils/rerun.py
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+import pytest
+from _pytest.runner import runtestprotocol
+
+from utils.cache import atomic_write_bytes, cache_path
+
+logger = logging.getLogger(__name__)
+
+FLAKY_STORE_FILE = "flaky-tests.json"
+
+# Outcome codes kept per test, newest last
+PASSED, PASSED_ON_RETRY, FAILED, SKIPPED_QUARANTINED = "P", "R", "F", "S"
+OUTCOME_NAMES = {PASSED: "passed", PASSED_ON_RETRY: "passed", FAILED: "failed", SKIPPED_QUARANTINED: "skipped"}
+
+# Runs remembered per test, and how many of them must have passed only on
+# retry for the test to be quarantined
+HISTORY_WINDOW = 20
+QUARANTINE_MIN_FLAKY = 3
+
+# With skip_flaky_tests, a quarantined test runs again after being skipped
+# this many runs in a row, so its history keeps moving
+QUARANTINE_MAX_SKIPS = 5
+
+QUARANTINE_MARKER = "quarantined"
+
+# config.workeroutput key workers send their {nodeid: outcome record} under
+WORKEROUTPUT_OUTCOMES = "pyplay_rerun_outcomes"
+
+
+class FlakyStore:
+    """
+    Per-test outcome history (passed / passed on retry / failed) and the step
+    a test last failed at, stored as JSON in the framework cache.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else cache_path(FLAKY_STORE_FILE)
+        self.tests: Dict[str, dict] = self._read()
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, 'r') as f:
+                return dict(json.load(f).get("tests", {}))
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def history(self, nodeid: str) -> str:
+        return self.tests.get(nodeid, {}).get("history", "")
+
+    def last_failed(self, nodeid: str) -> bool:
+        return self.history(nodeid).endswith(FAILED)
+
+    def is_chronically_flaky(self, nodeid: str) -> bool:
+        history = self.history(nodeid)
+        if history.endswith(SKIPPED_QUARANTINED * QUARANTINE_MAX_SKIPS):
+            return False
+        return history.count(PASSED_ON_RETRY) >= QUARANTINE_MIN_FLAKY
+
+    def record(self, nodeid: str, outcome: str, failed_step: Optional[str] = None) -> None:
+        entry = self.tests.setdefault(nodeid, {})
+        entry["history"] = (entry.get("history", "") + outcome)[-HISTORY_WINDOW:]
+        if failed_step:
+            entry["failed_step"] = failed_step
+
+    def save(self) -> None:
+        # Keep tests recorded by other runs since this store was read
+        tests = {**self._read(), **self.tests}
+        try:
+            atomic_write_bytes(self.path, json.dumps({"tests": tests}, indent=1, sort_keys=True).encode())
+        except OSError as e:
+            logger.warning(f"Could not save flaky test history: {e}")
+
+
+class _SameParent:
+    """
+    Stands in for the next item between attempts: teardown stops at the
+    test's parent, so only the test's own (function-scoped) fixtures are
+    finalized and everything of wider scope stays set up for the retry.
+    """
+
+    def __init__(self, item):
+        self.item = item
+        self.nodeid = item.nodeid
+
+    def listchain(self):
+        return self.item.listchain()[:-1]
+
+
+class RerunPlugin:
+    """
+    Retries failed tests in-process and keeps flakiness statistics.
+
+    A retry runs the test protocol again with only function-scoped fixtures
+    torn down in between, so session resources (the warm browser pool, auth
+    state, ...) are reused. For a scenario this means starting over from its
+    Background with a fresh page. Only the last attempt's reports are logged,
+    so JUnit XML and the terminal see each test once; the number of reruns is
+    listed in the terminal summary.
+
+    Tests that failed last time run first. Tests that keep passing only on
+    retry are quarantined: marked, moved to the end of the run (a separate
+    low-priority batch for the xdist scheduler) and reported separately, or
+    skipped with feature_flags.skip_flaky_tests. Skipped runs are recorded,
+    and after QUARANTINE_MAX_SKIPS of them in a row the test runs again.
+    """
+
+    def __init__(self, config, max_retries: int = 0, skip_quarantined: bool = False):
+        self.config = config
+        self.max_retries = max_retries
+        self.skip_quarantined = skip_quarantined
+        self.store = FlakyStore()
+        self.quarantined: Set[str] = {
+            nodeid for nodeid in self.store.tests if self.store.is_chronically_flaky(nodeid)
+        }
+        self.outcomes: Dict[str, dict] = {}
+        self._failed_steps: Dict[str, str] = {}
+
+    @property
+    def is_worker(self) -> bool:
+        return hasattr(self.config, "workerinput")
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        failed_first, regular, quarantined = [], [], []
+        for item in items:
+            if item.nodeid in self.quarantined:
+                item.add_marker(QUARANTINE_MARKER)
+                if self.skip_quarantined:
+                    item.add_marker(pytest.mark.skip(reason="quarantined as flaky (feature_flags.skip_flaky_tests)"))
+                quarantined.append(item)
+            elif self.store.last_failed(item.nodeid):
+                failed_first.append(item)
+            else:
+                regular.append(item)
+        items[:] = failed_first + regular + quarantined
+
+    def pytest_bdd_step_error(self, request, feature, scenario, step, step_func, step_func_args, exception):
+        where = "Background" if step.background is not None else scenario.name
+        self._failed_steps[request.node.nodeid] = f"{step.keyword} {step.name} ({where}, line {step.line_number})"
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            reports = runtestprotocol(item, log=False, nextitem=nextitem if last_attempt else _SameParent(item))
+            failed = [report for report in reports if report.failed]
+            if failed and not last_attempt and not item.session.shouldstop:
+                # None of the attempt's reports are logged: any setup/teardown
+                # report would open or close a JUnit testcase of its own
+                logger.info(f"Retrying {item.nodeid} ({attempt + 1}/{self.max_retries}) after it failed "
+                            f"at {self._failed_steps.get(item.nodeid, failed[0].when)}")
+                continue
+            for report in reports:
+                item.ihook.pytest_runtest_logreport(report=report)
+            break
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+
+        if failed:
+            outcome = FAILED
+        elif any(report.skipped for report in reports):
+            # Skipped runs say nothing about flakiness; quarantined ones are
+            # recorded so the quarantine expires
+            if not (self.skip_quarantined and item.nodeid in self.quarantined):
+                return True
+            outcome = SKIPPED_QUARANTINED
+        else:
+            outcome = PASSED_ON_RETRY if attempt else PASSED
+        self.outcomes[item.nodeid] = {
+            "outcome": outcome, "failed_step": self._failed_steps.get(item.nodeid), "reruns": attempt
+        }
+        return True
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        self.outcomes.update(getattr(node, "workeroutput", {}).get(WORKEROUTPUT_OUTCOMES, {}))
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker:
+            self.config.workeroutput[WORKEROUTPUT_OUTCOMES] = self.outcomes
+            return
+        if not self.outcomes:
+            return
+        for nodeid, result in self.outcomes.items():
+            self.store.record(nodeid, result["outcome"], result.get("failed_step"))
+        self.store.save()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        rerun = sorted(nodeid for nodeid, result in self.outcomes.items() if result.get("reruns"))
+        quarantined = sorted(nodeid for nodeid in self.outcomes if nodeid in self.quarantined)
+        if not (rerun or quarantined):
+            return
+        terminalreporter.write_sep("-", "flaky tests")
+        for nodeid in rerun:
+            result = self.outcomes[nodeid]
+            verdict = "passed" if result["outcome"] == PASSED_ON_RETRY else "failed"
+            terminalreporter.write_line(f"{verdict} after {result['reruns']} rerun(s): {nodeid}")
+        for nodeid in quarantined:
+            outcome = self.outcomes[nodeid]["outcome"]
+            terminalreporter.write_line(
+                f"quarantined ({self.store.history(nodeid)[-10:]}): {nodeid} "
+                f"{OUTCOME_NAMES[outcome]}"
+            )
@@ -0,0 +1,39 @@
+# utils/selector_cache.py
+import json
+import os
+from typing import Any
+
+import yaml
+
+from utils.cache import FileSnapshotCache
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+def parse_selector_file(file_path: str) -> Any:
+    """Parse a JSON or YAML selector file"""
+    with open(file_path, 'r') as file:
+        if file_path.lower().endswith('.json'):
+            return json.load(file)
+        return yaml.load(file, Loader=SafeLoader)
+
+
+class SelectorFileCache(FileSnapshotCache):
+    """
+    Snapshot of parsed selector files (see FileSnapshotCache), one per
+    selector directory. Set SELECTOR_CACHE=false to always parse.
+    """
+    magic = b"PYPLSEL2"
+
+    def __init__(self, name: str):
+        super().__init__(
+            f"selectors-{name}.snapshot",
+            enabled=os.environ.get('SELECTOR_CACHE', 'true').lower() == 'true'
+        )
+
+    def parse(self, file_path: str) -> Any:
+        return parse_selector_file(file_path)
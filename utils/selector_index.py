@@ -0,0 +1,171 @@
+# utils/selector_index.py
+import re
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+# Regex to parse {file > key} syntax
+SELECTOR_KEY_REGEX = re.compile(r"\{(.*?)\s*>\s*(.*?)\}")
+
+DEFAULT_LOCATOR_TYPE = "css selector"
+
+# Size of the LRU front used for keys that are not in canonical "{file > key}" form
+DYNAMIC_CACHE_SIZE = 4096
+
+
+def canonical_key(file_key: str, element_key: str) -> str:
+    """Build the canonical '{file > key}' string for a selector"""
+    return sys.intern(f"{{{file_key} > {element_key}}}")
+
+
+def compile_locator(file_key: str, element_key: str, locator_data: Any) -> Tuple[str, str]:
+    """Convert a raw selector entry into a (type, value) locator tuple"""
+    if isinstance(locator_data, str):
+        # Assume default type is 'css selector' if only string is provided
+        return (DEFAULT_LOCATOR_TYPE, sys.intern(locator_data))
+    if isinstance(locator_data, dict) and 'value' in locator_data:
+        # Use specified type or default to 'css selector'
+        locator_type = str(locator_data.get('type', DEFAULT_LOCATOR_TYPE)).lower()
+        return (sys.intern(locator_type), locator_data['value'])
+    raise TypeError(f"Unsupported locator format for '{file_key} > {element_key}' in {file_key}.yaml")
+
+
+# Selenium-style locator types -> Playwright selector engines
+PLAYWRIGHT_SELECTOR_FORMATS = {
+    "css selector": "{}",
+    "css": "{}",
+    "id": "id={}",
+    "name": "[name=\"{}\"]",
+    "xpath": "xpath={}",
+    "class name": ".{}",
+    "tag name": "{}",
+    "link text": "a:text-is(\"{}\")",
+    "partial link text": "a:has-text(\"{}\")",
+}
+
+
+def playwright_selector(locator: Tuple[str, str]) -> str:
+    """Convert a (type, value) locator tuple into a Playwright selector string"""
+    locator_type, value = locator
+    try:
+        return PLAYWRIGHT_SELECTOR_FORMATS[locator_type].format(value)
+    except KeyError:
+        raise ValueError(f"Locator type '{locator_type}' has no Playwright equivalent") from None
+
+
+def compile_page(file_key: str, page_data: Any) -> Dict[str, Tuple[str, str]]:
+    """Precompute canonical key -> locator tuple entries for one selector file"""
+    entries = {}
+    if not isinstance(page_data, dict):
+        return entries
+    for element_key, locator_data in page_data.items():
+        try:
+            entries[canonical_key(file_key, str(element_key))] = compile_locator(file_key, element_key, locator_data)
+        except TypeError:
+            # Left out of the index; the slow path raises a descriptive error on lookup
+            continue
+    return entries
+
+
+class SelectorIndex:
+    """
+    Read-only '{file > key}' -> (type, value) index shared for the session.
+
+    Pages are compiled the first time one of their keys is resolved (or all
+    at once through preload()), so a lazy selector registry only parses the
+    files a run actually touches.
+    """
+
+    def __init__(self, selectors: Mapping[str, Any]):
+        self._selectors = selectors
+        self._locators: Dict[str, Tuple[str, str]] = {}
+        self._page_keys: Dict[str, frozenset] = {}
+        self._view = MappingProxyType(self._locators)
+        self._resolve_dynamic = lru_cache(maxsize=DYNAMIC_CACHE_SIZE)(self._resolve_slow)
+
+        # Registries that support hot reload tell us which page changed
+        add_listener = getattr(selectors, "add_listener", None)
+        if add_listener is not None:
+            add_listener(self.invalidate_page)
+
+    def __len__(self):
+        return len(self._locators)
+
+    def __contains__(self, selector_key_string):
+        return selector_key_string in self._locators
+
+    @property
+    def locators(self) -> Mapping[str, Tuple[str, str]]:
+        """Read-only view of the compiled entries"""
+        return self._view
+
+    def preload(self) -> "SelectorIndex":
+        """Compile every page up front"""
+        for file_key in list(self._selectors):
+            self._compile_page(file_key)
+        return self
+
+    def _compile_page(self, file_key: str) -> None:
+        if file_key in self._page_keys:
+            return
+        entries = compile_page(file_key, self._selectors[file_key])
+        self._locators.update(entries)
+        self._page_keys[file_key] = frozenset(entries)
+
+    def invalidate_page(self, file_key: Optional[str] = None) -> None:
+        """
+        Drop cached entries after a page (or, with None, every page) changed.
+
+        A page that was compiled is recompiled right away and its entries are
+        replaced in place, so keys that still exist never disappear mid-run.
+        """
+        file_keys = list(self._page_keys) if file_key is None else [file_key]
+        for key in file_keys:
+            old_keys = self._page_keys.pop(key, None)
+            if old_keys is None:
+                continue
+            entries = {}
+            if key in self._selectors:
+                entries = compile_page(key, self._selectors[key])
+                self._page_keys[key] = frozenset(entries)
+            self._locators.update(entries)
+            for stale_key in old_keys - entries.keys():
+                self._locators.pop(stale_key, None)
+        self._resolve_dynamic.cache_clear()
+
+    def resolve(self, selector_key_string: str) -> Tuple[str, str]:
+        """Resolve a '{file > key}' string into a locator tuple (type, value)"""
+        locator = self._locators.get(selector_key_string)
+        if locator is not None:
+            return locator
+        return self._resolve_dynamic(selector_key_string)
+
+    __call__ = resolve
+
+    def cache_info(self):
+        """Return hit/miss statistics of the dynamic-key LRU front"""
+        return self._resolve_dynamic.cache_info()
+
+    def _resolve_slow(self, selector_key_string: str) -> Tuple[str, str]:
+        """Parse a non-canonical key, mirroring the original resolver's errors"""
+        match = SELECTOR_KEY_REGEX.match(selector_key_string)
+        if not match:
+            raise ValueError(f"Invalid selector format: '{selector_key_string}'. Expected '{{file > key}}'")
+
+        file_key, element_key = match.groups()
+
+        if file_key not in self._page_keys and file_key in self._selectors:
+            self._compile_page(file_key)
+            locator = self._locators.get(canonical_key(file_key, element_key))
+            if locator is not None:
+                return locator
+
+        try:
+            locator_data = self._selectors[file_key][element_key]
+        except KeyError:
+            raise KeyError(f"Selector key '{element_key}' not found in '{file_key}.yaml' or file '{file_key}' not loaded/found.")
+        except TypeError:
+            raise TypeError(f"File key '{file_key}' (from {file_key}.yaml) does not seem to contain valid selector data or was not loaded correctly.")
+
+        return compile_locator(file_key, element_key, locator_data)
@@ -8,6 +8,8 @@ from typing import Dict, Any
 import asyncio
 import time
 from utils.logger import get_logger
+from utils.selector_registry import SelectorRegistry
+from utils.selector_watcher import SelectorWatcher
 
 # Get a logger for this module
 logger = get_logger()
@@ -15,7 +17,7 @@ logger = get_logger()
 
 class SelectorLoader:
     _instance = None
-    _selectors: Dict[str, Any] = None
+    _selectors: SelectorRegistry = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -24,88 +26,29 @@ class SelectorLoader:
         return cls._instance
     
     def _load_selectors(self):
-        """Load all selectors from multiple configuration files with environment suffix"""
-        # logger = logging.getLogger(__name__)
+        """
+        Return the shared registry for selectors/*_<env>.json|yaml|yml.
+        Pages are parsed lazily on first access, not here.
+        """
         selectors_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "selectors")
         environment = os.environ.get('ENV', 'dev')
-        
-        # Dictionary to store all selectors
-        all_selectors = {}
-        
-        # Find all JSON files with environment suffix
-        json_pattern = os.path.join(selectors_dir, f"*_{environment}.json")
-        json_files = glob.glob(json_pattern)
-        
-        # Find all YAML files with environment suffix
-        yaml_pattern1 = os.path.join(selectors_dir, f"*_{environment}.yaml")
-        yaml_pattern2 = os.path.join(selectors_dir, f"*_{environment}.yml")
-        yaml_files = glob.glob(yaml_pattern1) + glob.glob(yaml_pattern2)
-        
-        # Combine all selector files
-        all_files = json_files + yaml_files
-        
-        if not all_files:
-            logger.warning(f"No selector files matching *_{environment}.json or *_{environment}.yaml/yml found in {selectors_dir}")
-            
-            # Fallback to a single selectors file if it exists
-            for fallback_file in ["selectors.json", "selectors.yaml", "selectors.yml"]:
-                default_file = os.path.join(selectors_dir, fallback_file)
-                if os.path.exists(default_file):
-                    logger.info(f"Using fallback selector file: {default_file}")
-                    try:
-                        with open(default_file, 'r') as file:
-                            if fallback_file.endswith('.json'):
-                                return json.load(file)
-                            else:
-                                return yaml.safe_load(file)
-                    except Exception as e:
-                        logger.error(f"Error loading fallback file {fallback_file}: {str(e)}")
-            
-            return {}
-        
-        # Load each file and merge into all_selectors
-        for file_path in all_files:
-            try:
-                file_name = os.path.basename(file_path)
-                file_extension = os.path.splitext(file_name)[1].lower()
-                
-                # Get page name by removing environment suffix and extension
-                page_name = file_name.replace(f"_{environment}{file_extension}", "")
-                
-                logger.info(f"Loading selectors for '{page_name}' from {file_name}")
-                
-                with open(file_path, 'r') as file:
-                    # Parse based on file extension
-                    if file_extension == '.json':
-                        selectors = json.load(file)
-                    else:  # .yaml or .yml
-                        selectors = yaml.safe_load(file)
-                    
-                    # If the file already has a top-level key structure, use it directly
-                    if isinstance(selectors, dict) and len(selectors) == 1 and page_name in selectors:
-                        all_selectors[page_name] = selectors[page_name]
-                    else:
-                        # Otherwise, use the entire file content for this page
-                        all_selectors[page_name] = selectors
-                        
-            except (json.JSONDecodeError, yaml.YAMLError):
-                logger.error(f"Error decoding {file_extension} from {file_path}")
-            except Exception as e:
-                logger.error(f"Error loading selector file {file_path}: {str(e)}")
-        
-        return all_selectors
+        return SelectorRegistry.for_directory(selectors_dir, environment=environment, cache_name=f"selectors-{environment}")
     
     def get_selectors(self, page_name):
         """Get selectors for a specific page"""
-        if not self._selectors:
+        if self._selectors is None:
             return {}
-        return self._selectors.get(page_name, {})
+        return self._selectors.get_selectors(page_name)
     
     def reload_selectors(self):
-        """Reload all selectors (useful during development)"""
-        self._selectors = self._load_selectors()
+        """Reload all selectors (useful during development); see watch() for per-file reloads"""
+        self._selectors.reload()
         return self._selectors
     
+    def watch(self, poll_interval=0.5):
+        """Start hot-reloading changed selector files; call stop() on the returned watcher"""
+        return SelectorWatcher([self._selectors], poll_interval=poll_interval).start()
+    
     def list_available_pages(self):
         """List all available page names in the selector configuration"""
         return list(self._selectors.keys()) if self._selectors else []
@@ -141,19 +84,13 @@ class SelectorLoader:
     
     def get_file_sources(self):
         """Return information about what files were loaded (for debugging)"""
-        selectors_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "selectors")
-        environment = os.environ.get('ENV', 'dev')
-        
-        json_pattern = os.path.join(selectors_dir, f"*_{environment}.json")
-        yaml_pattern1 = os.path.join(selectors_dir, f"*_{environment}.yaml")
-        yaml_pattern2 = os.path.join(selectors_dir, f"*_{environment}.yml")
-        
-        json_files = glob.glob(json_pattern)
-        yaml_files = glob.glob(yaml_pattern1) + glob.glob(yaml_pattern2)
+        registry = self._selectors
+        files = sorted(set(os.path.basename(path) for path in registry.sources.values()))
         
         return {
-            "environment": environment,
-            "json_files": [os.path.basename(f) for f in json_files],
-            "yaml_files": [os.path.basename(f) for f in yaml_files],
-            "selectors_directory": selectors_dir
+            "environment": registry.environment,
+            "json_files": [f for f in files if f.endswith('.json')],
+            "yaml_files": [f for f in files if f.endswith(('.yaml', '.yml'))],
+            "selectors_directory": registry.directory,
+            "loaded_pages": registry.loaded_pages()
         }
\ No newline at end of file
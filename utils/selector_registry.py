@@ -0,0 +1,254 @@
+# utils/selector_registry.py
+import logging
+import os
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.selector_cache import SelectorFileCache
+
+logger = logging.getLogger(__name__)
+
+SELECTOR_EXTENSIONS = ('.json', '.yaml', '.yml')
+FALLBACK_FILES = ("selectors.json", "selectors.yaml", "selectors.yml")
+
+
+class SelectorRegistry(Mapping):
+    """
+    Lazily loaded page_name -> selectors mapping for one selector directory.
+
+    The directory is scanned once; a file is only parsed (or read back from
+    the memory-mapped snapshot) the first time its page is requested, either
+    through get_selectors(page_name) or a '{file > key}' lookup.
+
+    With environment=None every file with one of `extensions` is a page named
+    after its stem (locators/<platform>). With an environment only files named
+    '<page>_<environment>.<ext>' are pages (selectors/*_<env>.json|yaml).
+    Empty files are not pages.
+    """
+
+    _registries: Dict[tuple, "SelectorRegistry"] = {}
+    _registries_lock = threading.Lock()
+
+    def __init__(self, directory, environment: Optional[str] = None, cache_name: Optional[str] = None,
+                 extensions: Tuple[str, ...] = SELECTOR_EXTENSIONS):
+        self.directory = os.path.abspath(str(directory))
+        self.environment = environment
+        self.extensions = extensions
+        if cache_name is None:
+            cache_name = os.path.basename(self.directory) + (f"-{environment}" if environment else "")
+        self._file_cache = SelectorFileCache(cache_name)
+        self._sources: Optional[Dict[str, str]] = None
+        self._fallback_file: Optional[str] = None
+        self._pages: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[Optional[str]], None]] = []
+
+    @classmethod
+    def for_directory(cls, directory, environment: Optional[str] = None, cache_name: Optional[str] = None,
+                      extensions: Tuple[str, ...] = SELECTOR_EXTENSIONS) -> "SelectorRegistry":
+        """Return the process-wide registry for a directory/environment pair"""
+        key = (os.path.abspath(str(directory)), environment)
+        with cls._registries_lock:
+            registry = cls._registries.get(key)
+            if registry is None:
+                registry = cls(directory, environment, cache_name, extensions)
+                cls._registries[key] = registry
+            return registry
+
+    @classmethod
+    def persist_all(cls) -> None:
+        """Write newly parsed pages of every registry to their snapshots and unmap them"""
+        with cls._registries_lock:
+            registries = list(cls._registries.values())
+        for registry in registries:
+            registry.persist()
+            registry.close()
+
+    # Discovery
+
+    def _page_name(self, file_name: str) -> Optional[str]:
+        stem, extension = os.path.splitext(file_name)
+        if extension.lower() not in self.extensions:
+            return None
+        if self.environment is None:
+            return stem
+        suffix = f"_{self.environment}"
+        if stem.endswith(suffix) and len(stem) > len(suffix):
+            return stem[:-len(suffix)]
+        return None
+
+    @staticmethod
+    def _precedence(entry) -> Tuple[int, str]:
+        # Later extensions override earlier ones for the same page (.yml > .yaml > .json)
+        extension = os.path.splitext(entry.name)[1].lower()
+        rank = SELECTOR_EXTENSIONS.index(extension) if extension in SELECTOR_EXTENSIONS else -1
+        return rank, entry.name
+
+    @property
+    def sources(self) -> Dict[str, str]:
+        """page_name -> file path, discovered once per registry"""
+        if self._sources is None:
+            with self._lock:
+                if self._sources is None:
+                    self._sources = self._discover()
+        return self._sources
+
+    def _discover(self) -> Dict[str, str]:
+        sources = {}
+        try:
+            entries = sorted(os.scandir(self.directory), key=self._precedence)
+        except OSError:
+            logger.warning(f"Selector directory not found: {self.directory}")
+            return sources
+
+        for entry in entries:
+            if not entry.is_file() or entry.stat().st_size == 0:
+                continue
+            page_name = self._page_name(entry.name)
+            if page_name is not None:
+                sources[page_name] = entry.path
+
+        if not sources and self.environment is not None:
+            logger.warning(f"No selector files matching *_{self.environment}.json or *_{self.environment}.yaml/yml found in {self.directory}")
+            for fallback_file in FALLBACK_FILES:
+                default_file = os.path.join(self.directory, fallback_file)
+                if os.path.exists(default_file):
+                    logger.info(f"Using fallback selector file: {default_file}")
+                    self._fallback_file = default_file
+                    sources = self._load_fallback(default_file)
+                    break
+        return sources
+
+    def _load_fallback(self, file_path: str) -> Dict[str, str]:
+        """A single fallback file holds every page as a top-level key"""
+        try:
+            data = self._file_cache.load(file_path) or {}
+        except Exception as e:
+            logger.error(f"Error loading fallback file {os.path.basename(file_path)}: {str(e)}")
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        self._pages.update(data)
+        return {page_name: file_path for page_name in data}
+
+    # Page access
+
+    def _load_page(self, page_name: str, file_path: str) -> Any:
+        try:
+            logger.debug(f"Loading selectors for '{page_name}' from {os.path.basename(file_path)}")
+            selectors = self._file_cache.load(file_path)
+        except Exception as e:
+            logger.error(f"Error loading selector file {file_path}: {str(e)}")
+            return {}
+
+        # If the file already has a top-level key structure, use it directly
+        if isinstance(selectors, dict) and len(selectors) == 1 and page_name in selectors:
+            selectors = selectors[page_name]
+        return selectors if selectors is not None else {}
+
+    def __getitem__(self, page_name: str) -> Any:
+        try:
+            return self._pages[page_name]
+        except KeyError:
+            pass
+        file_path = self.sources[page_name]
+        with self._lock:
+            if page_name not in self._pages:
+                self._pages[page_name] = self._load_page(page_name, file_path)
+            return self._pages[page_name]
+
+    def __iter__(self):
+        return iter(self.sources)
+
+    def __len__(self):
+        return len(self.sources)
+
+    def __contains__(self, page_name):
+        return page_name in self.sources
+
+    def get_selectors(self, page_name: str) -> Any:
+        """Get selectors for a page, or {} if the page does not exist"""
+        try:
+            return self[page_name]
+        except KeyError:
+            return {}
+
+    def path_for(self, page_name: str) -> Optional[str]:
+        """Return the file a page is loaded from"""
+        return self.sources.get(page_name)
+
+    def loaded_pages(self):
+        """Names of pages that have been parsed so far"""
+        return list(self._pages.keys())
+
+    def reload(self) -> None:
+        """Forget discovered files and parsed pages; they are reloaded on next access"""
+        with self._lock:
+            self._sources = None
+            self._fallback_file = None
+            self._pages = {}
+        self._notify(None)
+
+    def reload_file(self, file_path: str) -> Optional[str]:
+        """
+        Re-read a single changed, added or deleted selector file.
+
+        A page that was already loaded is parsed again and swapped in with a
+        single dict assignment, so concurrent readers see either the old or
+        the new page, never a partial one. Returns the affected page name.
+        """
+        file_path = os.path.abspath(file_path)
+        if file_path == self._fallback_file:
+            self.reload()
+            return None
+
+        page_name = self._page_name(os.path.basename(file_path))
+        if page_name is None or self._sources is None:
+            return None
+
+        with self._lock:
+            sources = dict(self._sources)
+            if os.path.isfile(file_path):
+                sources[page_name] = file_path
+                if page_name in self._pages:
+                    self._pages[page_name] = self._load_page(page_name, file_path)
+            else:
+                sources.pop(page_name, None)
+                self._pages.pop(page_name, None)
+            self._sources = sources
+
+        logger.info(f"Reloaded selectors for '{page_name}' from {os.path.basename(file_path)}")
+        self._notify(page_name)
+        return page_name
+
+    def add_listener(self, callback: Callable[[Optional[str]], None]) -> None:
+        """Register a callback run with the page name (None for everything) after a reload"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Optional[str]], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, page_name: Optional[str]) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(page_name)
+            except Exception as e:
+                logger.error(f"Selector reload listener failed: {str(e)}")
+
+    def warm(self) -> None:
+        """Load every page so the snapshot covers the whole directory"""
+        for page_name in self.sources:
+            self[page_name]
+        self.persist()
+
+    def persist(self) -> None:
+        """Merge pages parsed by this process into the shared snapshot"""
+        if self._sources is None:
+            return
+        self._file_cache.save(keep=set(self._sources.values()))
+
+    def close(self) -> None:
+        """Unmap the snapshot; loaded pages stay available"""
+        self._file_cache.close()
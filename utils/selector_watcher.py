@@ -0,0 +1,164 @@
+# utils/selector_watcher.py
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from utils.selector_registry import SelectorRegistry
+
+logger = logging.getLogger(__name__)
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+# Editors often write a file in several steps; changes are collected for this long before reloading
+DEBOUNCE_SECONDS = 0.05
+
+
+def _load_inotify():
+    """Return libc with inotify symbols, or None when unavailable (non-Linux)"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class SelectorWatcher:
+    """
+    Background watcher that hot-reloads changed selector files.
+
+    Only the file that changed is parsed again; its page is swapped into the
+    registry and every SelectorIndex built on that registry drops its cached
+    entries for the page. Uses inotify on Linux and falls back to polling
+    directory mtimes elsewhere (or when use_inotify=False).
+
+    Typical use from a REPL or --pdb session:
+
+        watcher = SelectorWatcher([registry]).start()
+        ...  # edit locators/web/login.yaml, keep using the live page
+        watcher.stop()
+    """
+
+    def __init__(self, registries: Iterable[SelectorRegistry], poll_interval: float = 0.5, use_inotify: bool = True):
+        self.registries = {registry.directory: registry for registry in registries}
+        self.poll_interval = poll_interval
+        self._libc = _load_inotify() if use_inotify else None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._libc is not None else "polling"
+
+    def start(self) -> "SelectorWatcher":
+        """Start watching in a daemon thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            target = self._run_inotify if self._libc is not None else self._run_polling
+            self._thread = threading.Thread(target=target, name="selector-watcher", daemon=True)
+            self._thread.start()
+            logger.info(f"Watching selector directories ({self.mode}): {', '.join(self.registries)}")
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop watching and wait for the thread to exit"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _reload(self, changed: Iterable[Tuple[str, str]]) -> None:
+        for directory, file_name in sorted(set(changed)):
+            registry = self.registries.get(directory)
+            if registry is not None:
+                registry.reload_file(os.path.join(directory, file_name))
+
+    # inotify backend
+
+    def _run_inotify(self) -> None:
+        libc = self._libc
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            logger.warning(f"inotify_init1 failed ({os.strerror(ctypes.get_errno())}), falling back to polling")
+            self._run_polling()
+            return
+
+        watches: Dict[int, str] = {}
+        try:
+            for directory in self.registries:
+                wd = libc.inotify_add_watch(fd, directory.encode(), WATCH_MASK)
+                if wd < 0:
+                    logger.warning(f"Cannot watch {directory}: {os.strerror(ctypes.get_errno())}")
+                    continue
+                watches[wd] = directory
+
+            while not self._stop_event.is_set():
+                readable, _, _ = select.select([fd], [], [], self.poll_interval)
+                if not readable:
+                    continue
+                # Let the editor finish its write/rename sequence
+                time.sleep(DEBOUNCE_SECONDS)
+                self._reload(self._read_events(fd, watches))
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _read_events(fd: int, watches: Dict[int, str]):
+        changed = []
+        while True:
+            try:
+                buffer = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _cookie, length = _EVENT.unpack_from(buffer, offset)
+                offset += _EVENT.size
+                name = buffer[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+                offset += length
+                if name and wd in watches:
+                    changed.append((watches[wd], name))
+        return changed
+
+    # Polling backend
+
+    def _snapshot(self) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        state = {}
+        for directory in self.registries:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            state[(directory, entry.name)] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return state
+
+    def _run_polling(self) -> None:
+        previous = self._snapshot()
+        while not self._stop_event.wait(self.poll_interval):
+            current = self._snapshot()
+            if current != previous:
+                changed = [key for key in current.keys() | previous.keys() if current.get(key) != previous.get(key)]
+                self._reload(changed)
+                previous = current
@@ -0,0 +1,139 @@
+# utils/sharding.py
+import hashlib
+import heapq
+import json
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pytest
+
+from utils.cache import atomic_write_bytes
+from utils.lpt_scheduler import DEFAULT_DURATION, DurationHistory
+
+logger = logging.getLogger(__name__)
+
+# config.workeroutput key xdist workers send the shard they selected under
+WORKEROUTPUT_SHARD = "pyplay_shard"
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse 'i/N' (1-based) into (i, N)"""
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}', expected i/N such as 2/4")
+    if total < 1 or not 1 <= index <= total:
+        raise ValueError(f"Invalid shard '{value}', i must be between 1 and N")
+    return index, total
+
+
+def digest(values: Iterable[str]) -> str:
+    return hashlib.blake2b("\n".join(values).encode(), digest_size=8).hexdigest()
+
+
+def partition(nodeids: Iterable[str], total: int, estimate: Callable[[str], float]) -> List[List[str]]:
+    """
+    Split tests into `total` shards, longest first onto the least loaded
+    shard. Depends only on the set of nodeids and the weights, so every shard
+    computes the same split.
+    """
+    shards: List[List[str]] = [[] for _ in range(total)]
+    loads = [(0.0, index) for index in range(total)]
+    for nodeid in sorted(set(nodeids), key=lambda nodeid: (-estimate(nodeid), nodeid)):
+        load, index = heapq.heappop(loads)
+        shards[index].append(nodeid)
+        heapq.heappush(loads, (load + estimate(nodeid), index))
+    return shards
+
+
+class ShardPlugin:
+    """
+    Keeps only this shard's part of the collected tests (--shard i/N).
+
+    Every CI node collects the same tests and splits them with the same
+    weights, so shards never overlap: the durations in --shard-weights, or
+    the same weight for every test without it. The local duration history
+    is never used, since it differs from node to node. With --shard-manifest a JSON manifest of the shard
+    (its tests, digests of the whole collection and the weights, and the
+    durations measured) is written for `run_tests.py merge` to check and
+    combine.
+    """
+
+    def __init__(self, config, shard: str, weights: Optional[str] = None, manifest: Optional[str] = None):
+        self.config = config
+        self.index, self.total = parse_shard(shard)
+        self.estimate: Callable[[str], float] = (
+            DurationHistory(weights).estimate if weights else lambda nodeid: DEFAULT_DURATION
+        )
+        self.uniform = not weights
+        self.manifest = Path(manifest) if manifest else None
+        self.selected: List[str] = []
+        self.collected: List[str] = []
+        self.predicted = 0.0
+        self.durations: Dict[str, float] = defaultdict(float)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        self.collected = [item.nodeid for item in items]
+        shard = set(partition(self.collected, self.total, self.estimate)[self.index - 1])
+
+        selected, deselected = [], []
+        for item in items:
+            (selected if item.nodeid in shard else deselected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        self.selected = [item.nodeid for item in selected]
+        self.predicted = sum(self.estimate(nodeid) for nodeid in self.selected)
+
+    def pytest_report_collectionfinish(self, config, start_path, items):
+        if not self.collected:
+            return None
+        if self.uniform:
+            return (f"shard {self.index}/{self.total}: {len(self.selected)} of {len(self.collected)} tests "
+                    f"(uniform weights, no --shard-weights)")
+        return (f"shard {self.index}/{self.total}: {len(self.selected)} of {len(self.collected)} tests, "
+                f"predicted {self.predicted:.1f}s (weights {self.weights_digest()})")
+
+    def weights_digest(self) -> str:
+        return digest(f"{nodeid}={self.estimate(nodeid):.3f}" for nodeid in sorted(self.collected))
+
+    @property
+    def is_worker(self) -> bool:
+        return hasattr(self.config, "workerinput")
+
+    def pytest_runtest_logreport(self, report):
+        if not self.is_worker:
+            self.durations[report.nodeid] += report.duration
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # Under xdist only workers collect; they all select the same shard
+        shard = getattr(node, "workeroutput", {}).get(WORKEROUTPUT_SHARD)
+        if shard and not self.collected:
+            self.collected, self.selected, self.predicted = shard["collected"], shard["selected"], shard["predicted"]
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker:
+            self.config.workeroutput[WORKEROUTPUT_SHARD] = {
+                "collected": self.collected, "selected": self.selected, "predicted": self.predicted
+            }
+            return
+        if self.manifest is None:
+            return
+        manifest = {
+            "shard": self.index,
+            "total": self.total,
+            "collected": len(self.collected),
+            "collection_digest": digest(sorted(self.collected)),
+            "weights_digest": self.weights_digest(),
+            "predicted": self.predicted,
+            "tests": self.selected,
+            "durations": dict(self.durations),
+        }
+        try:
+            atomic_write_bytes(self.manifest, json.dumps(manifest, indent=1).encode())
+        except OSError as e:
+            logger.warning(f"Could not write shard manifest {self.manifest}: {e}")
@@ -0,0 +1,350 @@
+# utils/step_index.py
+import importlib
+import logging
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Attribute pytest-bdd < 9 sets on every step definition fixture function;
+# 9.x keeps the contexts in pytest_bdd.steps.step_function_context_registry
+STEP_CONTEXT_ATTR = "_pytest_bdd_step_context"
+
+# Distinct step texts remembered before the memo is reset
+MAX_MEMO_SIZE = 65536
+
+REGEX_METACHARS = set(".^$*+?{}[]()|\\")
+OPTIONAL_QUANTIFIERS = set("*?{")
+NAMED_GROUP = re.compile(r"\(\?P<[A-Za-z_][A-Za-z0-9_]*>")
+# Constructs that stop a pattern from being merged into a bucket alternation
+UNMERGEABLE = re.compile(r"\(\?P=|\\[1-9]|\(\?\(|\(\?[aiLmsux]+\)")
+
+
+def regex_literal_prefix(pattern: str) -> str:
+    """
+    Return the literal text every match of `pattern` must start with ('' when
+    unknown, e.g. the pattern starts with a group or has a top-level '|').
+    """
+    if has_top_level_alternation(pattern):
+        return ""
+    prefix = []
+    i = 1 if pattern.startswith("^") else 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            if i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+                literal, width = pattern[i + 1], 2
+            else:
+                break
+        elif char in REGEX_METACHARS:
+            break
+        else:
+            literal, width = char, 1
+        # A quantified character ("s?", "a*") is not part of every match
+        if i + width < len(pattern) and pattern[i + width] in OPTIONAL_QUANTIFIERS:
+            break
+        if i + width < len(pattern) and pattern[i + width] == "+":
+            prefix.append(literal)
+            break
+        prefix.append(literal)
+        i += width
+    return "".join(prefix)
+
+
+def has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # ']' right after '[' or '[^' is a literal
+            if pattern[i + 1:i + 2] == "]":
+                i += 1
+            elif pattern[i + 1:i + 3] == "^]":
+                i += 2
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def parser_literal_prefix(parser) -> str:
+    """Literal prefix for any pytest-bdd step parser (re, parse/cfparse or plain string)"""
+    regex = getattr(parser, "regex", None)
+    if regex is not None:
+        if regex.flags & (re.IGNORECASE | re.VERBOSE):
+            return ""
+        return regex_literal_prefix(regex.pattern)
+    name = getattr(parser, "name", "")
+    if hasattr(parser, "parser"):
+        # parse/cfparse: literal up to the first field ('{{' is an escaped brace)
+        match = re.search(r"\{(?!\{)", name)
+        return (name[:match.start()] if match else name).replace("{{", "{").replace("}}", "}")
+    return name
+
+
+def ignores_case(parser) -> bool:
+    """parse/cfparse parsers match case-insensitively unless compiled with case_sensitive=True"""
+    compiled = getattr(parser, "parser", None)
+    if compiled is None or getattr(parser, "regex", None) is not None:
+        return False
+    return bool(getattr(compiled, "_re_flags", re.IGNORECASE) & re.IGNORECASE)
+
+
+def fold_prefix(prefix: str) -> str:
+    """Trie key of a case-insensitive prefix: lowercased, cut at the first non-ASCII character"""
+    for i, char in enumerate(prefix):
+        if not char.isascii():
+            prefix = prefix[:i]
+            break
+    return prefix.lower()
+
+
+class _TrieNode:
+    __slots__ = ("children", "entries", "combined")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.entries: List[tuple] = []
+        self.combined: Optional[re.Pattern] = None
+
+
+class StepIndex:
+    """
+    Dispatch index over pytest-bdd step definitions.
+
+    pytest-bdd walks every fixture pytest knows about and asks each step
+    definition's parser `is_matching(step_name)`, for every step line. The
+    index instead:
+
+    * buckets parsers by the literal prefix of their pattern in a trie, so a
+      step line only reaches the definitions whose prefix it starts with
+      (case-insensitive parse/cfparse parsers in a second, lowercased trie);
+    * compiles one alternation per bucket of regex parsers, so a bucket with
+      no match is rejected with a single regex run;
+    * memoizes step text -> matching definitions for the whole session, so a
+      step shared by many scenarios is matched once.
+
+    Each parser is stored with a value (by default the parser itself) that
+    matching() returns, in the order the definitions were added.
+    """
+
+    def __init__(self, entries: Iterable[Any] = ()):
+        self._root = _TrieNode()
+        self._folded_root = _TrieNode()
+        self._count = 0
+        self._memo: Dict[str, tuple] = {}
+        self.stats = {"definitions": 0, "buckets": 0, "lookups": 0, "memo_hits": 0, "regex_calls": 0}
+        for entry in entries:
+            if isinstance(entry, tuple):
+                self.add(*entry)
+            else:
+                self.add(entry)
+        self.compile()
+
+    def add(self, parser, value: Any = None) -> None:
+        if ignores_case(parser):
+            node, prefix = self._folded_root, fold_prefix(parser_literal_prefix(parser))
+        else:
+            node, prefix = self._root, parser_literal_prefix(parser)
+        for char in prefix:
+            node = node.children.setdefault(char, _TrieNode())
+        node.entries.append((self._count, parser, parser if value is None else value))
+        self._count += 1
+        self.stats["definitions"] += 1
+
+    def compile(self) -> None:
+        """Build the per-bucket alternations and reset the memo"""
+        self.stats["buckets"] = 0
+        stack = [self._root, self._folded_root]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children.values())
+            if node.entries:
+                self.stats["buckets"] += 1
+                node.combined = self._combine([parser for _, parser, _ in node.entries])
+        self._memo.clear()
+
+    @staticmethod
+    def _combine(parsers) -> Optional[re.Pattern]:
+        # Only worth it (and only safe) when every parser in the bucket is a
+        # plain regex whose groups can be made anonymous
+        if len(parsers) < 2:
+            return None
+        patterns = []
+        flags = None
+        for parser in parsers:
+            regex = getattr(parser, "regex", None)
+            if regex is None or UNMERGEABLE.search(regex.pattern):
+                return None
+            if flags is not None and regex.flags != flags:
+                return None
+            flags = regex.flags
+            patterns.append(f"(?:{NAMED_GROUP.sub('(?:', regex.pattern)})")
+        try:
+            return re.compile("|".join(patterns), flags)
+        except re.error:
+            return None
+
+    def matching(self, step_name: str) -> tuple:
+        """Values of the definitions whose parser matches a step line"""
+        self.stats["lookups"] += 1
+        result = self._memo.get(step_name)
+        if result is not None:
+            self.stats["memo_hits"] += 1
+            return result
+
+        matched = []
+        nodes = self._path(self._root, step_name)
+        if self._folded_root.entries or self._folded_root.children:
+            nodes.extend(self._path(self._folded_root, step_name.casefold()))
+
+        for node in nodes:
+            if not node.entries:
+                continue
+            if node.combined is not None:
+                self.stats["regex_calls"] += 1
+                if node.combined.fullmatch(step_name) is None:
+                    continue
+            for entry in node.entries:
+                self.stats["regex_calls"] += 1
+                if entry[1].is_matching(step_name):
+                    matched.append(entry)
+
+        matched.sort(key=lambda entry: entry[0])
+        if len(self._memo) >= MAX_MEMO_SIZE:
+            self._memo.clear()
+        result = self._memo[step_name] = tuple(value for _, _, value in matched)
+        return result
+
+    @staticmethod
+    def _path(node: _TrieNode, text: str) -> List[_TrieNode]:
+        """Trie nodes along the longest prefix of `text`"""
+        nodes = [node]
+        for char in text:
+            node = node.children.get(char)
+            if node is None:
+                break
+            nodes.append(node)
+        return nodes
+
+    def values(self) -> List[Any]:
+        """Every indexed value, in the order it was added"""
+        entries = []
+        stack = [self._root, self._folded_root]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children.values())
+            entries.extend(node.entries)
+        return [value for _, _, value in sorted(entries, key=lambda entry: entry[0])]
+
+    def export_memo(self, key: Callable[[Any], Any]) -> Dict[str, list]:
+        """Memoized step text -> [key(value), ...] for persisting bindings"""
+        return {name: [key(value) for value in values] for name, values in self._memo.items()}
+
+    def prime(self, memo: Dict[str, tuple]) -> None:
+        """Seed the memo with step text -> values resolved by an earlier run"""
+        self._memo.update(memo)
+
+
+def definition_key(context) -> tuple:
+    """Stable identity of a step definition across runs"""
+    func = context.step_func
+    return (context.type, context.parser.name, func.__module__, func.__qualname__)
+
+
+def step_context(func) -> Any:
+    """pytest-bdd's StepFunctionContext of a step definition function (None for other functions)"""
+    try:
+        from pytest_bdd.steps import step_function_context_registry
+    except ImportError:
+        return getattr(func, STEP_CONTEXT_ATTR, None)
+    try:
+        return step_function_context_registry.get(func)
+    except TypeError:
+        # Not weak-referenceable, so never registered
+        return None
+
+
+def step_definitions(fixturemanager) -> List[tuple]:
+    """(parser, (fixturename, fixturedef, step context)) for every step definition fixture"""
+    entries = []
+    for fixturename, fixturedefs in list(fixturemanager._arg2fixturedefs.items()):
+        for fixturedef in fixturedefs:
+            context = step_context(fixturedef.func)
+            if context is not None:
+                entries.append((context.parser, (fixturename, fixturedef, context)))
+    return entries
+
+
+# State of the index installed into pytest-bdd for this process
+_installed: Dict[str, Any] = {}
+
+
+def installed_step_index() -> Optional[StepIndex]:
+    """The index currently answering pytest-bdd's step lookups, if any"""
+    return _installed.get("index")
+
+
+def install_step_index(fixturemanager) -> StepIndex:
+    """
+    Replace pytest-bdd's linear step lookup (scenario.find_fixturedefs_for_step)
+    with one backed by a StepIndex over the collected step definitions. The
+    index is rebuilt if step definitions are registered after installation.
+    Installing again for the same fixture manager returns the current index.
+    """
+    # pytest_bdd re-exports the scenario() function under the submodule's name
+    bdd_scenario = importlib.import_module("pytest_bdd.scenario")
+    from pytest_bdd.compat import getfixturedefs
+
+    state = _installed
+    if state.get("fixturemanager") is fixturemanager:
+        return _current_index(fixturemanager)
+    state["fixturemanager"] = fixturemanager
+    state["stale"] = True
+
+    # Count registrations of step definitions rather than fixtures: pytest-bdd
+    # registers a fixturedef for every target_fixture a step returns, and
+    # those must not throw the index (and its memo) away
+    register_fixture = fixturemanager._register_fixture
+
+    def register_and_invalidate(**kwargs):
+        register_fixture(**kwargs)
+        if step_context(kwargs.get("func")) is not None:
+            state["stale"] = True
+
+    fixturemanager._register_fixture = register_and_invalidate
+
+    def find_fixturedefs_for_step(step, fixturemanager, node):
+        """Find the fixture defs that can parse a step (indexed)."""
+        for fixturename, fixturedef, context in _current_index(fixturemanager).matching(step.name):
+            if context.type is not None and context.type != step.type:
+                continue
+            if fixturedef not in (getfixturedefs(fixturemanager, fixturename, node) or []):
+                continue
+            yield fixturedef
+
+    bdd_scenario.find_fixturedefs_for_step = find_fixturedefs_for_step
+    index = _current_index(fixturemanager)
+    logger.debug(f"Step index installed: {index.stats}")
+    return index
+
+
+def _current_index(fixturemanager) -> StepIndex:
+    """The installed index, rebuilt first if step definitions were registered since"""
+    state = _installed
+    if state["stale"]:
+        state["index"] = StepIndex(step_definitions(fixturemanager))
+        state["stale"] = False
+    return state["index"]
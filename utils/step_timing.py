@@ -0,0 +1,170 @@
+# utils/step_timing.py
+import functools
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import pytest
+
+from utils.performance_monitor import get_performance_monitor
+
+# Metric names in the performance store
+SCENARIO_METRIC = "scenario"
+STEP_METRIC = "step"
+FIXTURE_METRIC = "fixture"
+
+# pytest-bdd's step definition fixtures and private fixtures are not timed
+UNTIMED_FIXTURE_PREFIXES = ("pytestbdd_", "_")
+
+# config.workeroutput key workers send their {kind: {group: [count, total_ns]}} under
+WORKEROUTPUT_TOTALS = "pyplay_step_timing"
+
+
+def _timer(name: str, start_ns: int) -> dict:
+    # PerformanceMonitor.end_timer() accepts a perf_counter_ns start
+    return {"name": name, "start_ns": start_ns}
+
+
+def step_definition(step_func) -> str:
+    """Group key of a step: the module and name of its definition"""
+    return f"{step_func.__module__}:{getattr(step_func, '__qualname__', step_func.__name__)}"
+
+
+class StepTimingPlugin:
+    """
+    Times every scenario, Given/When/Then step and fixture setup/teardown
+    with perf_counter_ns and records them in the performance store.
+
+    Steps are grouped by step definition; their duration includes fixtures
+    the step requests, which is also recorded separately (fixture_ms).
+    Per-definition totals are kept for the --step-durations summary.
+    """
+
+    def __init__(self, config, top: int = 0):
+        self.config = config
+        self.top = top
+        self.is_worker = hasattr(config, "workerinput")
+        self.monitor = get_performance_monitor()
+        # Test being run; higher-scoped fixtures are set up and torn down
+        # during a test but their request.node is the module/session
+        self._nodeid = ""
+        self._scenarios: Dict[str, int] = {}
+        # [start, fixture setup ns] of the step being run
+        self._step: Optional[List[int]] = None
+        self._teardowns: Dict[int, int] = {}
+        # kind -> group -> [count, total ns]
+        self.totals: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+
+    def _add(self, kind: str, group: str, duration_ns: int) -> None:
+        total = self.totals[kind][group]
+        total[0] += 1
+        total[1] += duration_ns
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self._nodeid = nodeid
+
+    # Scenarios
+
+    def pytest_bdd_before_scenario(self, request, feature, scenario):
+        self._scenarios[request.node.nodeid] = time.perf_counter_ns()
+
+    def pytest_bdd_after_scenario(self, request, feature, scenario):
+        start = self._scenarios.pop(request.node.nodeid, None)
+        if start is None:
+            return
+        self.monitor.end_timer(_timer(SCENARIO_METRIC, start), metadata={
+            "nodeid": request.node.nodeid, "feature": feature.name, "scenario": scenario.name,
+        })
+
+    # Steps
+
+    def pytest_bdd_before_step(self, request, feature, scenario, step, step_func):
+        self._step = [time.perf_counter_ns(), 0]
+
+    def _end_step(self, request, scenario, step, step_func, success: bool) -> None:
+        if self._step is None:
+            return
+        start, fixture_ns = self._step
+        self._step = None
+        definition = step_definition(step_func)
+        metric = self.monitor.end_timer(_timer(STEP_METRIC, start), success, {
+            "nodeid": request.node.nodeid,
+            "scenario": scenario.name,
+            "definition": definition,
+            "step": f"{step.type.capitalize()} {step.name}",
+            "fixture_ms": round(fixture_ns / 1e6, 3),
+        })
+        self._add(STEP_METRIC, definition, int(metric["duration"] * 1e9))
+
+    def pytest_bdd_after_step(self, request, feature, scenario, step, step_func, step_func_args):
+        self._end_step(request, scenario, step, step_func, True)
+
+    def pytest_bdd_step_error(self, request, feature, scenario, step, step_func, step_func_args, exception):
+        self._end_step(request, scenario, step, step_func, False)
+
+    # Fixtures
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        if fixturedef.argname.startswith(UNTIMED_FIXTURE_PREFIXES):
+            yield
+            return
+        start = time.perf_counter_ns()
+        outcome = yield
+        metric = self.monitor.end_timer(
+            _timer(FIXTURE_METRIC, start), outcome.excinfo is None, self._fixture_metadata(fixturedef, request, "setup")
+        )
+        duration_ns = int(metric["duration"] * 1e9)
+        self._add(FIXTURE_METRIC, fixturedef.argname, duration_ns)
+        if self._step is not None:
+            self._step[1] += duration_ns
+        # Finalizers run last-in first-out: this one marks the start of the
+        # fixture's own teardown, pytest_fixture_post_finalizer its end
+        fixturedef.addfinalizer(functools.partial(self._start_teardown, fixturedef))
+
+    def _start_teardown(self, fixturedef) -> None:
+        self._teardowns[id(fixturedef)] = time.perf_counter_ns()
+
+    def pytest_fixture_post_finalizer(self, fixturedef, request):
+        start = self._teardowns.pop(id(fixturedef), None)
+        if start is None:
+            return
+        metric = self.monitor.end_timer(
+            _timer(FIXTURE_METRIC, start), metadata=self._fixture_metadata(fixturedef, request, "teardown")
+        )
+        self._add(FIXTURE_METRIC, fixturedef.argname, int(metric["duration"] * 1e9))
+
+    def _fixture_metadata(self, fixturedef, request, phase: str) -> dict:
+        return {"nodeid": self._nodeid, "fixture": fixturedef.argname,
+                "scope": fixturedef.scope, "phase": phase}
+
+    # Summary
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        for kind, groups in getattr(node, "workeroutput", {}).get(WORKEROUTPUT_TOTALS, {}).items():
+            for group, (count, total_ns) in groups.items():
+                total = self.totals[kind][group]
+                total[0] += count
+                total[1] += total_ns
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        # After session-scoped fixtures were torn down
+        if self.is_worker:
+            self.config.workeroutput[WORKEROUTPUT_TOTALS] = {
+                kind: {group: list(total) for group, total in groups.items()} for kind, groups in self.totals.items()
+            }
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.top:
+            return
+        for kind, title in ((STEP_METRIC, "step definitions"), (FIXTURE_METRIC, "fixtures")):
+            groups = self.totals.get(kind)
+            if not groups:
+                continue
+            terminalreporter.write_sep("-", f"slowest {self.top} {title}")
+            for group, (count, total_ns) in sorted(groups.items(), key=lambda item: -item[1][1])[:self.top]:
+                terminalreporter.write_line(
+                    f"{total_ns / 1e9:8.2f}s total {total_ns / count / 1e6:9.1f}ms avg {count:6d} calls  {group}"
+                )